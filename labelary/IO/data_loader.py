@@ -1,21 +1,26 @@
 import pandas as pd
 from pathlib import Path
 from typing import Union, Optional, List
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QMessageBox, QDialog, QPushButton, QVBoxLayout, QHBoxLayout, QLabel,
-    QComboBox
+    QComboBox, QApplication, QProgressDialog
 )
 from utils.skeleton import SkeletonModel
+from utils.predictions import find_predictions, load_predictions, parse_txt_results
+from .label_store import LabelStore
+from .edit_history import EditHistory
+from .label_cache import source_signature, load_label_cache, save_label_cache_async
 from typing import Optional, List
-from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import multiprocessing
 import numpy as np, io
 
 class DataLoader:
     parent: Optional[QDialog] = None
 
-    loaded_data: Optional[pd.DataFrame] = None
+    store: Optional[LabelStore] = None
+    history: EditHistory = EditHistory()
     csv_path: Optional[str] = None
     skeleton_model: "SkeletonModel" = None
     kp_order: list = None
@@ -24,18 +29,15 @@ class DataLoader:
     img_width: Optional[int] = None 
     img_height: Optional[int] = None
     _coords_normalized: bool = False
+    _source_dims: Optional[tuple] = None
 
     max_animals = 0
     animals_name = None
     track_mapping: dict[str, str] = {}
-    _expected_cols: Optional[int] = None
-    _col_names: Optional[List[str]] = None
-    _BATCH_ROWS: int = 20000
-    records_tmp: List[dict] = []
+    # TXT files per parse task (one worker process each)
+    _TXT_CHUNK_FILES: int = 512
 
     _label_version: int = 0  
-    _label_frames_cache: Optional[list] = None
-    _label_cache_version: int = -1
     _inference_mode: bool = False
 
     ### Version ###
@@ -44,37 +46,72 @@ class DataLoader:
     def _bump_label_version(cls) -> None:
         cls._label_version += 1
 
+    @classmethod
+    def _record_edit(cls, label: str, frame_idx: int, before: dict) -> None:
+        # before: {track: instance array or None} captured ahead of the edit
+        cls.history.record(label, [
+            (frame_idx, track, values, cls.store.get_instance(frame_idx, track))
+            for track, values in before.items()
+        ])
+
+    @classmethod
+    def undo(cls) -> Optional[int]:
+        # Returns the frame the undone edit touched
+        if cls.store is None:
+            return None
+        result = cls.history.undo(cls.store)
+        if result is None:
+            return None
+        cls._bump_label_version()
+        return result[1]
+
+    @classmethod
+    def redo(cls) -> Optional[int]:
+        if cls.store is None:
+            return None
+        result = cls.history.redo(cls.store)
+        if result is None:
+            return None
+        cls._bump_label_version()
+        return result[1]
+
     @classmethod
     def get_labeled_frames(cls) -> list[int]:
-        df = cls.loaded_data
-        if df is None or df.empty:
+        # The store keeps this list sorted as instances are added/removed
+        if cls.store is None:
             return []
-        if (cls._label_frames_cache is not None and
-            cls._label_cache_version == cls._label_version):
-            return cls._label_frames_cache
-        try:
-            if isinstance(df.index, pd.MultiIndex) and "frame_idx" in df.index.names:
-                vals = df.index.get_level_values("frame_idx").unique()
-            else:
-                vals = df["frame_idx"].unique()
-            labeled = sorted(vals.tolist())
-        except Exception:
-            labeled = []
+        return cls.store.labeled_frames()
 
-        cls._label_frames_cache = labeled
-        cls._label_cache_version = cls._label_version
-        return labeled
+    ### State ###
 
-    ### Skeleton ###
+    @classmethod
+    def is_loaded(cls) -> bool:
+        return cls.store is not None
 
     @classmethod
-    def _init_txt_schema(cls, sample_fp: Path, sep: str) -> None:
-        if cls._expected_cols is not None:
-            return
+    def has_labels(cls) -> bool:
+        return cls.store is not None and not cls.store.empty
+
+    @classmethod
+    def to_dataframe(cls) -> Optional[pd.DataFrame]:
+        # Flat export view (track, frame_idx, instance.visibility, kp.x/y/visibility ...)
+        if cls.store is None:
+            return None
+        return cls.store.to_dataframe()
+
+    ### Skeleton ###
 
-        tmp = pd.read_csv(sample_fp, header=None, sep=sep, engine="python")
-        cls._expected_cols = tmp.shape[1]
-        cls._col_names    = [f"c{i}" for i in range(cls._expected_cols)]
+    @classmethod
+    def _txt_columns(cls, txt_files: list[Path]) -> Optional[int]:
+        # cls cx cy w h + (x y v) per keypoint
+        if cls.kp_order:
+            return 5 + 3 * len(cls.kp_order)
+        for fp in txt_files:
+            with open(fp, "rb") as f:
+                first = f.readline().split()
+            if first:
+                return len(first) if (len(first) - 5) % 3 == 0 else None
+        return None
 
     @classmethod
     def load_skeleton_info(cls, skeleton_model: "SkeletonModel") -> None:
@@ -114,10 +151,10 @@ class DataLoader:
     @classmethod
     def set_image_dims(cls, w: int, h: int) -> None:
         cls.img_width, cls.img_height = w, h
-        if cls.loaded_data is None:
+        if cls.store is None:
             return
         if not cls._coords_normalized:
-            cls._normalize_df()
+            cls._normalize_coords()
 
     @staticmethod
     def _first_frame_row(df):
@@ -137,50 +174,37 @@ class DataLoader:
         return False
 
     @classmethod
-    def _normalize_df(cls):
+    def _normalize_coords(cls):
         if cls.img_width is None or cls.img_height is None:
             print("No resolution information, Skip normalization")
             return
-        if not cls.kp_order:
-            cls.kp_order = [c[:-2] for c in cls.loaded_data.columns if c.endswith(".x")]
-
-        for kp in cls.kp_order:
-            cls.loaded_data[f"{kp}.x"] /= cls.img_width
-            cls.loaded_data[f"{kp}.y"] /= cls.img_height
+        cls.store.scale(1.0 / cls.img_width, 1.0 / cls.img_height)
         cls._coords_normalized = True
+        cls._source_dims = (cls.img_width, cls.img_height)
 
     ### Get Coords ###
 
     @classmethod
     def get_keypoint_coordinates_by_frame(cls, frame_idx):
-        if cls.loaded_data is None or cls.loaded_data.empty:
+        if cls.store is None or cls.store.empty:
             return {}
-        coords = {t: {} for t in cls.animals_name}
-        try:
-            frame_df = cls.loaded_data.xs(frame_idx, level="frame_idx")
-        except KeyError:
-            return coords
-
-        coords = {t: {} for t in cls.loaded_data["track"].unique()}
-        for track, group in frame_df.groupby(level="track"): 
-            if track not in coords:
-                continue
-            row = group.iloc[0]
-            for kp in cls.kp_order:
-                xcol, ycol, scol = f"{kp}.x", f"{kp}.y", f"{kp}.visibility"
-                if xcol in row and ycol in row and scol in row:
-                    coords[track][kp] = (row[xcol], row[ycol], row[scol])
-        return coords
+        return cls.store.get_frame(frame_idx)
 
     @classmethod
     def frame_has_labels(cls, frame_idx: int) -> bool:
-        df = cls.loaded_data
-        if df is None or df.empty:
-            return False
-        try:
-            return bool((df["frame_idx"] == frame_idx).any())
-        except Exception:
-            return False
+        return cls.store is not None and cls.store.has_frame(frame_idx)
+
+    @classmethod
+    def tracks_in_frame(cls, frame_idx: int) -> list:
+        if cls.store is None:
+            return []
+        return cls.store.tracks_in_frame(frame_idx)
+
+    @classmethod
+    def get_point(cls, track, frame_idx, keypoint):
+        if cls.store is None:
+            return None
+        return cls.store.get_point(frame_idx, track, keypoint)
 
     @staticmethod
     def is_empty(obj) -> bool:
@@ -196,99 +220,91 @@ class DataLoader:
 
     @classmethod
     def update_kpt_visibility(cls, track, frame_idx, keypoint, visibility):
-        if cls.loaded_data is None:
+        if cls.store is None:
             print("DataLoader.update_kpt_visibility: No data loaded.")
-            return
-        mask = (cls.loaded_data["track"] == track) & (cls.loaded_data["frame_idx"] == frame_idx)
-        if mask.sum() == 0:
+            return False
+        if not cls.store.has_instance(frame_idx, track):
             print(f"DataLoader.update_kpt_visibility: No row for track={track}, frame={frame_idx}")
-            return
-        col_v = f"{keypoint}.visibility"
-        if col_v not in cls.loaded_data.columns:
-            print(f"DataLoader.update_kpt_visibility: Column {col_v} not found.")
-            return
-        cls.loaded_data.loc[mask, col_v] = visibility
-        return cls.loaded_data.loc[mask]
+            return False
+        if keypoint not in cls.store.kp_index:
+            print(f"DataLoader.update_kpt_visibility: Keypoint {keypoint} not found.")
+            return False
+        before = {track: cls.store.get_instance(frame_idx, track)}
+        updated = cls.store.set_visibility(frame_idx, track, keypoint, visibility)
+        cls._record_edit("Change visibility", frame_idx, before)
+        return updated
 
     @classmethod
     def update_point(cls, track, frame_idx, keypoint, norm_x, norm_y):
-        if cls.loaded_data is None:
+        return cls.update_instance_points(track, frame_idx, {keypoint: (norm_x, norm_y)})
+
+    @classmethod
+    def update_instance_points(cls, track, frame_idx, points: dict) -> bool:
+        # points: {kp: (norm_x, norm_y, ...)}; one write for a whole dragged/rotated instance
+        if cls.store is None:
             print("DataLoader.update_point: No data loaded.")
-            return
-        mask = (cls.loaded_data["track"] == track) & (cls.loaded_data["frame_idx"] == frame_idx)
-        if mask.sum() == 0:
+            return False
+        if not cls.store.has_instance(frame_idx, track):
             print(f"DataLoader.update_point: No row for track={track}, frame={frame_idx}")
-            return
-        col_x, col_y = f"{keypoint}.x", f"{keypoint}.y"
-        if col_x not in cls.loaded_data.columns or col_y not in cls.loaded_data.columns:
-            print(f"DataLoader.update_point: Columns {col_x} or {col_y} not found.")
-            return
-        cls.loaded_data.loc[mask, [col_x, col_y]] = [norm_x, norm_y]
-        return cls.loaded_data.loc[mask]
+            return False
+        missing = [kp for kp in points if kp not in cls.store.kp_index]
+        if missing:
+            print(f"DataLoader.update_point: Keypoints {missing} not found.")
+        before = {track: cls.store.get_instance(frame_idx, track)}
+        updated = cls.store.update_points(frame_idx, track, points)
+        cls._record_edit("Move keypoints", frame_idx, before)
+        return updated
 
     ### Modify Label ###
 
     @classmethod
     def create_new_data(cls, n_tracks: int = 1) -> bool:
         cls._ensure_skeleton()
-        cols = ["track", "frame_idx", "instance.visibility"]
-        for kp in cls.kp_order:
-            cols += [f"{kp}.x", f"{kp}.y", f"{kp}.visibility"]
-        df = pd.DataFrame(columns=cols)
-        cls.loaded_data = df
+        cls.store = LabelStore(cls.kp_order, cls.animals_name or [])
+        cls.history.clear()
         cls.csv_path = None
         cls._coords_normalized = True
+        cls._source_dims = None
         cls._bump_label_version()
         return True
 
     @classmethod
     def add_auto_labeled_frame(cls, frame_idx: int, instances: list[dict]) -> bool:
+        return cls.add_auto_labeled_frames({frame_idx: instances}) > 0
+
+    @classmethod
+    def add_auto_labeled_frames(cls, predictions: dict[int, list[dict]]) -> int:
+        # Inserts predictions for any number of frames;
+        # frames that already have labels are left untouched
         cls._ensure_skeleton()
-        if not instances:
-            return False
+        if not predictions:
+            return 0
 
-        if cls.loaded_data is None:
+        if cls.store is None:
             cls.create_new_data()
 
-        if cls.frame_has_labels(frame_idx):
-            return False
-
-        rows: list[dict] = []
-        for instance in instances:
-            track_name = instance.get("track")
-            if track_name is None:
+        added_frames = set()
+        changes = []
+        for frame_idx, instances in predictions.items():
+            frame_idx = int(frame_idx)
+            if not instances or cls.store.has_frame(frame_idx):
                 continue
-            keypoints = instance.get("keypoints", {})
-            row = {
-                "track": str(track_name),
-                "frame_idx": int(frame_idx),
-                "instance.visibility": 2,
-            }
-            for kp in cls.kp_order:
-                x, y, vis = keypoints.get(kp, (0.0, 0.0, 1))
-                row[f"{kp}.x"] = float(x)
-                row[f"{kp}.y"] = float(y)
-                row[f"{kp}.visibility"] = int(vis)
-            rows.append(row)
-
-        if not rows:
-            return False
-
-        new_rows = pd.DataFrame.from_records(rows)
-        if cls.loaded_data is None or cls.loaded_data.empty:
-            cls.loaded_data = new_rows
-        else:
-            base_df = cls.loaded_data.reset_index(drop=True)
-            cls.loaded_data = pd.concat([base_df, new_rows], ignore_index=True, sort=False)
-
-        cls.loaded_data = (
-            cls.loaded_data
-            .set_index(["frame_idx", "track"], drop=False)
-            .sort_index()
-        )
+            for instance in instances:
+                track_name = instance.get("track")
+                if track_name is None:
+                    continue
+                keypoints = instance.get("keypoints", {})
+                values = [keypoints.get(kp, (0.0, 0.0, 1)) for kp in cls.kp_order]
+                cls.store.set_instance(frame_idx, str(track_name), values)
+                changes.append((frame_idx, str(track_name), None, cls.store.get_instance(frame_idx, str(track_name))))
+                added_frames.add(frame_idx)
+
+        if not added_frames:
+            return 0
+        cls.history.record("Auto-label", changes)
         cls._coords_normalized = True
         cls._bump_label_version()
-        return True
+        return len(added_frames)
 
     @classmethod
     def _to_project_name(cls, raw_track: str) -> str:
@@ -301,36 +317,19 @@ class DataLoader:
                               anchor_xy: "tuple[float, float] | None" = None,
                               nearby_range: int = 300) -> bool:
         cls._ensure_skeleton()
-        if cls.loaded_data is None:
+        if cls.store is None:
             return False
         track_name = cls._to_project_name(track_name)
 
-        frame_df = cls.loaded_data[cls.loaded_data["frame_idx"] == frame_idx]
-        if frame_df["track"].nunique() >= getattr(cls, "max_animals", 1):
+        present = cls.store.tracks_in_frame(frame_idx)
+        if len(present) >= getattr(cls, "max_animals", 1):
             print("Cannot add new skeleton: maximum instances reached for this frame.")
             return False
-
-        if ((cls.loaded_data["track"] == track_name) &
-            (cls.loaded_data["frame_idx"] == frame_idx)).any():
+        if track_name in present:
             return False
 
-        new_row = {"track": track_name, "frame_idx": frame_idx}
-        if "instance.visibility" in cls.loaded_data.columns:
-            new_row["instance.visibility"] = 2
-
-        init_coords: dict[str, tuple[float, float, int]] = {}
-        mask = ((cls.loaded_data["track"] == track_name) &
-                (cls.loaded_data["frame_idx"].between(frame_idx - nearby_range,
-                                                      frame_idx + nearby_range)))
-        if not cls.loaded_data[mask].empty:
-            near_df = cls.loaded_data[mask]
-            idx_nearest = (near_df["frame_idx"] - frame_idx).abs().idxmin()
-            src = near_df.loc[idx_nearest]
-            for kp in cls.kp_order:
-                xcol, ycol, vcol = f"{kp}.x", f"{kp}.y", f"{kp}.visibility"
-                init_coords[kp] = (src[xcol], src[ycol], src.get(vcol, 2))
-
-        if not init_coords:
+        values = cls.store.nearest_instance(frame_idx, track_name, nearby_range)
+        if values is None:
             ax, ay = anchor_xy if anchor_xy is not None else (0.5, 0.5)
             xs = [n.x for n in cls.skeleton_model.nodes.values()]
             ys = [n.y for n in cls.skeleton_model.nodes.values()]
@@ -342,29 +341,21 @@ class DataLoader:
             target_size  = 0.125
             scale        = target_size / max(w0, h0) if max(w0, h0) else 1.0
 
+            init_coords: dict[str, tuple[float, float, int]] = {}
             for kp, node in cls.skeleton_model.nodes.items():
                 nx = ax + (node.x - cx) * scale
                 ny = ay + (node.y - cy) * scale
                 nx = max(0.0, min(nx, 1.0))
                 ny = max(0.0, min(ny, 1.0))
                 init_coords[kp] = (nx, ny, 2)
-
-        for kp in cls.kp_order:
-            xcol, ycol, vcol = f"{kp}.x", f"{kp}.y", f"{kp}.visibility"
-            nx, ny, vis = init_coords.get(kp, (0.5, 0.5, 1))
-            new_row[xcol], new_row[ycol], new_row[vcol] = nx, ny, vis
+            values = [init_coords.get(kp, (0.5, 0.5, 1)) for kp in cls.kp_order]
 
         try:
-            cls.loaded_data = pd.concat([cls.loaded_data,
-                                         pd.DataFrame([new_row])],
-                                        ignore_index=True)
+            cls.store.set_instance(frame_idx, track_name, values)
         except Exception as e:
             print(f"Failed to add new skeleton row: {e}")
             return False
-        if not cls.loaded_data.empty:
-            cls.loaded_data = (cls.loaded_data
-                               .set_index(["frame_idx", "track"], drop=False)
-                               .sort_index())
+        cls._record_edit("Add instance", frame_idx, {track_name: None})
         cls._bump_label_version()
         return True
 
@@ -373,51 +364,26 @@ class DataLoader:
                                 frame_idx: int,
                                 old_track: str,
                                 new_track: str) -> bool:
-        if cls.loaded_data is None or cls.loaded_data.empty:
+        if cls.store is None or cls.store.empty:
             return False
         if old_track == new_track:
             return True
-
-        m_old = (cls.loaded_data["frame_idx"] == frame_idx) & (cls.loaded_data["track"] == old_track)
-        m_new = (cls.loaded_data["frame_idx"] == frame_idx) & (cls.loaded_data["track"] == new_track)
-
-        if m_old.sum() == 0:
-            return False 
-        if m_new.sum() > 0:
-            tmp_name = "__tmp_track__"
-            cls.loaded_data.loc[m_new, "track"] = tmp_name
-            cls.loaded_data.loc[m_old, "track"] = new_track
-            cls.loaded_data.loc[cls.loaded_data["track"] == tmp_name, "track"] = old_track
-        else:
-            cls.loaded_data.loc[m_old, "track"] = new_track
-        cls.loaded_data = (
-            cls.loaded_data
-            .set_index(["frame_idx", "track"], drop=False)
-            .sort_index()
-        )
+        before = {t: cls.store.get_instance(frame_idx, t) for t in (old_track, new_track)}
+        if not cls.store.swap_tracks(frame_idx, old_track, new_track):
+            return False
+        cls._record_edit("Change instance number", frame_idx, before)
         return True
 
     @classmethod
     def delete_instance(cls, frame_idx: int, track: str) -> bool:
-        if cls.loaded_data is None or cls.loaded_data.empty:
+        if cls.store is None or cls.store.empty:
             return False
 
-        before = len(cls.loaded_data)
-        cls.loaded_data = cls.loaded_data[
-            ~((cls.loaded_data["frame_idx"] == frame_idx) &
-              (cls.loaded_data["track"] == track))
-        ]
-        after = len(cls.loaded_data)
-        if after == before:
+        before = {track: cls.store.get_instance(frame_idx, track)}
+        if not cls.store.delete_instance(frame_idx, track):
             print(f"DeleteInstance: nothing to delete ({track}@{frame_idx})")
             return False
-
-        if not cls.loaded_data.empty:
-            cls.loaded_data = (
-                cls.loaded_data
-                .set_index(["frame_idx", "track"], drop=False)
-                .sort_index()
-            )
+        cls._record_edit("Delete instance", frame_idx, before)
         #print(f"Deleted {track} @ frame {frame_idx}")
         cls._bump_label_version()
         return True
@@ -427,95 +393,203 @@ class DataLoader:
     @classmethod
     def load_csv_data(cls, file_path: Union[str, Path]) -> bool:
         cls._ensure_skeleton()
-        return cls._load_generic(file_path, read_func=pd.read_csv)
+        signature = source_signature(file_path)
+        if cls._load_cached(file_path, "csv", signature):
+            cls.csv_path = str(file_path)
+            return True
+        loaded = cls._load_generic(file_path, read_func=pd.read_csv)
+        if loaded:
+            cls._save_cache(file_path, "csv", signature)
+        return loaded
 
     @classmethod
     def load_txt_data(cls, path: Union[str, Path], sep: str = r"\s+", inference_mode: bool = False) -> bool:
-        print("This may take some time.")
         cls._ensure_skeleton()
         path = Path(path)
         cls._inference_mode = inference_mode
 
-        if path.is_dir():
-            txt_files = sorted(path.glob("*.txt"))
-            if not txt_files:
-                print("There is no txt file in the directory.")
-                return False
-
-            cls._init_txt_schema(txt_files[0], sep)
-            cpu_n = max(multiprocessing.cpu_count() - 1, 1)
-            chunks: list[pd.DataFrame] = []
-            cls.records_tmp = []
+        npz_path = find_predictions(path)
+        if npz_path is not None:
+            return cls._load_prediction_file(npz_path)
 
-            def _safe_parse(fp: Path):
-                try:
-                    f_idx = int(fp.stem.split("_")[-1])
-                    return cls._txt_to_records(fp, sep, f_idx)
-                except Exception as e:
-                    print(f"{fp.name} → skip ({e})")
-                    return []
-
-            with ThreadPoolExecutor(max_workers=cpu_n) as pool:
-                for recs in tqdm(pool.map(_safe_parse, txt_files),
-                                 total=len(txt_files),
-                                 desc="Loading TXT frames"):
-                    if not recs:
-                        continue
-                    cls.records_tmp.extend(recs)
-                    if len(cls.records_tmp) >= cls._BATCH_ROWS:
-                        chunks.append(
-                            pd.DataFrame.from_records(cls.records_tmp)
-                        )
-                        cls.records_tmp.clear()
-            if cls.records_tmp:
-                chunks.append(pd.DataFrame.from_records(cls.records_tmp))
-                cls.records_tmp.clear()
-            if not chunks:
-                print("There is no readable txt.")
-                return False
-            df_total = pd.concat(chunks, ignore_index=True)
-            result = cls._load_generic(df_total, from_dataframe=True)
-            return result
+        if path.is_dir():
+            variant = "txt-inference" if inference_mode else "txt"
+            signature = source_signature(path)
+            if cls._load_cached(path, variant, signature):
+                return True
+            loaded = cls._load_txt_dir(path)
+            if loaded:
+                cls._save_cache(path, variant, signature)
+            return loaded
 
         print("Attempting to read incorrect txt directory")
         return False
 
+    ### Label Cache ###
+
     @classmethod
-    def _txt_to_records(cls, fp: Path, sep: str, frame_idx: int) -> List[dict]:
-        buf = Path(fp).read_bytes()
-        arr = np.fromstring(buf, sep=" ", dtype=np.float32)
+    def _load_cached(cls, source: Path, variant: str, signature) -> bool:
+        # Restores a label set parsed earlier (label_cache.py) if the source,
+        # skeleton and project animals are unchanged
+        cached = load_label_cache(source, variant, signature)
+        if cached is None:
+            return False
+        meta, arrays = cached
+        if meta["kp_order"] != list(cls.kp_order or []) or meta["animals_name"] != list(cls.animals_name or []):
+            return False
+        dims = tuple(meta["source_dims"]) if meta["source_dims"] else None
+        if dims and cls.img_width is not None and dims != (cls.img_width, cls.img_height):
+            return False
+        try:
+            store = LabelStore.from_arrays(meta["kp_order"], meta["track_names"],
+                                           arrays["frames"], arrays["track_ids"], arrays["values"],
+                                           arrays["instance_visibility"])
+        except Exception as e:
+            print(f"[LabelCache] Ignoring cache for {Path(source).name}: {e}")
+            return False
+        store.has_instance_visibility = meta["has_instance_visibility"]
 
-        if arr.size % cls._expected_cols:
-            return []
+        cls.store = store
+        cls.history.clear()
+        cls.csv_path = None
+        cls.track_mapping = meta["track_mapping"]
+        cls._coords_normalized = meta["normalized"]
+        cls._source_dims = dims
+        if not cls._coords_normalized and cls.img_width is not None:
+            cls._normalize_coords()
+        cls._bump_label_version()
+        print(f"Loaded cached labels for {Path(source).name}")
+        return True
 
-        arr = arr.reshape(-1, cls._expected_cols)
+    @classmethod
+    def _save_cache(cls, source: Path, variant: str, signature) -> None:
+        # Snapshot of the freshly loaded labels; written in the background
+        if signature is None or cls.store is None:
+            return
+        frames, track_ids, values, instance_vis = cls.store.to_arrays()
+        meta = {
+            "signature": signature,
+            "kp_order": list(cls.kp_order or []),
+            "animals_name": list(cls.animals_name or []),
+            "track_names": list(cls.store.track_names),
+            "track_mapping": dict(cls.track_mapping),
+            "has_instance_visibility": bool(cls.store.has_instance_visibility),
+            "normalized": bool(cls._coords_normalized),
+            "source_dims": list(cls._source_dims) if cls._source_dims else None,
+        }
+        save_label_cache_async(source, variant, meta,
+                               {"frames": frames, "track_ids": track_ids, "values": values,
+                                "instance_visibility": instance_vis})
+
+    @classmethod
+    def _load_txt_dir(cls, path: Path) -> bool:
+        print("This may take some time.")
+        txt_files = sorted(path.glob("*.txt"))
+        if not txt_files:
+            print("There is no txt file in the directory.")
+            return False
+
+        expected_cols = cls._txt_columns(txt_files)
+        if expected_cols is None:
+            print("There is no readable txt.")
+            return False
+        try:
+            data = cls._parse_txt_files(txt_files, expected_cols)
+        except Exception as e:
+            print(f"Failed to load data: {e}")
+            return False
+        if data is None:
+            return False
+        if not len(data["kpts"]):
+            print("There is no readable txt.")
+            return False
+        return cls._load_prediction_arrays(data, path.name)
+
+    @classmethod
+    def _parse_txt_files(cls, txt_files: list[Path], expected_cols: int) -> Optional[dict]:
+        # Worker processes parse chunks of files straight into arrays; the
+        # dialog polls them so the window stays responsive. None = cancelled.
+        chunks = [txt_files[i:i + cls._TXT_CHUNK_FILES] for i in range(0, len(txt_files), cls._TXT_CHUNK_FILES)]
+        progress = QProgressDialog(f"Loading {len(txt_files)} TXT files...", "Cancel", 0, len(txt_files), cls.parent)
+        progress.setWindowTitle("Load Labels")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(500)
+
+        parts: list[dict] = []
+        done = 0
+
+        def _collect(result, n_files) -> bool:
+            nonlocal done
+            data, skipped = result
+            for msg in skipped:
+                print(msg)
+            parts.append(data)
+            done += n_files
+            progress.setValue(done)
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        workers = max(1, min(len(chunks), multiprocessing.cpu_count() - 1, 61))
+        try:
+            if workers == 1:
+                for chunk in chunks:
+                    if not _collect(parse_txt_results(chunk, expected_cols), len(chunk)):
+                        print("Loading TXT cancelled.")
+                        return None
+            else:
+                pool = ProcessPoolExecutor(max_workers=workers)
+                try:
+                    futures = {pool.submit(parse_txt_results, [str(fp) for fp in chunk], expected_cols): len(chunk)
+                               for chunk in chunks}
+                    pending = set(futures)
+                    while pending:
+                        finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                        for fut in finished:
+                            if not _collect(fut.result(), futures[fut]):
+                                print("Loading TXT cancelled.")
+                                return None
+                        QApplication.processEvents()
+                        if progress.wasCanceled():
+                            print("Loading TXT cancelled.")
+                            return None
+                finally:
+                    pool.shutdown(wait=False, cancel_futures=True)
+        finally:
+            progress.close()
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+    @classmethod
+    def _load_prediction_file(cls, path: Path) -> bool:
+        data = load_predictions(path)
+        if not len(data["kpts"]):
+            print("There is no prediction in the file.")
+            return False
+        return cls._load_prediction_arrays(data, path.name)
 
-        kp_n = (arr.shape[1] - 5) // 3
+    @classmethod
+    def _load_prediction_arrays(cls, data: dict, source_name: str) -> bool:
+        # Columnar predictions (utils/predictions.py; npz or parsed TXT) -> label table
+        kpts = data["kpts"]
+        kp_n = kpts.shape[1]
         if cls.kp_order and kp_n != len(cls.kp_order):
-            raise ValueError(f"{fp.name}: {kp_n} kpts ≠ {len(cls.kp_order)}")
+            print(f"{source_name}: {kp_n} kpts ≠ {len(cls.kp_order)}")
+            return False
         if not cls.kp_order:
             cls.kp_order = [f"kp{i+1}" for i in range(kp_n)]
 
-        records = []
-        for row in arr:
-            rec: dict = {
-                "track": f"track_{int(row[0])}",
-                "frame_idx": frame_idx + 1 if cls._inference_mode else frame_idx,
-                "instance.visibility": 2
-            }
-            off = 5
-            for kp in cls.kp_order:
-                x, y, vis = row[off: off+3]
-                rec[f"{kp}.x"] = float(x)
-                rec[f"{kp}.y"] = float(y)
-                if cls._inference_mode:
-                    rec[f"{kp}.visibility"] = 2
-                else:
-                    v = int(round(float(vis)))
-                    rec[f"{kp}.visibility"] = 1 if v == 1 else 2
-                off += 3
-            records.append(rec)
-        return records
+        columns = {
+            "track": np.char.add("track_", data["cls"].astype(str)),
+            "frame_idx": data["frame"] + 1 if cls._inference_mode else data["frame"],
+            "instance.visibility": np.full(len(kpts), 2, dtype=np.int64),
+        }
+        for k, kp in enumerate(cls.kp_order):
+            columns[f"{kp}.x"] = kpts[:, k, 0].astype(np.float32)
+            columns[f"{kp}.y"] = kpts[:, k, 1].astype(np.float32)
+            if cls._inference_mode:
+                columns[f"{kp}.visibility"] = np.full(len(kpts), 2, dtype=np.int64)
+            else:
+                columns[f"{kp}.visibility"] = np.where(np.round(kpts[:, k, 2]) == 1, 1, 2)
+        return cls._load_generic(pd.DataFrame(columns), from_dataframe=True)
 
     @classmethod
     def _load_generic(cls, src, read_func=None, *, from_dataframe: bool = False) -> bool:
@@ -573,18 +647,15 @@ class DataLoader:
             new_order += [c for c in df.columns if c not in new_order]
 
             df = df[new_order] 
-            df = (
-                df.set_index(["frame_idx", "track"], drop=False)
-                .sort_index()
-            )
+            cls.store = LabelStore.from_dataframe(df, kp_order, cls.animals_name or unique_tracks)
+            cls.history.clear()
+            cls._source_dims = None
 
             first = cls._first_frame_row(df)
             if first is not None and cls._needs_normalize(first):
-                cls.loaded_data = df
                 cls._coords_normalized = False
-                cls._normalize_df()
+                cls._normalize_coords()
             else:
-                cls.loaded_data = df
                 cls._coords_normalized = True
 
             #print(f"Loaded: {origin}")
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+HISTORY_LIMIT = 200
+
+
+def _same(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> bool:
+    if a is None or b is None:
+        return a is b
+    return np.array_equal(a, b, equal_nan=True)
+
+
+class EditHistory:
+    # Undo/redo journal of instance-level deltas. Each record is a list of
+    # (frame, track, before, after) where before/after are [keypoints, 3]
+    # arrays or None for "no instance", so an edit costs the instances it
+    # touched, never a copy of the label set.
+
+    def __init__(self, limit: int = HISTORY_LIMIT):
+        self._undo: deque = deque(maxlen=limit)
+        self._redo: list = []
+        self._group: Optional[list] = None
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._group = None
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def record(self, label: str, changes: list) -> None:
+        changes = [c for c in changes if not _same(c[2], c[3])]
+        if not changes:
+            return
+        if self._group is not None:
+            self._group.extend(changes)
+            return
+        self._undo.append((label, changes))
+        self._redo.clear()
+
+    @contextmanager
+    def group(self, label: str):
+        # Folds every record made inside into one undo step (e.g. replace = delete + add)
+        if self._group is not None:
+            yield
+            return
+        self._group = []
+        try:
+            yield
+        finally:
+            changes, self._group = self._group, None
+            self.record(label, changes)
+
+    def undo(self, store) -> Optional[tuple[str, int]]:
+        if not self._undo:
+            return None
+        label, changes = self._undo.pop()
+        for frame_idx, track, before, _ in reversed(changes):
+            self._apply(store, frame_idx, track, before)
+        self._redo.append((label, changes))
+        return label, changes[0][0]
+
+    def redo(self, store) -> Optional[tuple[str, int]]:
+        if not self._redo:
+            return None
+        label, changes = self._redo.pop()
+        for frame_idx, track, _, after in changes:
+            self._apply(store, frame_idx, track, after)
+        self._undo.append((label, changes))
+        return label, changes[0][0]
+
+    @staticmethod
+    def _apply(store, frame_idx: int, track, values: Optional[np.ndarray]) -> None:
+        if values is None:
+            store.delete_instance(frame_idx, track)
+        else:
+            store.set_instance(frame_idx, track, values)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# Parsed label sets are kept next to their source as
+#   <source parent>/.moval_cache/<sha1(source, variant)>.npz
+# holding the LabelStore rows (frames, track_ids, values, instance_visibility) and a JSON "meta"
+# entry with the source signature, skeleton/track names and normalization.
+CACHE_DIR = ".moval_cache"
+CACHE_VERSION = 2
+
+
+def source_signature(source) -> Optional[list]:
+    # [file count, latest mtime_ns, total size]; a TXT directory counts its *.txt files
+    source = Path(source)
+    try:
+        if source.is_dir():
+            count = latest = size = 0
+            with os.scandir(source) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".txt") and entry.is_file():
+                        st = entry.stat()
+                        count += 1
+                        latest = max(latest, st.st_mtime_ns)
+                        size += st.st_size
+            return [count, latest, size]
+        st = source.stat()
+        return [1, st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+
+def cache_path(source, variant: str) -> Path:
+    source = Path(source).resolve()
+    digest = hashlib.sha1(f"{source}|{variant}".encode("utf-8")).hexdigest()[:16]
+    return source.parent / CACHE_DIR / f"{digest}.npz"
+
+
+def load_label_cache(source, variant: str, signature: Optional[list]) -> Optional[tuple[dict, dict]]:
+    # (meta, arrays) when the cache exists and matches the current source
+    path = cache_path(source, variant)
+    if signature is None or not path.is_file():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CACHE_VERSION or meta.get("signature") != signature:
+                return None
+            arrays = {key: data[key] for key in ("frames", "track_ids", "values", "instance_visibility")}
+    except Exception as e:
+        print(f"[LabelCache] Ignoring {path.name}: {e}")
+        return None
+    return meta, arrays
+
+
+def save_label_cache_async(source, variant: str, meta: dict, arrays: dict) -> threading.Thread:
+    # arrays must be private copies; the write happens off the GUI thread
+    path = cache_path(source, variant)
+    meta = dict(meta, version=CACHE_VERSION, source=str(Path(source).resolve()))
+
+    def _write():
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp.npz")
+            np.savez(tmp_path, meta=np.array(json.dumps(meta)), **arrays)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[LabelCache] Failed to write {path}: {e}")
+
+    thread = threading.Thread(target=_write, name="label-cache-writer", daemon=True)
+    thread.start()
+    return thread
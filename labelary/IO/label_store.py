@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import bisect
+import uuid
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+_MIN_FRAME_CAPACITY = 256
+# Coordinates come from float32 predictions; visibilities 0/1/2 are exact in it
+COORD_DTYPE = np.float32
+# instance.visibility of instances that were not loaded with one
+DEFAULT_INSTANCE_VISIBILITY = 2
+# Pending instances outside the tensor before it is grown in one go
+DELTA_COMPACT_SIZE = 4096
+
+
+class LabelStore:
+    # Dense label tensor: coords[frame, track, keypoint] = (x, y, visibility)
+    # and present[frame, track] marks which instances exist; instance_vis holds
+    # the loaded instance.visibility column so exports give it back. The frame number
+    # indexes the first axis directly, so per-frame reads and writes cost the
+    # same on a 100-frame clip and a 100k-frame video. DataFrames are only
+    # built when labels are imported or exported.
+    #
+    # Instances that do not fit the tensor (a frame past its capacity or a new
+    # track) go to a small delta dict instead of reallocating on the click;
+    # reads consult it and compact() folds it in on export or once it grows.
+
+    def __init__(self, kp_order: list, track_names: list, frame_capacity: int = 0):
+        self.kp_order = list(kp_order)
+        self.kp_index = {kp: k for k, kp in enumerate(self.kp_order)}
+        self.track_names: list = list(dict.fromkeys(track_names))
+        self.track_index: dict = {t: i for i, t in enumerate(self.track_names)}
+        self.coords = np.zeros((frame_capacity, len(self.track_names), len(self.kp_order), 3), dtype=COORD_DTYPE)
+        self.present = np.zeros((frame_capacity, len(self.track_names)), dtype=bool)
+        self.instance_vis = np.full((frame_capacity, len(self.track_names)), DEFAULT_INSTANCE_VISIBILITY, dtype=np.int8)
+        self.has_instance_visibility = True
+        self._delta: dict[int, dict] = {}
+        self._delta_size = 0
+        self._labeled: Optional[list[int]] = None
+        # Frames changed since the last take_dirty_frames(), for incremental exports;
+        # export_token names this label set so an exporter can tell it apart
+        self._dirty: set[int] = set()
+        self.export_token = uuid.uuid4().hex
+
+    ### Shape ###
+
+    @property
+    def frame_capacity(self) -> int:
+        return self.present.shape[0]
+
+    @property
+    def empty(self) -> bool:
+        return not self._delta_size and not self.present.any()
+
+    def __len__(self) -> int:
+        return int(self.present.sum()) + self._delta_size
+
+    def _fits(self, frame_idx: int, track) -> bool:
+        return frame_idx < self.frame_capacity and track in self.track_index
+
+    def compact(self) -> None:
+        # Grow the tensor once for everything in the delta, then move it in
+        if not self._delta:
+            return
+        new_tracks = [t for insts in self._delta.values() for t in insts if t not in self.track_index]
+        for track in dict.fromkeys(new_tracks):
+            self.track_index[track] = len(self.track_names)
+            self.track_names.append(track)
+        capacity = max(self.frame_capacity, max(self._delta) + 1)
+        if capacity > self.frame_capacity:
+            capacity = max(capacity, self.frame_capacity * 2, _MIN_FRAME_CAPACITY)
+
+        shape = (capacity, len(self.track_names))
+        if shape != self.present.shape:
+            coords = np.zeros(shape + self.coords.shape[2:], dtype=self.coords.dtype)
+            present = np.zeros(shape, dtype=bool)
+            instance_vis = np.full(shape, DEFAULT_INSTANCE_VISIBILITY, dtype=np.int8)
+            f, t = self.present.shape
+            coords[:f, :t] = self.coords
+            present[:f, :t] = self.present
+            instance_vis[:f, :t] = self.instance_vis
+            self.coords, self.present, self.instance_vis = coords, present, instance_vis
+
+        for frame_idx, insts in self._delta.items():
+            for track, values in insts.items():
+                t = self.track_index[track]
+                self.coords[frame_idx, t] = values
+                self.present[frame_idx, t] = True
+        self._delta.clear()
+        self._delta_size = 0
+
+    def _instance(self, frame_idx: int, track) -> Optional[np.ndarray]:
+        # Writable view of an existing instance, wherever it lives
+        if frame_idx < 0:
+            return None
+        pending = self._delta.get(frame_idx)
+        if pending is not None and track in pending:
+            return pending[track]
+        t = self.track_index.get(track)
+        if t is None or frame_idx >= self.frame_capacity or not self.present[frame_idx, t]:
+            return None
+        return self.coords[frame_idx, t]
+
+    def _frame_changed(self, frame_idx: int) -> None:
+        # Keeps the sorted labeled-frame list current without rescanning
+        self._dirty.add(frame_idx)
+        if self._labeled is None:
+            return
+        pos = bisect.bisect_left(self._labeled, frame_idx)
+        listed = pos < len(self._labeled) and self._labeled[pos] == frame_idx
+        if self.has_frame(frame_idx) and not listed:
+            self._labeled.insert(pos, frame_idx)
+        elif not self.has_frame(frame_idx) and listed:
+            del self._labeled[pos]
+
+    ### Read ###
+
+    def labeled_frames(self) -> list[int]:
+        if self._labeled is None:
+            base = np.flatnonzero(self.present.any(axis=1)).tolist()
+            self._labeled = sorted(set(base).union(self._delta))
+        return self._labeled
+
+    def has_frame(self, frame_idx: int) -> bool:
+        if frame_idx in self._delta:
+            return True
+        return 0 <= frame_idx < self.frame_capacity and bool(self.present[frame_idx].any())
+
+    def has_instance(self, frame_idx: int, track) -> bool:
+        return self._instance(frame_idx, track) is not None
+
+    def tracks_in_frame(self, frame_idx: int) -> list:
+        tracks = []
+        if 0 <= frame_idx < self.frame_capacity:
+            tracks = [self.track_names[t] for t in np.flatnonzero(self.present[frame_idx])]
+        return tracks + list(self._delta.get(frame_idx, ()))
+
+    def get_frame(self, frame_idx: int) -> dict:
+        coords = {t: {} for t in self.track_names}
+        for track in self.tracks_in_frame(frame_idx):
+            values = self._instance(frame_idx, track).tolist()
+            coords[track] = {kp: (x, y, int(v)) for kp, (x, y, v) in zip(self.kp_order, values)}
+        return coords
+
+    def get_instance(self, frame_idx: int, track) -> Optional[np.ndarray]:
+        values = self._instance(frame_idx, track)
+        return None if values is None else values.copy()
+
+    def get_point(self, frame_idx: int, track, kp: str) -> Optional[tuple[float, float, int]]:
+        values = self._instance(frame_idx, track)
+        k = self.kp_index.get(kp)
+        if values is None or k is None:
+            return None
+        x, y, v = values[k].tolist()
+        return x, y, int(v)
+
+    def nearest_instance(self, frame_idx: int, track, frame_range: int) -> Optional[np.ndarray]:
+        lo, hi = max(0, frame_idx - frame_range), frame_idx + frame_range + 1
+        frames = [f for f, insts in self._delta.items() if lo <= f < hi and track in insts]
+        t = self.track_index.get(track)
+        if t is not None:
+            frames += (lo + np.flatnonzero(self.present[lo:hi, t])).tolist()
+        if not frames:
+            return None
+        nearest = min(frames, key=lambda f: abs(f - frame_idx))
+        return self.get_instance(nearest, track)
+
+    ### Write ###
+
+    def set_instance(self, frame_idx: int, track, values) -> None:
+        # values: [keypoints, 3] array of (x, y, visibility) in kp_order
+        values = np.array(values, dtype=self.coords.dtype)
+        if values.shape != self.coords.shape[2:]:
+            raise ValueError(f"Instance shape {values.shape} does not match {self.coords.shape[2:]}")
+        if frame_idx < 0:
+            raise ValueError(f"Negative frame index: {frame_idx}")
+
+        if self._fits(frame_idx, track):
+            t = self.track_index[track]
+            if not self.present[frame_idx, t]:
+                self.instance_vis[frame_idx, t] = DEFAULT_INSTANCE_VISIBILITY
+            self.coords[frame_idx, t] = values
+            self.present[frame_idx, t] = True
+        else:
+            pending = self._delta.setdefault(frame_idx, {})
+            self._delta_size += track not in pending
+            pending[track] = values
+        self._frame_changed(frame_idx)
+        if self._delta_size > DELTA_COMPACT_SIZE:
+            self.compact()
+
+    def update_points(self, frame_idx: int, track, points: dict) -> bool:
+        # Batch move of an existing instance: {kp: (x, y)}; visibility is kept
+        values = self._instance(frame_idx, track)
+        if values is None:
+            return False
+        ks = [self.kp_index[kp] for kp in points if kp in self.kp_index]
+        xy = [points[kp][:2] for kp in points if kp in self.kp_index]
+        if ks:
+            values[ks, :2] = xy
+            self._dirty.add(frame_idx)
+        return True
+
+    def set_visibility(self, frame_idx: int, track, kp: str, visibility: int) -> bool:
+        values = self._instance(frame_idx, track)
+        k = self.kp_index.get(kp)
+        if values is None or k is None:
+            return False
+        values[k, 2] = visibility
+        self._dirty.add(frame_idx)
+        return True
+
+    def delete_instance(self, frame_idx: int, track) -> bool:
+        pending = self._delta.get(frame_idx)
+        if pending is not None and track in pending:
+            del pending[track]
+            self._delta_size -= 1
+            if not pending:
+                del self._delta[frame_idx]
+        elif self._instance(frame_idx, track) is not None:
+            t = self.track_index[track]
+            self.present[frame_idx, t] = False
+            self.coords[frame_idx, t] = 0.0
+        else:
+            return False
+        self._frame_changed(frame_idx)
+        return True
+
+    def swap_tracks(self, frame_idx: int, old_track, new_track) -> bool:
+        # Renames old_track to new_track in this frame, swapping if new_track exists
+        old_values = self.get_instance(frame_idx, old_track)
+        if old_values is None:
+            return False
+        new_values = self.get_instance(frame_idx, new_track)
+        self.delete_instance(frame_idx, old_track)
+        if new_values is not None:
+            self.delete_instance(frame_idx, new_track)
+            self.set_instance(frame_idx, old_track, new_values)
+        self.set_instance(frame_idx, new_track, old_values)
+        return True
+
+    def scale(self, sx: float, sy: float) -> None:
+        self.compact()
+        self.coords[..., 0] *= sx
+        self.coords[..., 1] *= sy
+        # Every frame changed; exporters start over
+        self.export_token = uuid.uuid4().hex
+
+    def take_dirty_frames(self) -> set[int]:
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    ### Array / DataFrame views ###
+
+    @classmethod
+    def from_arrays(cls, kp_order: list, track_names: list, frames: np.ndarray,
+                    track_ids: np.ndarray, values: np.ndarray,
+                    instance_visibility: Optional[np.ndarray] = None) -> "LabelStore":
+        # frames/track_ids: (N,) instance rows, values: (N, keypoints, 3),
+        # instance_visibility: (N,) or None for the default
+        if len(frames) and frames.min() < 0:
+            raise ValueError(f"Negative frame index: {frames.min()}")
+        capacity = int(frames.max()) + 1 if len(frames) else 0
+        store = cls(kp_order, track_names, frame_capacity=capacity)
+        store.coords[frames, track_ids] = values
+        store.present[frames, track_ids] = True
+        if instance_visibility is not None:
+            store.instance_vis[frames, track_ids] = instance_visibility
+        return store
+
+    def to_arrays(self, frames=None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Inverse of from_arrays, rows ordered by (frame, track index);
+        # `frames` limits the rows to those frames
+        self.compact()
+        if frames is None:
+            rows, track_ids = np.nonzero(self.present)
+        else:
+            wanted = np.unique(np.asarray(list(frames), dtype=np.int64))
+            wanted = wanted[(wanted >= 0) & (wanted < self.frame_capacity)]
+            pos, track_ids = np.nonzero(self.present[wanted])
+            rows = wanted[pos]
+        return (rows.astype(np.int64), track_ids.astype(np.int32), self.coords[rows, track_ids],
+                self.instance_vis[rows, track_ids])
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, kp_order: list, track_names: list) -> "LabelStore":
+        tracks = list(dict.fromkeys(list(track_names) + pd.unique(df["track"]).tolist()))
+        track_index = {t: i for i, t in enumerate(tracks)}
+        frames = df["frame_idx"].to_numpy().astype(np.int64)
+        track_ids = df["track"].map(track_index).to_numpy().astype(np.int64)
+
+        values = np.zeros((len(df), len(kp_order), 3), dtype=COORD_DTYPE)
+        for k, kp in enumerate(kp_order):
+            values[:, k, 0] = df[f"{kp}.x"].to_numpy(COORD_DTYPE)
+            values[:, k, 1] = df[f"{kp}.y"].to_numpy(COORD_DTYPE)
+            vcol = f"{kp}.visibility"
+            values[:, k, 2] = df[vcol].fillna(2).to_numpy(COORD_DTYPE) if vcol in df.columns else 2
+        instance_visibility = None
+        if "instance.visibility" in df.columns:
+            instance_visibility = df["instance.visibility"].fillna(DEFAULT_INSTANCE_VISIBILITY).to_numpy(np.int8)
+        store = cls.from_arrays(kp_order, tracks, frames, track_ids, values, instance_visibility)
+        store.has_instance_visibility = instance_visibility is not None
+        return store
+
+    def to_dataframe(self, frames=None) -> pd.DataFrame:
+        frames, tracks, values, instance_vis = self.to_arrays(frames)
+        columns = {
+            "track": pd.Series([self.track_names[t] for t in tracks], dtype=object),
+            "frame_idx": frames,
+        }
+        if self.has_instance_visibility:
+            columns["instance.visibility"] = instance_vis.astype(np.int64)
+        for k, kp in enumerate(self.kp_order):
+            columns[f"{kp}.x"] = values[:, k, 0]
+            columns[f"{kp}.y"] = values[:, k, 1]
+            columns[f"{kp}.visibility"] = values[:, k, 2].astype(np.int64)
+        return pd.DataFrame(columns)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import os
 import re
 from pathlib import Path
@@ -23,6 +24,8 @@ import numpy as np
 import shutil 
 
 ONLINE_TXT_EXPORT_ROOT = "online_label_exports"
+# Which label set (and file-name padding) an online export folder holds
+ONLINE_SYNC_STATE = ".sync.json"
 
 class _SaveActionDialog(QDialog):
     def __init__(self, parent: Optional[QWidget] = None) -> None:
@@ -61,7 +64,7 @@ class _SaveActionDialog(QDialog):
         return self._choice
 
 def save_modified_data(parent: QWidget):
-    if DataLoader.loaded_data is None:
+    if not DataLoader.is_loaded():
         QMessageBox.warning(parent, "Warning", "Load CSV/TXT first")
         return
 
@@ -73,7 +76,7 @@ def save_modified_data(parent: QWidget):
     if action is None:
         return
 
-    df_orig = _sanitize_index(DataLoader.loaded_data.copy())
+    df_orig = DataLoader.to_dataframe()
 
     project = _find_project(parent)
     if project is None or not hasattr(project, "project_dir"):
@@ -164,9 +167,9 @@ def export_loaded_data_to_txt_dir(
     clear_existing: bool = False,
 ) -> Path:
     if df is None:
-        if DataLoader.loaded_data is None:
+        if not DataLoader.is_loaded():
             raise ValueError("Load CSV/TXT first")
-        df = _sanitize_index(DataLoader.loaded_data.copy())
+        df = DataLoader.to_dataframe()
 
     target_dir = Path(target_dir)
     if clear_existing and target_dir.exists():
@@ -177,26 +180,56 @@ def export_loaded_data_to_txt_dir(
     return target_dir
 
 
-def export_current_labels_to_txt_snapshot(
-    parent: QWidget,
-    target_dir: str | Path | None = None,
-) -> Path:
+def export_current_labels_for_online_training(parent: QWidget) -> Path:
+    # One folder per video under runs/online_label_exports, kept in step with
+    # the loaded labels (see sync_loaded_labels_to_txt_dir)
     project = _find_project(parent)
     if project is None or not hasattr(project, "project_dir"):
         raise ValueError("Project information not found.")
 
     _, video_name = _current_video(parent)
-    if target_dir is None:
-        stamp = datetime.now().strftime("%y%m%d_%H%M%S")
-        target_dir = (
-            Path(project.project_dir)
-            / "runs"
-            / ONLINE_TXT_EXPORT_ROOT
-            / video_name
-            / f"txt_snapshot_{stamp}"
-        )
+    target_dir = Path(project.project_dir) / "runs" / ONLINE_TXT_EXPORT_ROOT / video_name / "txt"
+    return sync_loaded_labels_to_txt_dir(target_dir)
 
-    return export_loaded_data_to_txt_dir(target_dir)
+
+def sync_loaded_labels_to_txt_dir(target_dir: str | Path) -> Path:
+    # Only frames edited since the last sync are rewritten (or removed), so
+    # unchanged label files keep their size/mtime for the online dataset
+    # manifest. A folder holding another label set gets a full export.
+    store = DataLoader.store
+    if store is None:
+        raise ValueError("Load CSV/TXT first")
+    labeled = store.labeled_frames()
+    if not labeled:
+        raise ValueError("No labels to export.")
+
+    target_dir = Path(target_dir)
+    pad = max(2, len(str(labeled[-1])))
+    state_path = target_dir / ONLINE_SYNC_STATE
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    # A failed sync leaves no state behind, which forces a full export next time
+    state_path.unlink(missing_ok=True)
+
+    dirty = store.take_dirty_frames()
+    if state.get("token") == store.export_token and state.get("pad") == pad:
+        for frame_idx in dirty:
+            if not store.has_frame(frame_idx):
+                (target_dir / f"{frame_idx:0{pad}d}.txt").unlink(missing_ok=True)
+        written = sorted(f for f in dirty if store.has_frame(f))
+        if written:
+            _export_txt_files(target_dir, store.to_dataframe(written), pad=pad)
+    else:
+        if target_dir.exists():
+            shutil.rmtree(target_dir)
+        written = labeled
+        _export_txt_files(target_dir, store.to_dataframe(), pad=pad)
+
+    state_path.write_text(json.dumps({"token": store.export_token, "pad": pad}), encoding="utf-8")
+    print(f"[Online labels] {len(written)} of {len(labeled)} frames written to {target_dir}")
+    return target_dir
 
 def _current_video(parent: QWidget) -> str:
     if hasattr(parent, "video_combo"):
@@ -209,15 +242,6 @@ def _current_video(parent: QWidget) -> str:
         return p, p.stem
     return Path(), "unknown_video"
 
-def _sanitize_index(df: pd.DataFrame) -> pd.DataFrame:
-    for lvl in list(df.index.names):
-        if lvl:
-            drop = lvl in df.columns
-            df = df.reset_index(level=lvl, drop=drop)
-    df.reset_index(drop=True, inplace=True)
-    df = df.loc[:, ~df.columns.duplicated()]
-    return df
-
 def _find_project(parent: QWidget):
     cur = parent
     while cur:
@@ -266,11 +290,11 @@ def modify_yaml(video_path, file_type, file_path, yaml_path, project_info):
 def _norm(p: str | Path) -> Path:
     return str(Path(p).expanduser().resolve())
 
-def _export_txt_files(target_dir: Path, df: pd.DataFrame) -> None:
+def _export_txt_files(target_dir: Path, df: pd.DataFrame, pad: int | None = None) -> None:
     target_dir.mkdir(parents=True, exist_ok=True)
 
     max_f = int(df["frame_idx"].max())
-    pad   = max(2, len(str(max_f)))
+    pad   = pad or max(2, len(str(max_f)))
 
     tracks_num = df["track"].map({n: i for i, n in enumerate(DataLoader.animals_name)}).to_numpy(np.int32)
     fidx_arr   = df["frame_idx"].to_numpy(np.int32)
@@ -7,6 +7,7 @@ from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QPixmap, QImage
 from PyQt6.QtWidgets import QGraphicsOpacityEffect, QApplication, QMessageBox
 from .data_loader import DataLoader
+from utils.frames import open_frame_source
 import warnings
 
 class VideoLoader:
@@ -30,6 +31,7 @@ class VideoLoader:
 
         self.frame_dir = None
         self.frame_files = []
+        self.frame_source = None
         self.current_frame = 0
         self.total_frames = 0
         self.timer = QTimer()
@@ -51,25 +53,21 @@ class VideoLoader:
                         "Check the project's config.py file and make sure the directory is set properly. Video playback fps is fixed to 30.", UserWarning)
             self.fps = 30
 
-        frame_base_path = os.path.join(self.project_path, "frames")
         self.frame_display_mode = frame_display_mode
-        path = os.path.join(frame_base_path, path.stem, self._ensure_display_mode(frame_display_mode))
-        self.frame_dir = path
+        self._ensure_display_mode(frame_display_mode)
         try:
-            self.frame_files = sorted(f for f in os.listdir(path) if f.endswith(".jpg"))
+            self.frame_source = open_frame_source(self.project_path, path.stem, frame_display_mode)
+            if not self.frame_source.exists():
+                raise FileNotFoundError(str(self.frame_source.directory))
+            self.frame_dir = str(self.frame_source.directory)
+            self.frame_files = self.frame_source.names
             if not self.frame_files:
                 print("Could not load first frame.")
                 return False
-            first_frame_path = os.path.join(path, self.frame_files[0])
-
-            if self.frame_files[0] and os.path.exists(first_frame_path):
-                frame = cv2.imread(first_frame_path)
-                if frame is not None:
-                    self.display_video(frame, len(self.frame_files))
-                    #print(f"First frame displayed: {first_frame_path}")
-                else:
-                    print("Could not load first frame.")
-                    return False
+
+            frame = self.frame_source.read(0)
+            if frame is not None:
+                self.display_video(frame, self.frame_source.frame_span)
             else:
                 print("Could not load first frame.")
                 return False
@@ -102,13 +100,13 @@ class VideoLoader:
         DataLoader.set_image_dims(w = w, h = h)
 
         self.total_frames = total_frames
-        self.current_frame = 0
+        self.current_frame = self.frame_source.frame_numbers[0] if self.frame_source is not None else 0
         self.display_video_on_viewer(frame, reset = True)
         self.frame_slider.setMaximum(self.total_frames - 1)
-        self.frame_slider.setValue(0)
+        self.frame_slider.setValue(self.current_frame)
         if self.frame_jump_spin is not None:
             self.frame_jump_spin.setMaximum(max(0, self.total_frames - 1))
-            self.frame_jump_spin.setValue(0)
+            self.frame_jump_spin.setValue(self.current_frame)
 
     def display_video_on_viewer(self, frame, reset = False):
         frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -140,13 +138,13 @@ class VideoLoader:
             return False
 
     def play_next_frame(self):
-        if self.current_frame + 1 < self.total_frames:
-            self.current_frame += 1
-            frame_path = self.get_frame_path(self.current_frame)
-            if frame_path is None:
+        next_frame = self.frame_source.nearest_frame(self.current_frame + 1, 1) if self.frame_source else None
+        if next_frame is not None and next_frame < self.total_frames:
+            self.current_frame = next_frame
+            frame = self.get_frame(self.current_frame)
+            if frame is None:
                 self.timer.stop()
                 return
-            frame = cv2.imread(frame_path)
             self.display_video_on_viewer(frame)
         else:
             self.timer.stop()
@@ -155,24 +153,38 @@ class VideoLoader:
         if self.timer.isActive() and not force:
             return
         if 0 <= frame_idx < self.total_frames:
+            if self.frame_source.position_of(frame_idx) is None:
+                # Sparse extraction: step to the next available frame in the direction of travel
+                direction = 1 if frame_idx > self.current_frame else -1
+                frame_idx = self.frame_source.nearest_frame(frame_idx, direction)
+                if frame_idx is None:
+                    frame_idx = self.current_frame
             self.current_frame = frame_idx
-            frame_path = self.get_frame_path(frame_idx)
-            if frame_path is None:
+            frame = self.get_frame(frame_idx)
+            if frame is None:
                 self.timer.stop()
                 return
-            frame = cv2.imread(frame_path)
             self.display_video_on_viewer(frame)
         else:
             self.timer.stop()
 
-    def get_frame_path(self, frame_idx: int) -> Optional[str]:
-        if self.frame_dir is None:
+    def get_frame(self, frame_idx: int):
+        if self.frame_source is None:
             return None
-        if not self.frame_files:
+        pos = self.frame_source.position_of(frame_idx)
+        return self.frame_source.read(pos) if pos is not None else None
+
+    def get_current_frame(self):
+        return self.get_frame(self.current_frame)
+
+    def get_frame_path(self, frame_idx: int) -> Optional[str]:
+        # Virtual sources (contour) write the frame to disk on request
+        if self.frame_source is None:
             return None
-        if not (0 <= frame_idx < len(self.frame_files)):
+        pos = self.frame_source.position_of(frame_idx)
+        if pos is None:
             return None
-        return os.path.join(self.frame_dir, self.frame_files[frame_idx])
+        return self.frame_source.file_path(pos)
 
     def get_current_frame_path(self) -> Optional[str]:
         return self.get_frame_path(self.current_frame)
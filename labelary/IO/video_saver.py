@@ -6,19 +6,19 @@ import pandas as pd
 from pathlib import Path
 import cv2
 from .data_loader import DataLoader
-from .save_files import _sanitize_index, _find_project
+from .save_files import _find_project
+from utils.frames import open_frame_source
 import re
 from datetime import datetime
 from tqdm import tqdm
 import warnings
 
 def _export_video_stub(parent: QWidget) -> None:
-    if DataLoader.loaded_data is None:
+    if not DataLoader.is_loaded():
         QMessageBox.warning(parent, "Warning", "Load CSV/TXT first")
         return
 
-    from .save_files import _sanitize_index
-    df = _sanitize_index(DataLoader.loaded_data.copy())
+    df = DataLoader.to_dataframe()
 
     project = _find_project(parent)
     if project is None or not hasattr(project, "project_dir"):
@@ -28,24 +28,13 @@ def _export_video_stub(parent: QWidget) -> None:
     video_name = Path(parent.video_combo.currentText()).stem
     mode_text = parent.mode_combo.currentText() if hasattr(parent, "mode_combo") else "images"
 
-    if mode_text == "images":
-        mode_subdir = "images"
-    elif mode_text == "davis":
-        mode_subdir = "visualization/davis"
-    elif mode_text == "contour":
-        mode_subdir = "visualization/contour"
-    else:
-        mode_subdir = mode_text 
-    frames_dir = project_dir / "frames" / video_name / mode_subdir
-    if not frames_dir.exists():
+    source = open_frame_source(project_dir, video_name, mode_text)
+    frames_dir = source.directory
+    if not source.exists():
         QMessageBox.critical(parent, "Error", f"Frames directory not found:\n{frames_dir}")
         return
 
-    image_files = sorted(frames_dir.glob("*.png"))
-    if not image_files:
-        image_files = sorted(frames_dir.glob("*.jpg"))
-    if not image_files:
-        image_files = sorted(frames_dir.glob("*.jpeg"))
+    image_files = [frames_dir / name for name in source.names]
     if not image_files or len(image_files) == 0:
         QMessageBox.critical(parent, "Error", f"No frame images found in {frames_dir}")
         return
@@ -85,7 +74,7 @@ def _export_video_stub(parent: QWidget) -> None:
     else:
         fourcc = cv2.VideoWriter_fourcc(*"mp4v") 
 
-    sample_img = cv2.imread(str(image_files[0]))
+    sample_img = source.read(0)
     if sample_img is None:
         QMessageBox.critical(parent, "Error", f"Failed to read frame image: {image_files[0].name}")
         return
@@ -133,13 +122,15 @@ def _export_video_stub(parent: QWidget) -> None:
                         total=len(image_files),
                         desc="Exporting video",
                         unit="frame"):
-            frame_img = cv2.imread(str(img_path))
+            frame_img = source.read(i)
             if frame_img is None:
                 continue
 
-            frame_num = i
-            if frame_indices and frame_indices[0] == 1:
-                frame_num = i + 1
+            # Position i is frame i only for dense extractions; sparse sources are
+            # labeled with their real frame numbers, so the 1-based guess is dense-only
+            frame_num = source.frame_numbers[i]
+            if not source.is_sparse and frame_indices and frame_indices[0] == 1:
+                frame_num += 1
 
             if frame_num in frame_groups:
                 f_df = frame_groups[frame_num]
@@ -1,5 +1,12 @@
-from .labelary import run_labelary_with_project
-
 __all__ = [
     "run_labelary_with_project"
 ]
+
+
+def __getattr__(name):
+    # The editor pulls in PyQt; load it on first use so labelary.IO's label
+    # store and history stay importable in worker processes and tests
+    if name == "run_labelary_with_project":
+        from .labelary import run_labelary_with_project
+        return run_labelary_with_project
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtWidgets import QDialog, QDialogButtonBox, QFormLayout, QHBoxLayout, QPushButton, QSpinBox
+
+from utils.frames import open_frame_source
+
+AUTO_LABEL_LOOKAHEAD = 8
+AUTO_LABEL_CACHE_SIZE = 1024
+AUTO_LABEL_BATCH_SIZE = 16
+
+
+def parse_pose_predictions(result, kp_order: list, animals_name: list, confidence_threshold: float) -> list[dict]:
+    # Best detection per class -> [{"track": name, "keypoints": {kp: (x, y, vis)}}]
+    if result is None:
+        return []
+    boxes = getattr(result, "boxes", None)
+    keypoints = getattr(result, "keypoints", None)
+    if boxes is None or keypoints is None or boxes.cls is None or keypoints.xyn is None:
+        return []
+
+    cls_ids = boxes.cls.cpu().tolist()
+    det_scores = boxes.conf.cpu().tolist() if boxes.conf is not None else [0.0] * len(cls_ids)
+    keypoint_xy = keypoints.xyn.cpu().tolist()
+    keypoint_conf_tensor = getattr(keypoints, "conf", None)
+    keypoint_conf = keypoint_conf_tensor.cpu().tolist() if keypoint_conf_tensor is not None else None
+
+    if len(keypoint_xy) != len(cls_ids):
+        return []
+
+    expected_kpts = len(kp_order)
+    best_by_class: dict[int, dict] = {}
+    for det_idx, cls_val in enumerate(cls_ids):
+        class_idx = int(cls_val)
+        if not (0 <= class_idx < len(animals_name)):
+            continue
+
+        kp_xy = keypoint_xy[det_idx]
+        if len(kp_xy) != expected_kpts:
+            raise ValueError(
+                f"Model predicted {len(kp_xy)} keypoints, but the project expects {expected_kpts}."
+            )
+
+        score = float(det_scores[det_idx]) if det_idx < len(det_scores) else 0.0
+        if score < confidence_threshold:
+            continue
+        prev = best_by_class.get(class_idx)
+        if prev is not None and prev["score"] >= score:
+            continue
+
+        kp_conf_row = None
+        if keypoint_conf is not None and det_idx < len(keypoint_conf):
+            kp_conf_row = keypoint_conf[det_idx]
+
+        kp_map: dict[str, tuple[float, float, int]] = {}
+        for kp_idx, kp_name in enumerate(kp_order):
+            x, y = kp_xy[kp_idx]
+            x = max(0.0, min(float(x), 1.0))
+            y = max(0.0, min(float(y), 1.0))
+            conf = None
+            if kp_conf_row is not None and kp_idx < len(kp_conf_row):
+                conf = kp_conf_row[kp_idx]
+            vis = 2 if conf is None or float(conf) > 0.0 else 1
+            kp_map[kp_name] = (x, y, vis)
+
+        best_by_class[class_idx] = {
+            "score": score,
+            "track": animals_name[class_idx],
+            "keypoints": kp_map,
+        }
+
+    return [
+        {
+            "track": item["track"],
+            "keypoints": item["keypoints"],
+        }
+        for _, item in sorted(best_by_class.items())
+    ]
+
+
+class PredictionCache:
+    # LRU of parsed predictions, keyed by (model path, video, frame mode, conf) + frame number
+
+    def __init__(self, max_size: int = AUTO_LABEL_CACHE_SIZE):
+        self.max_size = max_size
+        self._items: OrderedDict = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+
+class AutoLabelWorker(QThread):
+    # Predicts requested frames one at a time off the GUI thread. Every
+    # request replaces whatever is still pending, so jumping elsewhere drops
+    # the stale look-ahead. The worker reads frames through its own frame
+    # source so it never shares decoder state with the viewer.
+    predicted = pyqtSignal(object, int, object)
+    failed    = pyqtSignal(object, int, str)
+
+    def __init__(self, model, project_dir, kp_order: list, animals_name: list):
+        super().__init__()
+        self.model = model
+        self.project_dir = project_dir
+        self.kp_order = list(kp_order)
+        self.animals_name = list(animals_name)
+        self._cond = threading.Condition()
+        self._pending: list[int] = []
+        self._key: Optional[tuple] = None
+        self._stopped = False
+        self._source = None
+        self._source_key = None
+
+    def request(self, key: tuple, frame_numbers: list[int]):
+        # key = (model path, video name, frame mode, conf)
+        with self._cond:
+            self._key = key
+            self._pending = list(frame_numbers)
+            self._cond.notify()
+
+    def clear(self):
+        with self._cond:
+            self._pending = []
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._pending = []
+            self._cond.notify()
+
+    def _frame_source(self, video_name: str, frame_mode: str):
+        if self._source_key != (video_name, frame_mode):
+            self._source = open_frame_source(self.project_dir, video_name, frame_mode)
+            self._source_key = (video_name, frame_mode)
+        return self._source
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                frame_number = self._pending.pop(0)
+                key = self._key
+
+            _, video_name, frame_mode, conf = key
+            try:
+                source = self._frame_source(video_name, frame_mode)
+                pos = source.position_of(frame_number)
+                frame = source.read(pos) if pos is not None else None
+                if frame is None:
+                    continue
+                results = self.model.predict(source=frame, conf=conf, verbose=False, save=False)
+                instances = parse_pose_predictions(results[0] if results else None,
+                                                   self.kp_order, self.animals_name, conf)
+            except Exception as e:
+                self.failed.emit(key, frame_number, str(e))
+                continue
+            self.predicted.emit(key, frame_number, instances)
+
+
+class RangeAutoLabelWorker(QThread):
+    # Predicts a list of frames in batches; results are kept in `results`
+    # (frame number -> instances) and inserted by the caller in one go.
+    progress = pyqtSignal(int, int, float)
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, model, project_dir, video_name: str, frame_mode: str, frame_numbers: list[int],
+                 conf: float, kp_order: list, animals_name: list, batch_size: int = AUTO_LABEL_BATCH_SIZE):
+        super().__init__()
+        self.model = model
+        self.project_dir = project_dir
+        self.video_name = video_name
+        self.frame_mode = frame_mode
+        self.frame_numbers = list(frame_numbers)
+        self.conf = conf
+        self.kp_order = list(kp_order)
+        self.animals_name = list(animals_name)
+        self.batch_size = max(1, int(batch_size))
+        self.results: dict[int, list[dict]] = {}
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            source = open_frame_source(self.project_dir, self.video_name, self.frame_mode)
+            total = len(self.frame_numbers)
+            started = time.perf_counter()
+            done = 0
+            for start in range(0, total, self.batch_size):
+                if self._cancelled:
+                    self.finished.emit(False, "Cancelled")
+                    return
+                batch_numbers, frames = [], []
+                for frame_number in self.frame_numbers[start:start + self.batch_size]:
+                    pos = source.position_of(frame_number)
+                    frame = source.read(pos) if pos is not None else None
+                    if frame is not None:
+                        batch_numbers.append(frame_number)
+                        frames.append(frame)
+                if frames:
+                    results = self.model.predict(source=frames, conf=self.conf, verbose=False, save=False)
+                    for frame_number, result in zip(batch_numbers, results):
+                        instances = parse_pose_predictions(result, self.kp_order, self.animals_name, self.conf)
+                        if instances:
+                            self.results[frame_number] = instances
+                done = min(total, start + self.batch_size)
+                elapsed = time.perf_counter() - started
+                self.progress.emit(done, total, done / elapsed if elapsed > 0 else 0.0)
+        except Exception as e:
+            self.finished.emit(False, str(e))
+            return
+        self.finished.emit(True, "")
+
+
+class LabelRangeDialog(QDialog):
+    def __init__(self, current_frame: int, total_frames: int, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Auto-label Frame Range")
+        last = max(0, total_frames - 1)
+
+        form = QFormLayout(self)
+        self.start_spin = QSpinBox(minimum=0, maximum=last, value=min(current_frame, last))
+        self.end_spin = QSpinBox(minimum=0, maximum=last, value=last)
+        self.start_spin.valueChanged.connect(lambda v: self.end_spin.setValue(max(v, self.end_spin.value())))
+        self.end_spin.valueChanged.connect(lambda v: self.start_spin.setValue(min(v, self.start_spin.value())))
+        form.addRow("From frame", self.start_spin)
+        form.addRow("To frame", self.end_spin)
+
+        all_btn = QPushButton("All frames")
+        all_btn.clicked.connect(lambda: (self.start_spin.setValue(0), self.end_spin.setValue(last)))
+        row = QHBoxLayout()
+        row.addWidget(all_btn)
+        row.addStretch()
+        form.addRow(row)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        form.addRow(buttons)
+
+    def frame_range(self) -> tuple[int, int]:
+        return self.start_spin.value(), self.end_spin.value()
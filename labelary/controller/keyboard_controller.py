@@ -72,6 +72,17 @@ class KeyboardController(QObject):
                   event.modifiers() & Qt.KeyboardModifier.ControlModifier):
                 self.mouse_controller._toggle_selected_node_visibility()
                 return True
+            elif (key == Qt.Key.Key_Z and
+                  event.modifiers() & Qt.KeyboardModifier.ControlModifier):
+                if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                    self.main_dialog.redo_edit()
+                else:
+                    self.main_dialog.undo_edit()
+                return True
+            elif (key == Qt.Key.Key_Y and
+                  event.modifiers() & Qt.KeyboardModifier.ControlModifier):
+                self.main_dialog.redo_edit()
+                return True
             for idx, key_num in enumerate([1,2,3,4,5,6,7,8,9,0]):
                 if (key == getattr(Qt.Key, f"Key_{key_num}") and event.modifiers() & Qt.KeyboardModifier.ControlModifier):
                     self.mouse_controller._change_instance_number_by_idx(idx)
@@ -242,8 +242,7 @@ class MouseController(QObject):
                     else:
                         _, track = self.video_viewer.dragging_target
                     if track in self.video_viewer.csv_points:
-                        for kp, (nx, ny, _) in self.video_viewer.csv_points[track].items():
-                            DataLoader.update_point(track, frame_idx, kp, nx, ny)
+                        DataLoader.update_instance_points(track, frame_idx, self.video_viewer.csv_points[track])
         except KeyError:
             pass
 
@@ -658,23 +657,21 @@ class MouseController(QObject):
             return
         track_name = self.selected_instance
         frame_idx = self.video_viewer.current_frame
-        if not DataLoader.delete_instance(frame_idx, track_name):
-            return
+        with DataLoader.history.group("Replace instance"):
+            if not DataLoader.delete_instance(frame_idx, track_name):
+                return
 
-        coords = DataLoader.get_keypoint_coordinates_by_frame(frame_idx)
-        self.video_viewer.setCSVPoints(coords)
-        self.kpt_list.update_list_visibility(coords)
-        self.video_viewer.update()
+            coords = DataLoader.get_keypoint_coordinates_by_frame(frame_idx)
+            self.video_viewer.setCSVPoints(coords)
+            self.kpt_list.update_list_visibility(coords)
+            self.video_viewer.update()
 
-        self.selected_instance = None
-        self.selected_node = None
-        self._add_new_skeleton_label(track_name=track_name, context_pos=context_pos)
+            self.selected_instance = None
+            self.selected_node = None
+            self._add_new_skeleton_label(track_name=track_name, context_pos=context_pos)
 
     def _tracks_in_frame(self, frame_idx: int):
-        df = DataLoader.loaded_data
-        if df is None or df.empty:
-            return set()
-        return set(df[df["frame_idx"] == frame_idx]["track"].unique())
+        return set(DataLoader.tracks_in_frame(frame_idx))
 
     def _delete_selected_instance(self):
         if self.selected_instance is None:
@@ -735,13 +732,8 @@ class MouseController(QObject):
         track, kp = self.selected_node
         frame_idx = getattr(self.video_viewer, "current_frame", 0)
 
-        cur_vis = 2
-        df = DataLoader.loaded_data if hasattr(DataLoader, "loaded_data") else None
-        if df is not None:
-            try:
-                cur_vis = df.loc[(df["track"] == track) & (df["frame_idx"] == frame_idx), f"{kp}.visibility"].iat[0]
-            except Exception:
-                pass
+        point = DataLoader.get_point(track, frame_idx, kp)
+        cur_vis = point[2] if point is not None else 2
 
         new_vis = 1 if cur_vis == 2 else 2
         DataLoader.update_kpt_visibility(track, frame_idx, kp, new_vis)
@@ -78,6 +78,10 @@ class UI_LabelaryDialog(object):
         self.auto_label_confidence_spin.setFocusPolicy(QtCore.Qt.FocusPolicy.ClickFocus)
         self.auto_label_confidence_spin.setObjectName("auto_label_confidence_spin")
         self.mini_training_layout.addWidget(self.auto_label_confidence_spin)
+        self.label_range_button = QtWidgets.QPushButton(parent=Dialog)
+        self.label_range_button.setFocusPolicy(QtCore.Qt.FocusPolicy.NoFocus)
+        self.label_range_button.setObjectName("label_range_button")
+        self.mini_training_layout.addWidget(self.label_range_button)
         self.mini_training_layout.addSpacing(16)
         self.training_section_label = QtWidgets.QLabel(parent=Dialog)
         self.training_section_label.setObjectName("training_section_label")
@@ -186,6 +190,7 @@ class UI_LabelaryDialog(object):
         self.load_model_button.setText(_translate("Dialog", "Browse/Load Model"))
         self.mini_training_label.setText(_translate("Dialog", "<b>Inference</b>"))
         self.auto_label_confidence_label.setText(_translate("Dialog", "Confidence"))
+        self.label_range_button.setText(_translate("Dialog", "Label Range..."))
         self.training_section_label.setText(_translate("Dialog", "<b>Training</b>"))
         self.mini_training_epochs_label.setText(_translate("Dialog", "Epochs"))
         self.mini_training_button.setText(_translate("Dialog", "Run Mini Training"))
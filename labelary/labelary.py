@@ -3,18 +3,24 @@ from PyQt6.QtGui import QFont, QPixmap, QColor, QIcon, QPainter, QPen
 from PyQt6.QtWidgets import (
     QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QFileDialog,
     QSlider, QListWidget, QFrame, QApplication, QDialog, QListWidgetItem, QTreeWidget, QMessageBox,
-    QColorDialog, QTreeWidgetItem, QComboBox, QHeaderView, QStyledItemDelegate,
+    QColorDialog, QTreeWidgetItem, QComboBox, QHeaderView, QStyledItemDelegate, QProgressDialog,
 )
 from .gui import UI_LabelaryDialog
 from .IO.video_loader import VideoLoader
 from .widget.image_label import ClickableImageLabel
 from .IO.data_loader import DataLoader
-from .IO.save_files import save_modified_data, export_current_labels_to_txt_snapshot
+from .IO.save_files import save_modified_data, export_current_labels_for_online_training
 from .controller.keyboard_controller import KeyboardController
 from .controller.mouse_controller import MouseController
 from utils.skeleton import SkeletonModel
-from pose.prepare_data import create_online_training_dataset
-from pose.thread import TrainThread
+from pose.prepare_data import create_online_training_dataset, split_data_paths
+from pose.export import MODEL_FILE_FILTER, load_pose_model, model_runtime
+from pose.thread import submit_yolo_job
+from .auto_label import (
+    AUTO_LABEL_BATCH_SIZE, AUTO_LABEL_LOOKAHEAD, AutoLabelWorker, LabelRangeDialog, PredictionCache,
+    RangeAutoLabelWorker,
+)
+from main.jobs import ACTIVE_STATES, JobManager
 
 from typing import Union, Optional, List
 from datetime import datetime
@@ -31,7 +37,11 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
         self.auto_label_model = None
         self.auto_label_model_path: Optional[str] = None
         self.auto_label_model_mode: Optional[str] = None
-        self.mini_training_thread: Optional[TrainThread] = None
+        self.auto_label_worker: Optional[AutoLabelWorker] = None
+        self.auto_label_cache = PredictionCache()
+        self._auto_label_last_frame = 0
+        self.range_label_worker: Optional[RangeAutoLabelWorker] = None
+        self.mini_training_job: Optional[str] = None
         self.mini_training_run_context: Optional[dict] = None
         self.shortcuts_enabled = True
         self.load_skeleton_model()
@@ -60,6 +70,7 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
         self.load_data_button.clicked.connect(self.on_show_clicked)
         self.load_model_button.clicked.connect(self.browse_and_load_model)
         self.automatic_label_checkbox.toggled.connect(self.on_automatic_label_toggled)
+        self.label_range_button.clicked.connect(self.run_range_auto_label)
         self.mini_training_button.clicked.connect(self.run_mini_training)
 
         self.video_combo.currentIndexChanged.connect(self.update_label_combo)
@@ -229,9 +240,29 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
         self.skeleton_video_viewer.setCSVPoints(coords_dict)
         self.kpt_list.update_list_visibility(coords_dict)
         
+    def undo_edit(self):
+        # Edits are only made while paused; keep undo to the same state
+        if self.mouse_controller.enable_control:
+            self._show_edited_frame(DataLoader.undo())
+
+    def redo_edit(self):
+        if self.mouse_controller.enable_control:
+            self._show_edited_frame(DataLoader.redo())
+
+    def _show_edited_frame(self, frame_idx):
+        if frame_idx is None:
+            return
+        self.mouse_controller.selected_instance = None
+        self.mouse_controller.selected_node = None
+        self.kpt_list.highlight(None, None)
+        if frame_idx != self.video_loader.current_frame:
+            self.video_loader.move_to_frame(frame_idx, force=True)
+        self.update_csv_points_on_image()
+        self.skeleton_video_viewer.update()
+
     def update_keypoint_list(self):
         self.kpt_list.clear()
-        if DataLoader.loaded_data is None:
+        if not DataLoader.is_loaded():
             return
         tracks = list(self.project.animals_name)
         self.kpt_list.build(tracks, DataLoader.kp_order, self.skeleton)
@@ -256,6 +287,8 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
 
     def on_automatic_label_toggled(self, checked: bool):
         if not checked:
+            if self.auto_label_worker is not None:
+                self.auto_label_worker.clear()
             return
         if self.auto_label_model is None:
             QMessageBox.warning(self, "Model not loaded", "Load a model before enabling automatic labeling.")
@@ -271,7 +304,7 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
             self,
             "Select YOLO pose model",
             str(start_dir),
-            "PyTorch model (*.pt);;All Files (*)"
+            MODEL_FILE_FILTER
         )
         if not model_path:
             return
@@ -301,7 +334,7 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
             return
 
         try:
-            from ultralytics import YOLO
+            import ultralytics
         except ImportError:
             QMessageBox.critical(
                 self,
@@ -312,10 +345,8 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
 
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            model = YOLO(str(model_path))
-            model_task = getattr(model, "task", None)
-            if model_task not in (None, "pose"):
-                raise ValueError(f"Expected a pose model, but got task='{model_task}'.")
+            # .pt, .onnx or an OpenVINO export (selected through its .xml)
+            model = load_pose_model(model_path)
         except Exception as e:
             QMessageBox.critical(self, "Model load failed", f"Failed to load model:\n{e}")
             return
@@ -324,6 +355,7 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
 
         resolved_path = str(model_path.resolve())
         self.auto_label_model = model
+        self._start_auto_label_worker()
         self.auto_label_model_path = resolved_path
         self.auto_label_model_mode = self.mode_combo.currentText()
         self._set_model_path_display(resolved_path)
@@ -349,6 +381,7 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
             current_path = new_path
 
         if current_path != self.auto_label_model_path:
+            self._stop_auto_label_worker()
             self.auto_label_model = None
             self.auto_label_model_path = None
             self.auto_label_model_mode = None
@@ -385,8 +418,12 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
             self.load_model_button.setToolTip("")
         self._refresh_mini_training_button_state()
 
+    def _mini_training_active(self) -> bool:
+        job = JobManager.instance().jobs.get(self.mini_training_job)
+        return job is not None and job.state in ACTIVE_STATES
+
     def _refresh_mini_training_button_state(self):
-        if self.mini_training_thread is not None and self.mini_training_thread.isRunning():
+        if self._mini_training_active():
             self.mini_training_button.setEnabled(False)
             self.mini_training_button.setText("Mini Training...")
         else:
@@ -395,8 +432,8 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
 
         frame_mode = self.video_loader.frame_display_mode if getattr(self.skeleton_video_viewer, "video_loaded", False) else self.mode_combo.currentText()
         self.mini_training_button.setToolTip(
-            "Export current in-memory labels to a timestamped snapshot under runs/, "
-            "build a separate online dataset, run short fine-tuning, and hot-load the resulting best.pt "
+            "Sync current in-memory labels to runs/online_label_exports, "
+            "update the persistent online dataset with changed frames, run short fine-tuning, and hot-load the resulting best.pt "
             f"using the current frame mode '{frame_mode}'."
         )
 
@@ -431,9 +468,7 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
         with base_config_path.open("r", encoding="utf-8") as f:
             config = yaml.safe_load(f) or {}
 
-        config["train"] = (dataset_dir / "train").as_posix()
-        config["val"] = (dataset_dir / "val").as_posix()
-        config["test"] = (dataset_dir / "test").as_posix()
+        config.update(split_data_paths(dataset_dir))
 
         target_config_path = Path(self.project.project_dir) / "runs" / f"{run_name}_config.yaml"
         with target_config_path.open("w", encoding="utf-8") as f:
@@ -442,10 +477,10 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
         return target_config_path
 
     def run_mini_training(self):
-        if self.mini_training_thread is not None and self.mini_training_thread.isRunning():
+        if self._mini_training_active():
             return
 
-        if DataLoader.loaded_data is None or DataLoader.loaded_data.empty:
+        if not DataLoader.has_labels():
             QMessageBox.warning(self, "No labels loaded", "Load and review labels before starting mini training.")
             return
 
@@ -453,6 +488,10 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
         if model_path is None:
             QMessageBox.warning(self, "No model selected", "Load a base model or choose a valid model file first.")
             return
+        if model_runtime(model_path) != "pytorch":
+            QMessageBox.warning(self, "PyTorch model required",
+                                "Mini training fine-tunes a .pt model. Load the .pt this export was made from.")
+            return
 
         try:
             current_video = self.video_combo.currentData(Qt.ItemDataRole.UserRole)
@@ -460,11 +499,11 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
                 raise ValueError("Current video is not selected.")
 
             current_video_name = Path(current_video).stem
-            snapshot_dir = export_current_labels_to_txt_snapshot(self)
+            label_dir = export_current_labels_for_online_training(self)
             dataset_dir, split_counts = create_online_training_dataset(
                 self.project,
                 frame_type=self._current_frame_mode(),
-                label_dirs={current_video_name: snapshot_dir},
+                label_dirs={current_video_name: label_dir},
             )
 
             run_stamp = datetime.now().strftime("%y%m%d_%H%M%S")
@@ -491,30 +530,32 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
             "run_name": run_name,
             "output_dir": output_dir,
             "dataset_dir": dataset_dir,
-            "snapshot_dir": snapshot_dir,
+            "label_dir": label_dir,
             "config_path": config_path,
             "split_counts": split_counts,
         }
 
-        self.mini_training_thread = TrainThread(command)
-        self.mini_training_thread.finished_signal.connect(self.on_mini_training_finished)
+        self.mini_training_job = submit_yolo_job(f"Mini training: {run_name}", command,
+                                                 on_finished=self.on_mini_training_finished,
+                                                 events_log=output_dir.with_name(f"{run_name}_events.jsonl"))
         self._refresh_mini_training_button_state()
-        self.mini_training_thread.start()
 
         QMessageBox.information(
             self,
             "Mini training started",
             "Started quick fine-tuning with the current reviewed labels.\n\n"
-            f"Snapshot: {snapshot_dir}\n"
+            f"Labels: {label_dir}\n"
             f"Dataset: {dataset_dir}\n"
             f"Train/Val/Test: {split_counts['train']}/{split_counts['val']}/{split_counts['test']}\n"
             f"Output: {output_dir}"
         )
 
-    def on_mini_training_finished(self):
+    def on_mini_training_finished(self, job=None):
         context = self.mini_training_run_context or {}
-        self.mini_training_thread = None
+        self.mini_training_job = None
         self._refresh_mini_training_button_state()
+        if job is not None and job.state == "cancelled":
+            return
 
         best_model_path = Path(context.get("output_dir", "")) / "weights" / "best.pt"
         if not best_model_path.exists():
@@ -532,7 +573,7 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
     def auto_label_current_frame(self):
         if not self.automatic_label_checkbox.isChecked():
             return
-        if self.auto_label_model is None:
+        if self.auto_label_model is None or self.auto_label_worker is None:
             return
         if not getattr(self.skeleton_video_viewer, "video_loaded", False):
             return
@@ -551,106 +592,146 @@ class LabelaryDialog(QDialog, UI_LabelaryDialog):
             return
 
         frame_idx = self.video_loader.current_frame
-        if DataLoader.frame_has_labels(frame_idx):
+        direction = -1 if frame_idx < self._auto_label_last_frame else 1
+        self._auto_label_last_frame = frame_idx
+        key = self._auto_label_key()
+
+        if not DataLoader.frame_has_labels(frame_idx):
+            instances = self.auto_label_cache.get(key + (frame_idx,))
+            if instances is not None:
+                self._apply_auto_labels(frame_idx, instances)
+
+        # Current frame first, then the next few frames in the direction of travel;
+        # labeled or cached frames still use up the look-ahead
+        wanted = []
+        source = self.video_loader.frame_source
+        candidate = frame_idx
+        for _ in range(AUTO_LABEL_LOOKAHEAD + 1):
+            if candidate is None:
+                break
+            if key + (candidate,) not in self.auto_label_cache and not DataLoader.frame_has_labels(candidate):
+                wanted.append(candidate)
+            candidate = source.nearest_frame(candidate + direction, direction) if source is not None else None
+        self.auto_label_worker.request(key, wanted)
+
+    def _auto_label_key(self) -> tuple:
+        video = self.video_combo.currentData(Qt.ItemDataRole.UserRole)
+        video_name = Path(video).stem if video is not None else ""
+        return (self.auto_label_model_path, video_name, self.video_loader.frame_display_mode,
+                float(self.auto_label_confidence_spin.value()))
+
+    def _apply_auto_labels(self, frame_idx: int, instances: list[dict]):
+        if not instances:
             return
+        if DataLoader.add_auto_labeled_frame(frame_idx, instances):
+            self.update_csv_points_on_image()
+            self.skeleton_video_viewer.update()
+            self.kpt_list.update()
 
-        frame_path = self.video_loader.get_current_frame_path()
-        if not frame_path:
+    def _on_auto_label_predicted(self, key: tuple, frame_idx: int, instances: list):
+        self.auto_label_cache.put(key + (frame_idx,), instances)
+        if (
+            self.automatic_label_checkbox.isChecked()
+            and frame_idx == self.video_loader.current_frame
+            and key == self._auto_label_key()
+            and not DataLoader.frame_has_labels(frame_idx)
+        ):
+            self._apply_auto_labels(frame_idx, instances)
+
+    def _on_auto_label_failed(self, key: tuple, frame_idx: int, message: str):
+        if frame_idx != self.video_loader.current_frame or key != self._auto_label_key():
+            print(f"[Auto label] Look-ahead prediction for frame {frame_idx} failed: {message}")
             return
+        QMessageBox.critical(self, "Auto labeling failed", f"Failed to run inference:\n{message}")
+
+    def _start_auto_label_worker(self):
+        self._stop_auto_label_worker()
+        self.auto_label_cache.clear()
+        self.auto_label_worker = AutoLabelWorker(self.auto_label_model, self.project.project_dir,
+                                                 DataLoader.kp_order, self.project.animals_name)
+        self.auto_label_worker.predicted.connect(self._on_auto_label_predicted)
+        self.auto_label_worker.failed.connect(self._on_auto_label_failed)
+        self.auto_label_worker.start()
+
+    def _stop_auto_label_worker(self):
+        if self.auto_label_worker is None:
+            return
+        self.auto_label_worker.stop()
+        self.auto_label_worker.wait()
+        self.auto_label_worker.deleteLater()
+        self.auto_label_worker = None
 
-        try:
-            instances = self.predict_current_frame(frame_path)
-        except Exception as e:
-            QMessageBox.critical(self, "Auto labeling failed", f"Failed to run inference:\n{e}")
+    def run_range_auto_label(self):
+        if self.auto_label_model is None:
+            QMessageBox.warning(self, "Model not loaded", "Load a model before auto-labeling a frame range.")
+            return
+        if not getattr(self.skeleton_video_viewer, "video_loaded", False) or self.video_loader.frame_source is None:
+            QMessageBox.warning(self, "No video loaded", "Load a video and its labels first.")
+            return
+        if self.range_label_worker is not None:
             return
 
-        if not instances:
+        dialog = LabelRangeDialog(self.video_loader.current_frame, self.video_loader.total_frames, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        start, end = dialog.frame_range()
+        labeled = set(DataLoader.get_labeled_frames())
+        frames = [n for n in self.video_loader.frame_source.frame_numbers if start <= n <= end and n not in labeled]
+        if not frames:
+            QMessageBox.information(self, "Nothing to label", f"Every frame in {start}-{end} already has labels.")
             return
 
-        if DataLoader.add_auto_labeled_frame(frame_idx, instances):
+        _, video_name, frame_mode, conf = self._auto_label_key()
+        # Exports are static-shape; only PyTorch models take batches
+        batch_size = AUTO_LABEL_BATCH_SIZE if model_runtime(self.auto_label_model_path) == "pytorch" else 1
+        # The look-ahead worker shares the model; keep it idle until the range is done
+        self._stop_auto_label_worker()
+        worker = RangeAutoLabelWorker(self.auto_label_model, self.project.project_dir, video_name, frame_mode,
+                                      frames, conf, DataLoader.kp_order, self.project.animals_name, batch_size)
+        self.range_label_worker = worker
+
+        progress = QProgressDialog(f"Auto-labeling {len(frames)} frames...", "Cancel", 0, len(frames), self)
+        progress.setWindowTitle("Auto-label Frame Range")
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(worker.cancel)
+        started = datetime.now()
+
+        def _progress(done, total, fps):
+            progress.setValue(done)
+            progress.setLabelText(f"Auto-labeling frames {start}-{end}\n{done}/{total} frames · {fps:.1f} frames/s")
+
+        def _finished(ok, error):
+            worker.wait()
+            progress.close()
+            added = DataLoader.add_auto_labeled_frames(worker.results)
+            worker.deleteLater()
+            self.range_label_worker = None
+            if self.auto_label_model is not None:
+                self._start_auto_label_worker()
             self.update_csv_points_on_image()
             self.skeleton_video_viewer.update()
             self.kpt_list.update()
 
-    def predict_current_frame(self, frame_path: str) -> list[dict]:
-        confidence_threshold = float(self.auto_label_confidence_spin.value())
-        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-        try:
-            results = self.auto_label_model.predict(
-                source=frame_path,
-                conf=confidence_threshold,
-                verbose=False,
-                save=False,
-            )
-        finally:
-            QApplication.restoreOverrideCursor()
-
-        if not results:
-            return []
-
-        result = results[0]
-        boxes = getattr(result, "boxes", None)
-        keypoints = getattr(result, "keypoints", None)
-        if boxes is None or keypoints is None or boxes.cls is None or keypoints.xyn is None:
-            return []
-
-        cls_ids = boxes.cls.cpu().tolist()
-        det_scores = boxes.conf.cpu().tolist() if boxes.conf is not None else [0.0] * len(cls_ids)
-        keypoint_xy = keypoints.xyn.cpu().tolist()
-        keypoint_conf_tensor = getattr(keypoints, "conf", None)
-        keypoint_conf = keypoint_conf_tensor.cpu().tolist() if keypoint_conf_tensor is not None else None
-
-        if len(keypoint_xy) != len(cls_ids):
-            return []
-
-        expected_kpts = len(DataLoader.kp_order)
-        best_by_class: dict[int, dict] = {}
-        for det_idx, cls_val in enumerate(cls_ids):
-            class_idx = int(cls_val)
-            if not (0 <= class_idx < len(self.project.animals_name)):
-                continue
-
-            kp_xy = keypoint_xy[det_idx]
-            if len(kp_xy) != expected_kpts:
-                raise ValueError(
-                    f"Model predicted {len(kp_xy)} keypoints, but the project expects {expected_kpts}."
-                )
-
-            score = float(det_scores[det_idx]) if det_idx < len(det_scores) else 0.0
-            if score < confidence_threshold:
-                continue
-            prev = best_by_class.get(class_idx)
-            if prev is not None and prev["score"] >= score:
-                continue
-
-            kp_conf_row = None
-            if keypoint_conf is not None and det_idx < len(keypoint_conf):
-                kp_conf_row = keypoint_conf[det_idx]
-
-            kp_map: dict[str, tuple[float, float, int]] = {}
-            for kp_idx, kp_name in enumerate(DataLoader.kp_order):
-                x, y = kp_xy[kp_idx]
-                x = max(0.0, min(float(x), 1.0))
-                y = max(0.0, min(float(y), 1.0))
-                conf = None
-                if kp_conf_row is not None and kp_idx < len(kp_conf_row):
-                    conf = kp_conf_row[kp_idx]
-                vis = 2 if conf is None or float(conf) > 0.0 else 1
-                kp_map[kp_name] = (x, y, vis)
-
-            best_by_class[class_idx] = {
-                "score": score,
-                "track": self.project.animals_name[class_idx],
-                "keypoints": kp_map,
-            }
-
-        return [
-            {
-                "track": item["track"],
-                "keypoints": item["keypoints"],
-            }
-            for _, item in sorted(best_by_class.items())
-        ]
+            seconds = (datetime.now() - started).total_seconds()
+            summary = f"Added labels to {added} of {len(frames)} frames in {seconds:.1f} s."
+            if ok:
+                QMessageBox.information(self, "Auto-labeling finished", summary)
+            elif error == "Cancelled":
+                QMessageBox.information(self, "Auto-labeling cancelled", summary)
+            else:
+                QMessageBox.critical(self, "Auto-labeling failed", f"{error}\n\n{summary}")
+
+        worker.progress.connect(_progress)
+        worker.finished.connect(_finished)
+        worker.start()
+
+    def done(self, result):
+        if self.range_label_worker is not None:
+            self.range_label_worker.finished.disconnect()
+            self.range_label_worker.cancel()
+            self.range_label_worker.wait()
+        self._stop_auto_label_worker()
+        super().done(result)
 
 def run_labelary_with_project(current_project, parent=None):
     app = QApplication.instance() or QApplication(sys.argv)
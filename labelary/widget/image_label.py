@@ -9,13 +9,10 @@ from PyQt6.QtWidgets import QLabel, QMenu
 
 from ..IO.data_loader import DataLoader
 from utils.project import ProjectInformation
+from utils.palette import CUTIE_COLOR_BASE
 
 from labelary.controller import MouseController
 
-CUTIE_COLOR_BASE = ["#ab1f24", "#36ae37", "#b9b917", "#063391", "#983a91",
-                    "#20b6b5", "#c1c0bf", "#5c0d11", "#e71f19", "#60b630",
-                    "#f4ba19", "#503390", "#ca4392", "#5eb7b7", "#f6bcbc"]
-
 SKELETON_COLOR_SET = {"cutie_light" : (QColor("white"), 0.5),
                         "cutie_dark" : (QColor("black"), 0.4),
                         "white" : (QColor("white"), 1),
@@ -3,9 +3,7 @@ from PyQt6.QtWidgets import QListWidget, QListWidgetItem, QStyledItemDelegate
 from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QFontMetrics, QFont
 from PyQt6.QtCore import Qt, QSize
 
-CUTIE_COLOR_BASE = ["#ab1f24", "#36ae37", "#b9b917", "#063391", "#983a91",
-                    "#20b6b5", "#c1c0bf", "#5c0d11", "#e71f19", "#60b630",
-                    "#f4ba19", "#503390", "#ca4392", "#5eb7b7", "#f6bcbc"]
+from utils.palette import CUTIE_COLOR_BASE
 
 def _background_color_track(idx) -> QColor:
     color = QColor(CUTIE_COLOR_BASE[idx])
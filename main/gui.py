@@ -51,6 +51,9 @@ class MainWindow(QMainWindow):
         self.btn_load_yaml = QPushButton("Load YAML…", self)
         self.btn_load_yaml.clicked.connect(self.on_load_yaml_clicked)
         proj_bar.addWidget(self.btn_load_yaml)
+        self.btn_jobs = QPushButton("Jobs", self)
+        self.btn_jobs.clicked.connect(self.controller.show_jobs)
+        proj_bar.addWidget(self.btn_jobs)
         outer_layout.addLayout(proj_bar)
 
         self.current_project = None
@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QProcess, QProcessEnvironment, QStandardPaths, QTimer, pyqtSignal
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+ACTIVE_STATES = ("queued", "running")
+DEFAULT_RESOURCE_LIMITS = {
+    "gpu": 1,          # YOLO training / inference
+    "cpu": 1,          # jobs that already fan out over every core (contour, extraction)
+    "interactive": 1,  # Cutie GUI sessions
+}
+LOG_TAIL_LINES = 500
+
+# name -> factory(job) returning an object with feed(line) -> Optional[dict] and close().
+# Lets tools turn a command's console output into progress events without this
+# module knowing their formats (see pose/progress.py).
+_PROGRESS_PARSERS: dict[str, Callable] = {}
+
+
+def register_progress_parser(name: str, factory: Callable):
+    _PROGRESS_PARSERS[name] = factory
+
+
+@dataclass
+class Job:
+    title: str
+    kind: str = "command"            # "command" (subprocess) or "task" (in-process runner)
+    command: list = field(default_factory=list)
+    cwd: Optional[str] = None
+    env: dict = field(default_factory=dict)
+    resource: str = "cpu"
+    max_retries: int = 0
+    progress_parser: str = ""
+    events_log: Optional[str] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    state: str = "queued"
+    attempts: int = 0
+    return_code: Optional[int] = None
+    error: str = ""
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def persistent(self) -> bool:
+        # Task jobs wrap in-process objects and cannot survive a restart
+        return self.kind == "command"
+
+
+def _last_segment(line: str) -> str:
+    segments = [part for part in line.split("\r") if part]
+    return segments[-1] if segments else ""
+
+
+def default_queue_path() -> Path:
+    appdata_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    appdata_dir = Path(appdata_root) if appdata_root else (Path.home() / "AppData" / "Roaming" / "MovAl")
+    return appdata_dir / "jobs.json"
+
+
+class JobManager(QObject):
+    job_added    = pyqtSignal(str)
+    job_changed  = pyqtSignal(str)
+    job_output   = pyqtSignal(str, str)
+    job_finished = pyqtSignal(str, str)
+    job_progress = pyqtSignal(str, dict)
+    paused_changed = pyqtSignal(bool)
+
+    _instance: Optional["JobManager"] = None
+
+    @classmethod
+    def instance(cls) -> "JobManager":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, queue_path: Optional[Path] = None, resource_limits: Optional[dict] = None):
+        super().__init__()
+        self.queue_path = Path(queue_path) if queue_path else default_queue_path()
+        self.resource_limits = dict(DEFAULT_RESOURCE_LIMITS)
+        self.resource_limits.update(resource_limits or {})
+        self.jobs: dict[str, Job] = {}
+        self.logs: dict[str, list[str]] = {}
+        self.paused = False
+
+        self._processes: dict[str, QProcess] = {}
+        self._tasks: dict[str, object] = {}
+        self._partial: dict[str, str] = {}
+        self._parsers: dict[str, object] = {}
+        self._last_fed: dict[str, str] = {}
+        self.last_event: dict[str, dict] = {}
+        self._task_factories: dict[str, Callable] = {}
+        self._callbacks: dict[str, list[Callable]] = {}
+        self._cancel_requested: set[str] = set()
+
+        self._load_queue()
+
+    # ---- submission ---------------------------------------------------------
+
+    def submit_command(self, title: str, command, cwd=None, resource: str = "cpu",
+                       max_retries: int = 0, env: Optional[dict] = None,
+                       on_finished: Optional[Callable] = None, progress_parser: str = "",
+                       events_log=None) -> str:
+        job = Job(title=title, kind="command", command=[str(c) for c in command],
+                  cwd=str(cwd) if cwd else None, env=dict(env or {}),
+                  resource=resource, max_retries=max_retries, progress_parser=progress_parser,
+                  events_log=str(events_log) if events_log else None)
+        return self._add(job, on_finished)
+
+    def submit_task(self, title: str, factory: Callable, resource: str = "cpu",
+                    max_retries: int = 0, on_finished: Optional[Callable] = None) -> str:
+        # factory(job, done) must start the work and call done(ok: bool, error: str)
+        # when it ends; the returned object may offer cancel().
+        job = Job(title=title, kind="task", resource=resource, max_retries=max_retries)
+        self._task_factories[job.id] = factory
+        return self._add(job, on_finished)
+
+    def add_finished_callback(self, job_id: str, callback: Callable):
+        self._callbacks.setdefault(job_id, []).append(callback)
+
+    def _add(self, job: Job, on_finished: Optional[Callable]) -> str:
+        self.jobs[job.id] = job
+        self.logs[job.id] = []
+        if on_finished is not None:
+            self.add_finished_callback(job.id, on_finished)
+        self._save_queue()
+        self.job_added.emit(job.id)
+        self._schedule()
+        return job.id
+
+    # ---- control ------------------------------------------------------------
+
+    def set_paused(self, paused: bool):
+        self.paused = paused
+        self.paused_changed.emit(paused)
+        if not paused:
+            self._schedule()
+
+    def cancel(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is None or job.state not in ACTIVE_STATES:
+            return
+        if job.state == "queued":
+            self._finish(job, "cancelled")
+            return
+
+        self._cancel_requested.add(job_id)
+        process = self._processes.get(job_id)
+        if process is not None:
+            process.terminate()
+            QTimer.singleShot(5000, lambda: self._kill_if_running(job_id, process))
+            return
+        task = self._tasks.get(job_id)
+        if task is not None and hasattr(task, "cancel"):
+            task.cancel()
+
+    def _kill_if_running(self, job_id: str, process: QProcess):
+        # A process that exited on terminate() is already scheduled for deletion;
+        # only touch it while it is still the job's live process
+        if self._processes.get(job_id) is process and process.state() != QProcess.ProcessState.NotRunning:
+            process.kill()
+
+    def retry(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is None or job.state not in ("failed", "cancelled"):
+            return
+        if job.kind == "task" and job_id not in self._task_factories:
+            return
+        job.state = "queued"
+        job.error = ""
+        job.return_code = None
+        self._save_queue()
+        self.job_changed.emit(job_id)
+        self._schedule()
+
+    def remove_finished(self):
+        for job_id in [j.id for j in self.jobs.values() if j.state not in ACTIVE_STATES]:
+            self.jobs.pop(job_id, None)
+            self.logs.pop(job_id, None)
+            self.last_event.pop(job_id, None)
+            self._task_factories.pop(job_id, None)
+            self._callbacks.pop(job_id, None)
+            self.job_changed.emit(job_id)
+        self._save_queue()
+
+    def running_count(self, resource: str) -> int:
+        return sum(1 for j in self.jobs.values() if j.state == "running" and j.resource == resource)
+
+    # ---- scheduling ---------------------------------------------------------
+
+    def _schedule(self):
+        if self.paused:
+            return
+        for job in sorted(self.jobs.values(), key=lambda j: j.created):
+            if job.state != "queued":
+                continue
+            limit = self.resource_limits.get(job.resource, 1)
+            if self.running_count(job.resource) >= limit:
+                continue
+            self._start(job)
+
+    def _start(self, job: Job):
+        job.state = "running"
+        job.attempts += 1
+        job.started = time.time()
+        job.finished = None
+        self._append_log(job.id, f"[Job] Starting {job.title} (attempt {job.attempts})")
+        self._save_queue()
+        self.job_changed.emit(job.id)
+
+        if job.kind == "command":
+            self._start_process(job)
+        else:
+            self._start_task(job)
+
+    def _start_process(self, job: Job):
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        if job.cwd:
+            process.setWorkingDirectory(job.cwd)
+        env = QProcessEnvironment.systemEnvironment()
+        for key, value in job.env.items():
+            env.insert(str(key), str(value))
+        process.setProcessEnvironment(env)
+
+        process.readyReadStandardOutput.connect(lambda: self._read_output(job.id, process))
+        process.finished.connect(lambda code, status: self._on_process_finished(job.id, code, status))
+        process.errorOccurred.connect(lambda err: self._on_process_error(job.id, process, err))
+        self._processes[job.id] = process
+        factory = _PROGRESS_PARSERS.get(job.progress_parser)
+        if factory is not None:
+            self._parsers[job.id] = factory(job)
+        process.start(job.command[0], job.command[1:])
+
+    def _read_output(self, job_id: str, process: QProcess, final: bool = False):
+        data = bytes(process.readAllStandardOutput()).decode("utf-8", errors="replace")
+        # Reads can end mid-line; hold the tail back until its newline arrives
+        lines = (self._partial.pop(job_id, "") + data).replace("\r\n", "\n").split("\n")
+        tail = lines.pop()
+        if final:
+            if tail:
+                lines.append(tail)
+            tail = ""
+        parser = self._parsers.get(job_id)
+        for line in lines:
+            # Progress bars redraw with bare carriage returns; keep the last state
+            line = _last_segment(line)
+            sys.stdout.write(line + "\n")
+            self._append_log(job_id, line)
+            if parser is not None:
+                self._feed_parser(job_id, parser, line)
+        sys.stdout.flush()
+
+        if "\r" in tail:
+            # A bar being redrawn in place never ends its line until it completes;
+            # report its current state now and only keep that much of it around
+            tail = tail[tail.rfind("\r", 0, len(tail.rstrip("\r"))):]
+            if parser is not None:
+                self._feed_parser(job_id, parser, _last_segment(tail))
+        if tail:
+            self._partial[job_id] = tail
+
+    def _feed_parser(self, job_id: str, parser, line: str):
+        # The state reported mid-line shows up again once its newline arrives
+        if self._last_fed.get(job_id) == line:
+            return
+        self._last_fed[job_id] = line
+        event = parser.feed(line)
+        if event is not None:
+            self.last_event[job_id] = event
+            self.job_progress.emit(job_id, event)
+
+    def _on_process_error(self, job_id: str, process: QProcess, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            self._processes.pop(job_id, None)
+            self._parsers.pop(job_id, None)
+            job = self.jobs.get(job_id)
+            if job is not None:
+                self._complete(job, False, f"Failed to start: {process.errorString()}")
+
+    def _on_process_finished(self, job_id: str, code: int, status):
+        process = self._processes.pop(job_id, None)
+        if process is not None:
+            self._read_output(job_id, process, final=True)
+            process.deleteLater()
+        self._last_fed.pop(job_id, None)
+        parser = self._parsers.pop(job_id, None)
+        if parser is not None:
+            parser.close()
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        job.return_code = code
+        ok = status == QProcess.ExitStatus.NormalExit and code == 0
+        self._complete(job, ok, "" if ok else f"Exited with code {code}")
+
+    def _start_task(self, job: Job):
+        factory = self._task_factories.get(job.id)
+        if factory is None:
+            self._complete(job, False, "Task cannot be restarted")
+            return
+
+        attempt = job.attempts
+
+        def _done(ok: bool = True, error: str = ""):
+            # Ignore late or repeated reports from an earlier attempt
+            if job.attempts != attempt or job.state != "running":
+                return
+            self._tasks.pop(job.id, None)
+            self._complete(job, ok, error)
+
+        try:
+            task = factory(job, _done)
+        except Exception as e:
+            _done(False, str(e))
+            return
+        if job.attempts == attempt and job.state == "running":
+            self._tasks[job.id] = task
+
+    def _complete(self, job: Job, ok: bool, error: str):
+        if job.state != "running":
+            return
+        if job.id in self._cancel_requested:
+            self._cancel_requested.discard(job.id)
+            self._finish(job, "cancelled")
+        elif ok:
+            self._finish(job, "done")
+        elif job.attempts <= job.max_retries:
+            self._append_log(job.id, f"[Job] {job.title} failed ({error}); retrying")
+            job.state = "queued"
+            job.error = error
+            self._save_queue()
+            self.job_changed.emit(job.id)
+        else:
+            job.error = error
+            self._finish(job, "failed")
+        self._schedule()
+
+    def _finish(self, job: Job, state: str):
+        job.state = state
+        job.finished = time.time()
+        self._append_log(job.id, f"[Job] {job.title}: {state}" + (f" ({job.error})" if job.error else ""))
+        self._save_queue()
+        self.job_changed.emit(job.id)
+        self.job_finished.emit(job.id, state)
+        for callback in self._callbacks.pop(job.id, []):
+            try:
+                callback(job)
+            except Exception as e:
+                print(f"[Job] Callback for {job.title} failed: {e}")
+
+    def _append_log(self, job_id: str, line: str):
+        lines = self.logs.setdefault(job_id, [])
+        lines.append(line)
+        if len(lines) > LOG_TAIL_LINES:
+            del lines[:len(lines) - LOG_TAIL_LINES]
+        self.job_output.emit(job_id, line)
+
+    # ---- persistence --------------------------------------------------------
+
+    def _save_queue(self):
+        data = [asdict(j) for j in self.jobs.values() if j.persistent and j.state in ACTIVE_STATES]
+        try:
+            self.queue_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.queue_path.with_name(self.queue_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"jobs": data}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.queue_path)
+        except OSError as e:
+            print(f"[Job] Failed to save job queue: {e}")
+
+    def _load_queue(self):
+        try:
+            with open(self.queue_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        known = set(Job.__dataclass_fields__)
+        for raw in data.get("jobs", []):
+            try:
+                job = Job(**{k: v for k, v in raw.items() if k in known})
+            except TypeError:
+                continue
+            # Jobs that were running when MovAl closed start over
+            job.state = "queued"
+            self.jobs[job.id] = job
+            self.logs[job.id] = []
+        if self.jobs:
+            # Don't launch a restored night queue behind the user's back
+            self.paused = True
@@ -0,0 +1,144 @@
+import time
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QDialog, QHBoxLayout, QHeaderView, QPlainTextEdit,
+    QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout,
+)
+
+from .jobs import ACTIVE_STATES, JobManager
+
+STATE_COLORS = {
+    "queued": "#808080",
+    "running": "#1f77b4",
+    "done": "#2ca02c",
+    "failed": "#d62728",
+    "cancelled": "#ff7f0e",
+}
+
+
+class JobsDialog(QDialog):
+    COLUMNS = ("Job", "Resource", "State", "Attempts", "Elapsed", "Progress")
+    PROGRESS_COLUMN = 5
+
+    def __init__(self, parent=None, manager: JobManager = None):
+        super().__init__(parent)
+        self.setWindowTitle("Background Jobs")
+        self.resize(720, 480)
+        self.manager = manager or JobManager.instance()
+        self.row_of: dict[str, int] = {}
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.itemSelectionChanged.connect(self._show_log)
+        layout.addWidget(self.table, 2)
+
+        self.log_view = QPlainTextEdit(self)
+        self.log_view.setReadOnly(True)
+        self.log_view.setMaximumBlockCount(2000)
+        layout.addWidget(self.log_view, 1)
+
+        btn_layout = QHBoxLayout()
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self._cancel_selected)
+        btn_layout.addWidget(self.cancel_btn)
+        self.retry_btn = QPushButton("Retry")
+        self.retry_btn.clicked.connect(self._retry_selected)
+        btn_layout.addWidget(self.retry_btn)
+        self.clear_btn = QPushButton("Clear Finished")
+        self.clear_btn.clicked.connect(self.manager.remove_finished)
+        btn_layout.addWidget(self.clear_btn)
+        btn_layout.addStretch()
+        self.pause_btn = QPushButton()
+        self.pause_btn.clicked.connect(lambda: self.manager.set_paused(not self.manager.paused))
+        btn_layout.addWidget(self.pause_btn)
+        layout.addLayout(btn_layout)
+
+        self.manager.job_added.connect(self._refresh)
+        self.manager.job_changed.connect(self._refresh)
+        self.manager.job_output.connect(self._on_output)
+        self.manager.job_progress.connect(self._on_progress)
+        self.manager.paused_changed.connect(self._update_pause_button)
+        self._update_pause_button(self.manager.paused)
+        self._refresh()
+
+    def _selected_job_id(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        item = self.table.item(rows[0].row(), 0)
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+
+    def _refresh(self, *_):
+        selected = self._selected_job_id()
+        jobs = sorted(self.manager.jobs.values(), key=lambda j: j.created)
+
+        self.table.blockSignals(True)
+        self.table.setRowCount(len(jobs))
+        self.row_of.clear()
+        for row, job in enumerate(jobs):
+            self.row_of[job.id] = row
+            if job.started:
+                elapsed = int((job.finished or time.time()) - job.started)
+                elapsed_text = f"{elapsed // 60}:{elapsed % 60:02d}"
+            else:
+                elapsed_text = "-"
+            event = self.manager.last_event.get(job.id) or {}
+            values = (job.title, job.resource, job.state, str(job.attempts), elapsed_text,
+                      event.get("summary", ""))
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, job.id)
+                    if job.error:
+                        item.setToolTip(job.error)
+                if col == 2:
+                    item.setForeground(Qt.GlobalColor.white)
+                    item.setBackground(QColor(STATE_COLORS.get(job.state, "#808080")))
+                self.table.setItem(row, col, item)
+        if selected in self.row_of:
+            self.table.selectRow(self.row_of[selected])
+        self.table.blockSignals(False)
+        self._update_buttons()
+
+    def _update_buttons(self):
+        job = self.manager.jobs.get(self._selected_job_id())
+        self.cancel_btn.setEnabled(job is not None and job.state in ACTIVE_STATES)
+        self.retry_btn.setEnabled(job is not None and job.state in ("failed", "cancelled"))
+
+    def _update_pause_button(self, paused: bool):
+        self.pause_btn.setText("Resume Queue" if paused else "Pause Queue")
+
+    def _show_log(self):
+        job_id = self._selected_job_id()
+        self.log_view.setPlainText("\n".join(self.manager.logs.get(job_id, [])))
+        self.log_view.moveCursor(self.log_view.textCursor().MoveOperation.End)
+        self._update_buttons()
+
+    def _on_progress(self, job_id: str, event: dict):
+        row = self.row_of.get(job_id)
+        item = self.table.item(row, self.PROGRESS_COLUMN) if row is not None else None
+        if item is not None:
+            item.setText(event.get("summary", ""))
+
+    def _on_output(self, job_id: str, line: str):
+        if job_id == self._selected_job_id():
+            self.log_view.appendPlainText(line)
+
+    def _cancel_selected(self):
+        job_id = self._selected_job_id()
+        if job_id:
+            self.manager.cancel(job_id)
+
+    def _retry_selected(self):
+        job_id = self._selected_job_id()
+        if job_id:
+            self.manager.retry(job_id)
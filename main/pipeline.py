@@ -7,12 +7,14 @@ from video_preprocess import PreprocessDialog
 from labelary import run_labelary_with_project
 from pose import PoseEstimationDialog
 from utils import TxtToCsvDialog, DataConverterDialog
+from .jobs_panel import JobsDialog
 
 class PipelineController:
     def __init__(self):    
         self.current_project = None
         self.main_window_load_project = None
         self.parent = None
+        self.jobs_dialog = None
 
     def run_installation(self):
         dialog = MainInstallDialog(self.parent) 
@@ -48,4 +50,12 @@ class PipelineController:
 
     def data_extract(self):
         dialog = TxtToCsvDialog()
-        dialog.exec()
\ No newline at end of file
+        dialog.exec()
+
+    def show_jobs(self):
+        # Non-modal so the queue can be watched while other tools are open
+        if self.jobs_dialog is None:
+            self.jobs_dialog = JobsDialog(self.parent)
+        self.jobs_dialog.show()
+        self.jobs_dialog.raise_()
+        self.jobs_dialog.activateWindow()
@@ -1,5 +1,12 @@
-from .pose_estimation import PoseEstimationDialog
-
 __all__ = [
     "PoseEstimationDialog",
 ]
+
+
+def __getattr__(name):
+    # The dialog pulls in PyQt; load it on first use so pose.progress and the
+    # other helpers stay importable in worker processes and tests
+    if name == "PoseEstimationDialog":
+        from .pose_estimation import PoseEstimationDialog
+        return PoseEstimationDialog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
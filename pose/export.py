@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import numpy as np
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QCheckBox, QComboBox, QDialog, QFileDialog, QFormLayout, QGroupBox,
+    QHBoxLayout, QHeaderView, QLineEdit, QMessageBox, QPushButton, QSpinBox, QTableWidget,
+    QTableWidgetItem, QVBoxLayout,
+)
+
+from main.jobs import JobManager
+from .thread import submit_yolo_job
+
+# CPU runtimes a trained .pt can be exported to. Ultralytics loads the
+# exported artifacts through the same YOLO() call, so choosing a runtime is
+# just choosing which model path to load.
+EXPORT_FORMATS = {"ONNX": "onnx", "OpenVINO": "openvino"}
+MODEL_FILE_FILTER = "YOLO model (*.pt *.onnx *.xml);;All Files (*)"
+BENCHMARK_WARMUP = 3
+
+
+def model_runtime(path) -> str:
+    path = Path(path)
+    if path.suffix.lower() == ".onnx":
+        return "onnx"
+    if path.suffix.lower() == ".xml" or path.name.endswith("_openvino_model"):
+        return "openvino"
+    return "pytorch"
+
+
+def resolve_model_path(path) -> Path:
+    # An OpenVINO export is a folder; accept the .xml inside it as well
+    path = Path(path)
+    if path.suffix.lower() == ".xml" and path.parent.name.endswith("_openvino_model"):
+        return path.parent
+    return path
+
+
+def exported_model_path(pt_path, fmt: str, int8: bool = False) -> Path:
+    # Where `yolo export` writes its artifact for a given .pt
+    pt_path = Path(pt_path)
+    if fmt == "onnx":
+        return pt_path.with_suffix(".onnx")
+    return pt_path.with_name(f"{pt_path.stem}{'_int8' if int8 else ''}_openvino_model")
+
+
+def existing_exports(pt_path) -> list[Path]:
+    candidates = [
+        exported_model_path(pt_path, "onnx"),
+        exported_model_path(pt_path, "openvino"),
+        exported_model_path(pt_path, "openvino", int8=True),
+    ]
+    return [p for p in candidates if p.exists()]
+
+
+def load_pose_model(path):
+    from ultralytics import YOLO
+
+    path = resolve_model_path(path)
+    model = YOLO(str(path), task="pose")
+    model_task = getattr(model, "task", None)
+    if model_task not in (None, "pose"):
+        raise ValueError(f"Expected a pose model, but got task='{model_task}'.")
+    return model
+
+
+def build_export_command(pt_path, fmt: str, imgsz: int = 640, int8: bool = False, data=None) -> list[str]:
+    command = [
+        "yolo", "export",
+        f"model={Path(pt_path).as_posix()}",
+        f"format={fmt}",
+        f"imgsz={int(imgsz)}",
+    ]
+    if int8:
+        if fmt != "openvino":
+            raise ValueError("INT8 quantization is only available for OpenVINO exports.")
+        if data is None:
+            raise ValueError("INT8 calibration needs a dataset config.")
+        # Calibration images come from the val split of the data config
+        command += ["int8=True", f"data={Path(data).as_posix()}"]
+    return command
+
+
+def sample_project_frames(project_dir, frame_type: str = "images", count: int = 32) -> list[np.ndarray]:
+    # Frames spread evenly over all videos of the project
+    from utils.frames import open_frame_source
+
+    frames_root = Path(project_dir) / "frames"
+    videos = sorted(p.name for p in frames_root.iterdir() if p.is_dir()) if frames_root.is_dir() else []
+    sources = [open_frame_source(project_dir, name, frame_type) for name in videos]
+    sources = [s for s in sources if s.exists() and len(s) > 0]
+    if not sources:
+        return []
+
+    per_source = max(1, count // len(sources))
+    frames = []
+    for source in sources:
+        for idx in np.linspace(0, len(source) - 1, min(per_source, len(source))).round().astype(int):
+            frame = source.read(int(idx))
+            if frame is not None:
+                frames.append(frame)
+    return frames[:count]
+
+
+def benchmark_model(path, frames: list, imgsz: int = 640, device: str = "cpu") -> dict:
+    model = load_pose_model(path)
+    for frame in frames[:BENCHMARK_WARMUP]:
+        model.predict(frame, imgsz=imgsz, device=device, verbose=False)
+
+    latencies = []
+    for frame in frames:
+        start = time.perf_counter()
+        model.predict(frame, imgsz=imgsz, device=device, verbose=False)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    latencies = np.asarray(latencies)
+    return {
+        "path": str(path),
+        "runtime": model_runtime(path),
+        "frames": len(latencies),
+        "mean_ms": float(latencies.mean()),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "fps": float(1000.0 * len(latencies) / latencies.sum()),
+    }
+
+
+class BenchmarkWorker(QThread):
+    result   = pyqtSignal(dict)
+    error    = pyqtSignal(str, str)
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, model_paths: list, project_dir, frame_type: str, frame_count: int, imgsz: int):
+        super().__init__()
+        self.model_paths = model_paths
+        self.project_dir = project_dir
+        self.frame_type = frame_type
+        self.frame_count = frame_count
+        self.imgsz = imgsz
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        frames = sample_project_frames(self.project_dir, self.frame_type, self.frame_count)
+        if not frames:
+            self.finished.emit(False, f"No '{self.frame_type}' frames found in the project.")
+            return
+        for path in self.model_paths:
+            if self._cancelled:
+                self.finished.emit(False, "Cancelled")
+                return
+            try:
+                self.result.emit(benchmark_model(path, frames, self.imgsz))
+            except Exception as e:
+                self.error.emit(str(path), str(e))
+        self.finished.emit(True, "")
+
+
+class ExportDialog(QDialog):
+    COLUMNS = ("Runtime", "Model", "Mean ms", "P95 ms", "FPS", "Speedup")
+
+    def __init__(self, current_project, model_path=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export Model for CPU Inference")
+        self.resize(760, 480)
+        self.current_project = current_project
+        self.calibration_config = Path(current_project.project_dir) / "runs" / "training_config.yaml"
+        self.baseline_fps = None
+
+        layout = QVBoxLayout(self)
+
+        model_row = QHBoxLayout()
+        self.model_edit = QLineEdit(str(model_path or ""))
+        self.model_edit.setPlaceholderText("Select trained .pt model")
+        browse_btn = QPushButton("Browse", clicked=self.select_model)
+        model_row.addWidget(self.model_edit)
+        model_row.addWidget(browse_btn)
+        layout.addLayout(model_row)
+
+        export_group = QGroupBox("Export")
+        form = QFormLayout(export_group)
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(EXPORT_FORMATS.keys())
+        self.format_combo.currentTextChanged.connect(self._update_int8)
+        form.addRow("Format", self.format_combo)
+        self.imgsz_spin = QSpinBox(minimum=32, maximum=4096, singleStep=32, value=640)
+        form.addRow("imgsz", self.imgsz_spin)
+        self.int8_check = QCheckBox("INT8 (calibrated on runs/dataset val frames)")
+        form.addRow("Quantization", self.int8_check)
+        self.export_btn = QPushButton("Export", clicked=self.run_export)
+        form.addRow(self.export_btn)
+        layout.addWidget(export_group)
+
+        bench_group = QGroupBox("Benchmark (CPU, this project's frames)")
+        bench_layout = QVBoxLayout(bench_group)
+        bench_row = QHBoxLayout()
+        self.frame_type_combo = QComboBox()
+        self.frame_type_combo.addItems(["images", "davis", "contour"])
+        self.frame_count_spin = QSpinBox(minimum=4, maximum=1000, value=32)
+        self.bench_btn = QPushButton("Run Benchmark", clicked=self.run_benchmark)
+        bench_row.addWidget(self.frame_type_combo)
+        bench_row.addWidget(self.frame_count_spin)
+        bench_row.addStretch()
+        bench_row.addWidget(self.bench_btn)
+        bench_layout.addLayout(bench_row)
+
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        bench_layout.addWidget(self.table)
+        layout.addWidget(bench_group)
+
+        self._update_int8(self.format_combo.currentText())
+
+    def _update_int8(self, fmt_name: str):
+        available = EXPORT_FORMATS[fmt_name] == "openvino" and self.calibration_config.exists()
+        self.int8_check.setEnabled(available)
+        if not available:
+            self.int8_check.setChecked(False)
+
+    def _model_path(self):
+        text = self.model_edit.text().strip()
+        if not text or not Path(text).is_file() or Path(text).suffix.lower() != ".pt":
+            QMessageBox.warning(self, "No model selected", "Select a trained .pt model first.")
+            return None
+        return Path(text)
+
+    def select_model(self):
+        model_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select trained model",
+            str(Path(self.current_project.project_dir) / "runs"),
+            "PyTorch model (*.pt);;All Files (*)"
+        )
+        if model_path:
+            self.model_edit.setText(model_path)
+
+    def run_export(self):
+        pt_path = self._model_path()
+        if pt_path is None:
+            return
+        fmt = EXPORT_FORMATS[self.format_combo.currentText()]
+        int8 = self.int8_check.isChecked()
+        try:
+            command = build_export_command(pt_path, fmt, self.imgsz_spin.value(), int8,
+                                           self.calibration_config if int8 else None)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+
+        target = exported_model_path(pt_path, fmt, int8)
+
+        def _on_export_finished(job):
+            if job.state == "done":
+                QMessageBox.information(self, "Export finished", f"Exported model:\n{target}")
+            elif job.state == "failed":
+                QMessageBox.critical(self, "Export failed", f"{job.title}\n{job.error}")
+
+        print("Execute Command:", " ".join(command))
+        # Export and INT8 calibration run on the CPU
+        submit_yolo_job(f"Export: {pt_path.parent.parent.name}/{target.name}", command,
+                        on_finished=_on_export_finished, resource="cpu")
+
+    def run_benchmark(self):
+        pt_path = self._model_path()
+        if pt_path is None:
+            return
+        model_paths = [pt_path] + existing_exports(pt_path)
+        if len(model_paths) == 1:
+            QMessageBox.information(self, "Benchmark", "No exported models found next to the .pt yet; "
+                                                       "only the PyTorch model will be measured.")
+        self.table.setRowCount(0)
+        self.baseline_fps = None
+        self.bench_btn.setEnabled(False)
+
+        project_dir = self.current_project.project_dir
+        frame_type = self.frame_type_combo.currentText()
+        frame_count = self.frame_count_spin.value()
+        imgsz = self.imgsz_spin.value()
+
+        def _start(job, done):
+            worker = BenchmarkWorker(model_paths, project_dir, frame_type, frame_count, imgsz)
+
+            def _finished(ok, error):
+                worker.wait()
+                worker.deleteLater()
+                done(ok, error)
+
+            worker.result.connect(self._add_result)
+            worker.error.connect(lambda path, msg: print(f"[Benchmark] {path} failed: {msg}"))
+            worker.finished.connect(_finished)
+            worker.start()
+            return worker
+
+        def _benchmark_finished(job):
+            self.bench_btn.setEnabled(True)
+            if job.state == "failed":
+                QMessageBox.critical(self, "Benchmark failed", job.error)
+
+        JobManager.instance().submit_task(f"Benchmark: {pt_path.name}", _start, resource="cpu",
+                                          on_finished=_benchmark_finished)
+
+    def _add_result(self, result: dict):
+        if self.baseline_fps is None and result["runtime"] == "pytorch":
+            self.baseline_fps = result["fps"]
+        speedup = f"{result['fps'] / self.baseline_fps:.2f}x" if self.baseline_fps else "-"
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        values = (result["runtime"], Path(result["path"]).name, f"{result['mean_ms']:.1f}",
+                  f"{result['p95_ms']:.1f}", f"{result['fps']:.1f}", speedup)
+        for col, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            if col == 1:
+                item.setToolTip(result["path"])
+            else:
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.table.setItem(row, col, item)
+        print(f"[Benchmark] {result['runtime']}: {result['mean_ms']:.1f} ms/frame, {result['fps']:.1f} FPS "
+              f"({result['frames']} frames)")
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from utils.predictions import PREDICTIONS_FILE, PredictionWriter, frame_number_from_key
+
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv")
+DEFAULT_BATCH_SIZE = 8
+_END = object()
+
+
+class InferenceSource:
+    # One input stream: a project frame folder/store (via utils.frames) or a video file.
+    # Output txt names follow what `yolo pose predict` writes for the same input,
+    # so Labelary and TXT-to-CSV read engine results unchanged.
+
+    def __init__(self, name: str, path, frame_source=None):
+        self.name = name
+        self.path = Path(path)
+        self.frame_source = frame_source
+        self.is_video = frame_source is None and self.path.suffix.lower() in VIDEO_EXTS
+
+    def __len__(self):
+        if self.frame_source is not None:
+            return len(self.frame_source)
+        if self.is_video:
+            cap = cv2.VideoCapture(str(self.path))
+            try:
+                return max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+            finally:
+                cap.release()
+        return len(self._image_files())
+
+    def _image_files(self) -> list[Path]:
+        return sorted(p for p in self.path.iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png", ".bmp"))
+
+    def fps(self) -> float:
+        if not self.is_video:
+            return 30.0
+        cap = cv2.VideoCapture(str(self.path))
+        try:
+            return cap.get(cv2.CAP_PROP_FPS) or 30.0
+        finally:
+            cap.release()
+
+    def frames(self) -> Iterator[tuple[str, np.ndarray]]:
+        # Yields (txt stem, BGR frame)
+        if self.frame_source is not None:
+            source = self.frame_source
+            for idx, name in enumerate(source.names):
+                frame = source.read(idx)
+                if frame is not None:
+                    yield os.path.splitext(name)[0], frame
+        elif self.is_video:
+            cap = cv2.VideoCapture(str(self.path))
+            if not cap.isOpened():
+                raise IOError(f"Unable to open video: {self.path}")
+            try:
+                frame_no = 0
+                while True:
+                    ok, frame = cap.read()
+                    if not ok:
+                        break
+                    frame_no += 1
+                    yield f"{self.path.stem}_{frame_no}", frame
+            finally:
+                cap.release()
+        else:
+            for path in self._image_files():
+                frame = cv2.imread(str(path))
+                if frame is not None:
+                    yield path.stem, frame
+
+
+def pose_result_arrays(result):
+    # (cls ids, normalized xywh boxes, keypoints [N, K, 3], track ids or None)
+    boxes = getattr(result, "boxes", None)
+    keypoints = getattr(result, "keypoints", None)
+    if boxes is None or len(boxes) == 0:
+        return None
+
+    cls_ids = boxes.cls.cpu().numpy().astype(int)
+    xywhn = boxes.xywhn.cpu().numpy()
+    track_ids = boxes.id.cpu().numpy().astype(int) if getattr(boxes, "id", None) is not None else None
+    if keypoints is not None and keypoints.xyn is not None:
+        kpts = keypoints.xyn.cpu().numpy()
+        if getattr(keypoints, "conf", None) is not None:
+            conf = keypoints.conf.cpu().numpy()[..., None]
+        else:
+            conf = np.ones(kpts.shape[:2] + (1,), dtype=kpts.dtype)
+        kpts = np.concatenate([kpts, conf], axis=2)
+    else:
+        kpts = np.zeros((len(cls_ids), 0, 3), dtype=np.float32)
+    return cls_ids, xywhn, kpts, track_ids
+
+
+def format_pose_result(arrays) -> list[str]:
+    # Same row layout as ultralytics' save_txt: cls box(xywhn) kpts(x y conf)... [track id]
+    if arrays is None:
+        return []
+    cls_ids, xywhn, kpts, track_ids = arrays
+    lines = []
+    for i, cls_id in enumerate(cls_ids):
+        values = [f"{v:g}" for v in xywhn[i]]
+        values += [f"{v:g}" for v in kpts[i].reshape(-1)]
+        if track_ids is not None:
+            values.append(str(track_ids[i]))
+        lines.append(" ".join([str(cls_id)] + values))
+    return lines
+
+
+class PoseInferenceEngine:
+    def __init__(self, model_path, batch_size: int = DEFAULT_BATCH_SIZE, prefetch_batches: int = 2,
+                 tracker: Optional[str] = None, **predict_args):
+        # predict_args go straight to model.predict / model.track (imgsz, conf, iou, half, device, ...)
+        self.model_path = str(model_path)
+        self.batch_size = max(1, int(batch_size))
+        self.prefetch = max(1, int(prefetch_batches)) * self.batch_size
+        self.tracker = tracker
+        self.predict_args = {k: v for k, v in predict_args.items() if v not in ("", "None", None)}
+        self.model = None
+
+    def load(self):
+        if self.model is None:
+            from .export import load_pose_model
+
+            self.model = load_pose_model(self.model_path)
+        return self.model
+
+    def _predict(self, frames: list, first_of_video: bool):
+        if self.tracker:
+            # Trackers keep state between calls; start fresh at each new video
+            return self.model.track(frames, tracker=self.tracker, persist=not first_of_video,
+                                    verbose=False, **self.predict_args)
+        return self.model.predict(frames, verbose=False, **self.predict_args)
+
+    def _decode(self, sources: list[InferenceSource], out: queue.Queue, stop: threading.Event):
+        # Runs ahead of the GPU on its own thread so decoding overlaps inference
+        try:
+            for src_idx, source in enumerate(sources):
+                error = None
+                try:
+                    for key, frame in source.frames():
+                        if stop.is_set():
+                            return
+                        out.put((src_idx, key, frame))
+                except Exception as e:
+                    error = e
+                out.put((src_idx, None, error))
+        finally:
+            out.put(_END)
+
+    def run(self, sources: list[InferenceSource], output_dirs: dict, save_txt: bool = True,
+            save_video: bool = False, save_npz: bool = False, progress_callback: Optional[Callable] = None,
+            video_callback: Optional[Callable] = None, stop_event: Optional[threading.Event] = None):
+        # output_dirs: source name -> run folder (predicts/<run>); txt files go to <run>/labels,
+        # save_npz collects everything into <run>/predictions.npz instead.
+        # video_callback(name, n_frames, error) fires once per source as soon as it is finished.
+        self.load()
+        stop = stop_event or threading.Event()
+        # Tracking needs frames strictly in order, one call per frame
+        batch_size = 1 if self.tracker else self.batch_size
+        frames_q: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        decoder = threading.Thread(target=self._decode, args=(sources, frames_q, stop), daemon=True)
+        decoder.start()
+
+        state = {"src": None, "batch": [], "keys": [], "count": 0, "first": True, "writer": None, "npz": None}
+
+        def _flush():
+            if not state["batch"]:
+                return
+            source = sources[state["src"]]
+            results = self._predict(state["batch"], state["first"])
+            state["first"] = False
+            run_dir = Path(output_dirs[source.name])
+            for key, result in zip(state["keys"], results):
+                arrays = pose_result_arrays(result)
+                if save_npz and arrays is not None:
+                    if state["npz"] is None:
+                        state["npz"] = PredictionWriter(run_dir / PREDICTIONS_FILE)
+                    cls_ids, xywhn, kpts, track_ids = arrays
+                    state["npz"].add(frame_number_from_key(key), cls_ids, xywhn, kpts, track_ids)
+                if save_txt:
+                    lines = format_pose_result(arrays)
+                    if lines:
+                        label_dir = run_dir / "labels"
+                        label_dir.mkdir(parents=True, exist_ok=True)
+                        with open(label_dir / f"{key}.txt", "w") as f:
+                            f.write("\n".join(lines) + "\n")
+                if save_video:
+                    plotted = result.plot()
+                    if state["writer"] is None:
+                        run_dir.mkdir(parents=True, exist_ok=True)
+                        h, w = plotted.shape[:2]
+                        state["writer"] = cv2.VideoWriter(str(run_dir / f"{source.name}.mp4"),
+                                                          cv2.VideoWriter_fourcc(*"mp4v"), source.fps(), (w, h))
+                    state["writer"].write(plotted)
+            state["count"] += len(state["batch"])
+            state["batch"], state["keys"] = [], []
+            if progress_callback:
+                progress_callback(source.name, state["count"])
+
+        def _finish_source(error):
+            if state["writer"] is not None:
+                state["writer"].release()
+            if state["npz"] is not None:
+                state["npz"].close()
+            name = sources[state["src"]].name
+            if video_callback:
+                video_callback(name, state["count"], error)
+            state.update(src=None, batch=[], keys=[], count=0, first=True, writer=None, npz=None)
+
+        try:
+            while True:
+                item = frames_q.get()
+                if item is _END or stop.is_set():
+                    break
+                src_idx, key, frame = item
+                state["src"] = src_idx
+                if key is None:
+                    # End of a source (frame carries the decode error, if any)
+                    _flush()
+                    _finish_source(str(frame) if frame is not None else "")
+                    continue
+                state["batch"].append(frame)
+                state["keys"].append(key)
+                if len(state["batch"]) >= batch_size:
+                    _flush()
+        finally:
+            stop.set()
+            if state["writer"] is not None:
+                state["writer"].release()
+            if state["npz"] is not None:
+                # Keep what was predicted before a cancel
+                state["npz"].close()
+            # Unblock the decoder if it is waiting on a full queue
+            while decoder.is_alive():
+                try:
+                    frames_q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+
+class InferenceEngineWorker(QThread):
+    frame_progress = pyqtSignal(str, int, int)
+    video_done     = pyqtSignal(str, int)
+    video_error    = pyqtSignal(str, str)
+    finished       = pyqtSignal(bool, str)
+
+    def __init__(self, engine: PoseInferenceEngine, sources: list[InferenceSource], output_dirs: dict,
+                 save_txt: bool = True, save_video: bool = False, save_npz: bool = False):
+        super().__init__()
+        self.engine = engine
+        self.sources = sources
+        self.output_dirs = output_dirs
+        self.save_txt = save_txt
+        self.save_video = save_video
+        self.save_npz = save_npz
+        self._stop = threading.Event()
+        self._totals = {}
+
+    def cancel(self):
+        self._stop.set()
+
+    def _on_progress(self, name, done):
+        self.frame_progress.emit(name, done, self._totals.get(name, 0))
+
+    def _on_video(self, name, count, error):
+        if error:
+            self.video_error.emit(name, error)
+        else:
+            self.video_done.emit(name, count)
+
+    def run(self):
+        try:
+            self._totals = {source.name: len(source) for source in self.sources}
+            self.engine.run(self.sources, self.output_dirs, save_txt=self.save_txt,
+                            save_video=self.save_video, save_npz=self.save_npz, progress_callback=self._on_progress,
+                            video_callback=self._on_video, stop_event=self._stop)
+        except Exception as e:
+            self.finished.emit(False, str(e))
+            return
+        self.finished.emit(True, "")
@@ -1,12 +1,13 @@
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton, QLabel
 from pose.prepare_data import DataSplitDialog
 from pose.yolo_use import YOLODialog, YoloInferenceDialog
+from pose.export import ExportDialog
 
 class PoseEstimationDialog(QDialog):
     def __init__(self, current_project, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Pose Estimation Options")
-        self.setFixedSize(350, 220)
+        self.setFixedSize(350, 290)
         self.current_project = current_project
 
         layout = QVBoxLayout()
@@ -31,6 +32,13 @@ class PoseEstimationDialog(QDialog):
         inf_btn.clicked.connect(self.pose_estimation)
         layout.addWidget(inf_btn)
 
+        layout.addSpacing(10)
+        layout.addWidget(QLabel("Optional"))
+        export_btn = QPushButton("Export for CPU inference")
+        export_btn.setFixedHeight(40)
+        export_btn.clicked.connect(self.export_model)
+        layout.addWidget(export_btn)
+
         self.setLayout(layout)
 
     def open_prepare_data(self):
@@ -43,4 +51,8 @@ class PoseEstimationDialog(QDialog):
         
     def pose_estimation(self):
         dialog = YoloInferenceDialog(self.current_project, self)
+        dialog.exec()
+
+    def export_model(self):
+        dialog = ExportDialog(self.current_project, parent=self)
         dialog.exec()
\ No newline at end of file
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import random
 import re
 import shutil
-from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import cv2
+import numpy as np
+import yaml
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
@@ -24,15 +31,65 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from utils.frames import open_frame_source
+
 ONLINE_DATASET_ROOT = "online_datasets"
+ONLINE_MANIFEST = "manifest.json"
+ONLINE_MANIFEST_VERSION = 1
+# "lists": per-split image list files; images linked into dataset_dir/images, labels copied to dataset_dir/labels
+# "copy":  train/val/test folders with copies of every image and label
+SPLIT_MODES = ("lists", "copy")
+SPLITS = ("train", "val", "test")
+IMAGE_CACHE_ROOT = "image_cache"
+IMAGE_CACHE_QUALITY = 95
+# Max Hamming distance (of 64 bits) between difference hashes of near-duplicate frames
+DEDUP_THRESHOLD = 6
+
+
+def link_or_copy(src: Path, dst: Path) -> str:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.is_symlink() or dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+    try:
+        os.symlink(Path(src).resolve(), dst)
+        return "symlink"
+    except OSError:
+        shutil.copy2(src, dst)
+        return "copy"
+
+
+def split_data_paths(dataset_dir: str | Path, mode: str = "lists") -> dict[str, str]:
+    # Values for the train/val/test keys of a training YAML
+    dataset_dir = Path(dataset_dir)
+    if mode == "lists":
+        return {split: (dataset_dir / f"{split}.txt").as_posix() for split in SPLITS}
+    return {split: (dataset_dir / split).as_posix() for split in SPLITS}
 
 
-def _resolve_frame_dir(project_dir: Path, video_name: str, frame_type: str) -> Path:
-    if frame_type in ("davis", "contour"):
-        return project_dir / "frames" / video_name / "visualization" / frame_type
-    if frame_type == "images":
-        return project_dir / "frames" / video_name / "images"
-    raise ValueError(f"Unsupported frame type: {frame_type}")
+def _labeled_frames(project_dir: Path, video_name: str, frame_type: str, label_dir: Path):
+    # (frame source, [(label file, base name, source index)]) for one video
+    digit_re = re.compile(r"(\d+)$")
+    source = open_frame_source(project_dir, video_name, frame_type)
+    wanted: list[tuple[Path, str, int]] = []
+    for lbl_file in sorted(label_dir.glob("*.txt")):
+        match = digit_re.search(lbl_file.stem)
+        if not match:
+            continue
+
+        orig_num_str = match.group(1)
+        frame_idx = int(orig_num_str)
+        frame_num = f"{frame_idx:07d}"
+        base_name = f"{video_name}_{frame_idx:0{len(orig_num_str)}d}"
+        src_idx = source.index_of(f"{frame_num}.jpg")
+        if src_idx is None:
+            continue
+        wanted.append((lbl_file, base_name, src_idx))
+    return source, wanted
 
 
 def _collect_label_image_pairs(
@@ -42,7 +99,6 @@ def _collect_label_image_pairs(
     label_dirs: dict[str, Path] | None = None,
 ) -> list[tuple[Path, Path, str]]:
     project_dir = Path(current_project.project_dir)
-    digit_re = re.compile(r"(\d+)$")
     pair_list: list[tuple[Path, Path, str]] = []
     label_dirs = label_dirs or {}
 
@@ -53,21 +109,14 @@ def _collect_label_image_pairs(
         if not label_dir.is_dir():
             continue
 
-        img_dir = _resolve_frame_dir(project_dir, video_name, frame_type)
-        for lbl_file in sorted(label_dir.glob("*.txt")):
-            match = digit_re.search(lbl_file.stem)
-            if not match:
-                continue
-
-            orig_num_str = match.group(1)
-            frame_idx = int(orig_num_str)
-            frame_num = f"{frame_idx:07d}"
-            base_name = f"{video_name}_{frame_idx:0{len(orig_num_str)}d}"
-            img_path = img_dir / f"{frame_num}.jpg"
-            if not img_path.exists():
+        source, wanted = _labeled_frames(project_dir, video_name, frame_type, label_dir)
+        # Virtual frame sources only write the labeled frames to disk
+        img_paths = source.materialize(idx for _, _, idx in wanted)
+        for lbl_file, base_name, src_idx in wanted:
+            img_path = img_paths.get(src_idx)
+            if img_path is None:
                 continue
-
-            pair_list.append((lbl_file, img_path, base_name))
+            pair_list.append((lbl_file, Path(img_path), base_name))
 
     return pair_list
 
@@ -83,7 +132,13 @@ def create_dataset_split(
     clear_existing: bool = True,
     seed: int | None = None,
     label_dirs: dict[str, Path] | None = None,
+    mode: str = "lists",
+    imgsz: int | None = None,
+    dedup_threshold: int | None = None,
+    dedup_budget: int | None = None,
 ) -> dict[str, int]:
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"Unknown split mode: {mode}")
     dataset_dir = Path(dataset_dir)
     pair_list = _collect_label_image_pairs(
         current_project,
@@ -94,12 +149,21 @@ def create_dataset_split(
     if not pair_list:
         raise ValueError("Could not find label-image pair.")
 
+    duplicates = 0
+    if dedup_threshold is not None or dedup_budget:
+        kept = prune_near_duplicates(pair_list, DEDUP_THRESHOLD if dedup_threshold is None else dedup_threshold,
+                                     dedup_budget)
+        duplicates = len(pair_list) - len(kept)
+        pair_list = kept
+
+    if imgsz:
+        cache_dir = Path(current_project.project_dir) / "runs" / IMAGE_CACHE_ROOT / str(int(imgsz))
+        pair_list = _cache_resized_pairs(pair_list, cache_dir, int(imgsz))
+
     if dataset_dir.exists() and clear_existing:
         shutil.rmtree(dataset_dir)
 
-    for split in ("train", "val", "test"):
-        (dataset_dir / split / "images").mkdir(parents=True, exist_ok=True)
-        (dataset_dir / split / "labels").mkdir(parents=True, exist_ok=True)
+    dataset_dir.mkdir(parents=True, exist_ok=True)
 
     shuffled_pairs = list(pair_list)
     random.Random(seed).shuffle(shuffled_pairs)
@@ -142,14 +206,173 @@ def create_dataset_split(
             "test": shuffled_pairs[val_end:],
         }
 
-    for split, pairs in split_map.items():
-        img_dst_root = dataset_dir / split / "images"
-        lbl_dst_root = dataset_dir / split / "labels"
-        for lbl_path, img_path, base in pairs:
-            shutil.copy(lbl_path, lbl_dst_root / f"{base}.txt")
-            shutil.copy(img_path, img_dst_root / f"{base}{img_path.suffix.lower()}")
-
-    return {split: len(pairs) for split, pairs in split_map.items()}
+    if mode == "lists":
+        _write_split_lists(dataset_dir, split_map)
+    else:
+        for split, pairs in split_map.items():
+            img_dst_root = dataset_dir / split / "images"
+            lbl_dst_root = dataset_dir / split / "labels"
+            img_dst_root.mkdir(parents=True, exist_ok=True)
+            lbl_dst_root.mkdir(parents=True, exist_ok=True)
+            for lbl_path, img_path, base in pairs:
+                shutil.copy(lbl_path, lbl_dst_root / f"{base}.txt")
+                shutil.copy(img_path, img_dst_root / f"{base}{img_path.suffix.lower()}")
+
+    counts = {split: len(pairs) for split, pairs in split_map.items()}
+    counts["frames"] = total
+    counts["duplicates"] = duplicates
+    return counts
+
+
+def _dhash(img_path) -> int | None:
+    # 64-bit difference hash of a 9x8 grayscale thumbnail
+    image = cv2.imread(str(img_path), cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if image is None:
+        return None
+    small = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def prune_near_duplicates(pair_list: list, threshold: int = DEDUP_THRESHOLD, budget: int | None = None) -> list:
+    # Frames are clustered per video in frame order: a frame joins the current
+    # cluster while its hash stays within `threshold` bits of the cluster's
+    # first frame, which is kept as the representative.
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        hashes = list(executor.map(lambda pair: _dhash(pair[1]), pair_list))
+
+    by_video: dict[str, list[tuple[int, int]]] = {}
+    for i, (_, _, base) in enumerate(pair_list):
+        video_name, _, frame = base.rpartition("_")
+        by_video.setdefault(video_name, []).append((int(frame), i))
+
+    kept: list[int] = []
+    for video_name in sorted(by_video):
+        rep_hash = None
+        for _, i in sorted(by_video[video_name]):
+            h = hashes[i]
+            if h is None or rep_hash is None or bin(h ^ rep_hash).count("1") > threshold:
+                kept.append(i)
+                rep_hash = h
+
+    if budget and len(kept) > budget:
+        # Spread the budget evenly over the representatives (and so over the videos)
+        picks = np.unique(np.linspace(0, len(kept) - 1, budget).round().astype(int))
+        kept = [kept[p] for p in picks]
+
+    print(f"[Split] Near-duplicate pruning: kept {len(kept)} of {len(pair_list)} frames")
+    return [pair_list[i] for i in kept]
+
+
+def _write_split_lists(dataset_dir: Path, split_map: dict) -> None:
+    # Every image is linked into dataset_dir/images and its label copied to
+    # dataset_dir/labels, where Ultralytics looks for it; nothing is written
+    # next to the project frames. Files from a previous run are dropped first.
+    images_dir = dataset_dir / "images"
+    labels_dir = dataset_dir / "labels"
+    for staged_dir in (images_dir, labels_dir):
+        if staged_dir.exists():
+            shutil.rmtree(staged_dir)
+        staged_dir.mkdir(parents=True)
+
+    methods = Counter()
+    staged: set[str] = set()
+    for split in SPLITS:
+        lines = []
+        for lbl_path, img_path, base in split_map.get(split, []):
+            linked_path = images_dir / f"{base}{Path(img_path).suffix.lower()}"
+            if base not in staged:
+                staged.add(base)
+                methods[link_or_copy(Path(img_path), linked_path)] += 1
+                shutil.copyfile(lbl_path, labels_dir / f"{base}.txt")
+            lines.append(linked_path.resolve().as_posix())
+        with open(dataset_dir / f"{split}.txt", "w", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+
+    print("[Split] Staged images: " + ", ".join(f"{n} {m}" for m, n in methods.items()))
+
+
+def _cached_image_path(img_path: Path, cache_dir: Path, imgsz: int) -> Path:
+    # Keyed by source file, mtime and size; a re-extracted frame gets a new entry
+    st = img_path.stat()
+    key = hashlib.sha1(f"{img_path.resolve()}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8")).hexdigest()[:20]
+    cached = cache_dir / f"{key}.jpg"
+    if cached.exists():
+        return cached
+
+    image = cv2.imread(str(img_path))
+    if image is None:
+        return img_path
+    h, w = image.shape[:2]
+    # Same resize Ultralytics applies when loading (long side to imgsz, aspect kept);
+    # normalized labels stay valid and letterbox padding is still added at train time
+    ratio = imgsz / max(h, w)
+    if ratio >= 1:
+        return img_path
+    resized = cv2.resize(image, (max(1, round(w * ratio)), max(1, round(h * ratio))), interpolation=cv2.INTER_AREA)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cached.with_name(f"{cached.stem}.tmp.jpg")
+    cv2.imwrite(str(tmp_path), resized, [cv2.IMWRITE_JPEG_QUALITY, IMAGE_CACHE_QUALITY])
+    os.replace(tmp_path, cached)
+    return cached
+
+
+def _cache_resized_pairs(pair_list: list, cache_dir: Path, imgsz: int) -> list:
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        cached = list(executor.map(lambda pair: _cached_image_path(Path(pair[1]), cache_dir, imgsz), pair_list))
+    print(f"[Split] Image cache ({imgsz}px): {sum(c != Path(p[1]) for c, p in zip(cached, pair_list))} "
+          f"of {len(pair_list)} images downscaled")
+    return [(lbl, img, base) for (lbl, _, base), img in zip(pair_list, cached)]
+
+
+def update_training_config(config_path: str | Path, data_paths: dict[str, str]) -> None:
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    config.update(data_paths)
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, sort_keys=False, allow_unicode=True)
+
+
+def _split_of(key: str, train_ratio: float, val_ratio: float) -> str:
+    # Stable per-frame split, so frames keep their split from one run to the next
+    fraction = int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) / 0x100000000
+    if fraction < train_ratio:
+        return "train"
+    if fraction < train_ratio + val_ratio:
+        return "val"
+    return "test"
+
+
+def _file_signature(path) -> list[int]:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _label_hash(path: Path, previous: dict | None) -> tuple[str, list[int]]:
+    signature = _file_signature(path)
+    if previous and previous.get("label_src") == str(path) and previous.get("label_sig") == signature:
+        return previous["label_hash"], signature
+    return hashlib.sha1(path.read_bytes()).hexdigest(), signature
+
+
+def _load_online_manifest(dataset_dir: Path, frame_type: str) -> dict:
+    manifest_path = dataset_dir / ONLINE_MANIFEST
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == ONLINE_MANIFEST_VERSION and manifest.get("frame_type") == frame_type:
+            return manifest["entries"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def _save_online_manifest(dataset_dir: Path, frame_type: str, entries: dict) -> None:
+    manifest_path = dataset_dir / ONLINE_MANIFEST
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": ONLINE_MANIFEST_VERSION, "frame_type": frame_type, "entries": entries}, f)
+    os.replace(tmp_path, manifest_path)
 
 
 def create_online_training_dataset(
@@ -159,32 +382,108 @@ def create_online_training_dataset(
     val_ratio: float = 0.2,
     *,
     dataset_root: str | Path | None = None,
-    seed: int | None = None,
     label_dirs: dict[str, Path] | None = None,
 ) -> tuple[Path, dict[str, int]]:
+    # One persistent dataset per frame mode under runs/online_datasets/<mode>.
+    # A manifest keyed by frame remembers its label hash, source image signature
+    # and split, so a run only touches frames that were added, edited, re-extracted
+    # or removed since the last one. Label files whose size/mtime did not change
+    # are not even re-read, which is why callers keep them in a stable folder.
     project_dir = Path(current_project.project_dir)
     dataset_root = Path(dataset_root) if dataset_root is not None else project_dir / "runs" / ONLINE_DATASET_ROOT
-    stamp = datetime.now().strftime("%y%m%d_%H%M%S")
-    dataset_dir = dataset_root / f"online_training_dataset_{stamp}"
-    counts = create_dataset_split(
-        current_project,
-        list(current_project.files),
-        frame_type,
-        dataset_dir,
-        train_ratio=train_ratio,
-        val_ratio=val_ratio,
-        clear_existing=False,
-        seed=seed,
-        label_dirs=label_dirs,
-    )
-    return dataset_dir, counts
+    dataset_dir = dataset_root / frame_type
+    images_dir = dataset_dir / "images"
+    labels_dir = dataset_dir / "labels"
+    images_dir.mkdir(parents=True, exist_ok=True)
+    labels_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = _load_online_manifest(dataset_dir, frame_type)
+    entries: dict[str, dict] = {}
+    stats = Counter()
+    label_dirs = label_dirs or {}
+
+    for fe in current_project.files:
+        video_name = Path(fe.video).stem
+        label_dir = Path(label_dirs.get(video_name, project_dir / "labels" / video_name / "txt"))
+        if not label_dir.is_dir():
+            continue
+
+        source, wanted = _labeled_frames(project_dir, video_name, frame_type, label_dir)
+        missing_images: list[tuple[str, int]] = []
+        for lbl_file, base_name, src_idx in wanted:
+            old = previous.get(base_name)
+            label_hash, label_sig = _label_hash(lbl_file, old)
+            entry = {
+                "label_src": str(lbl_file),
+                "label_sig": label_sig,
+                "label_hash": label_hash,
+                "image": old.get("image") if old else None,
+                "image_sig": source.signature(src_idx),
+                "split": _split_of(base_name, train_ratio, val_ratio),
+            }
+            entries[base_name] = entry
+
+            # A re-extracted frame no longer matches the file linked in earlier
+            if (entry["image"] is None or old.get("image_sig") != entry["image_sig"]
+                    or not (images_dir / entry["image"]).exists()):
+                missing_images.append((base_name, src_idx))
+            if old is None:
+                stats["added"] += 1
+            elif old.get("label_hash") != label_hash or not (labels_dir / f"{base_name}.txt").exists():
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+                continue
+            shutil.copyfile(lbl_file, labels_dir / f"{base_name}.txt")
+
+        # Only frames new to the dataset (or re-extracted) are rendered/unpacked and linked in
+        img_paths = source.materialize(idx for _, idx in missing_images)
+        for base_name, src_idx in missing_images:
+            img_path = img_paths.get(src_idx)
+            if img_path is None:
+                entries.pop(base_name)
+                (labels_dir / f"{base_name}.txt").unlink(missing_ok=True)
+                continue
+            image_name = f"{base_name}{Path(img_path).suffix.lower()}"
+            link_or_copy(Path(img_path), images_dir / image_name)
+            entries[base_name]["image"] = image_name
+
+    for base_name, old in previous.items():
+        if base_name in entries:
+            continue
+        stats["removed"] += 1
+        (labels_dir / f"{base_name}.txt").unlink(missing_ok=True)
+        if old.get("image"):
+            (images_dir / old["image"]).unlink(missing_ok=True)
+
+    if not entries:
+        _save_online_manifest(dataset_dir, frame_type, entries)
+        raise ValueError("Could not find label-image pair.")
+
+    split_map: dict[str, list[str]] = {split: [] for split in SPLITS}
+    for base_name in sorted(entries):
+        split_map[entries[base_name]["split"]].append((images_dir / entries[base_name]["image"]).resolve().as_posix())
+    # Ultralytics requires non-empty train and validation sets
+    if not split_map["val"]:
+        split_map["val"] = list(split_map["train"] or split_map["test"])
+    if not split_map["train"]:
+        split_map["train"] = list(split_map["val"])
+
+    for split, lines in split_map.items():
+        with open(dataset_dir / f"{split}.txt", "w", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+    _save_online_manifest(dataset_dir, frame_type, entries)
+
+    print(f"[Online dataset] {frame_type}: {stats['added']} added, {stats['updated']} updated, "
+          f"{stats['removed']} removed, {stats['unchanged']} unchanged")
+    return dataset_dir, {split: len(lines) for split, lines in split_map.items()}
 
 
 class DataSplitDialog(QDialog):
     def __init__(self, current_project, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Data Split")
-        self.setFixedSize(500, 400)
+        self.setFixedSize(500, 500)
 
         self.current_project = current_project
         self.files = current_project.files
@@ -249,6 +548,45 @@ class DataSplitDialog(QDialog):
         self.frame_type_combo.addItem("contour")
         layout.addWidget(self.frame_type_combo)
 
+        self.copy_check = QCheckBox("Copy frames into runs/dataset (otherwise list files are written)")
+        layout.addWidget(self.copy_check)
+
+        cache_layout = QHBoxLayout()
+        self.cache_check = QCheckBox("Pre-resize frames to imgsz")
+        self.cache_check.setToolTip("Cache frames downscaled to the training image size under runs/image_cache, "
+                                    "so training does not decode full-resolution frames every epoch.")
+        self.imgsz_spin = QSpinBox()
+        self.imgsz_spin.setRange(32, 4096)
+        self.imgsz_spin.setSingleStep(32)
+        self.imgsz_spin.setValue(640)
+        self.imgsz_spin.setEnabled(False)
+        self.cache_check.toggled.connect(self.imgsz_spin.setEnabled)
+        cache_layout.addWidget(self.cache_check)
+        cache_layout.addWidget(self.imgsz_spin)
+        cache_layout.addStretch()
+        layout.addLayout(cache_layout)
+
+        dedup_layout = QHBoxLayout()
+        self.dedup_check = QCheckBox("Prune near-duplicate frames")
+        self.dedup_check.setToolTip("Drop frames that look almost identical to the previous kept frame of the "
+                                    "same video (perceptual hash distance at most the given number of bits).")
+        self.dedup_spin = QSpinBox()
+        self.dedup_spin.setRange(0, 32)
+        self.dedup_spin.setValue(DEDUP_THRESHOLD)
+        self.dedup_spin.setSuffix(" bits")
+        self.budget_spin = QSpinBox()
+        self.budget_spin.setRange(0, 1000000)
+        self.budget_spin.setSpecialValueText("No limit")
+        self.budget_spin.setPrefix("Max ")
+        for widget in (self.dedup_spin, self.budget_spin):
+            widget.setEnabled(False)
+            self.dedup_check.toggled.connect(widget.setEnabled)
+        dedup_layout.addWidget(self.dedup_check)
+        dedup_layout.addWidget(self.dedup_spin)
+        dedup_layout.addWidget(self.budget_spin)
+        dedup_layout.addStretch()
+        layout.addLayout(dedup_layout)
+
         self.run_btn = QPushButton("Run")
         layout.addWidget(self.run_btn)
         self.run_btn.clicked.connect(self.run_split)
@@ -270,9 +608,8 @@ class DataSplitDialog(QDialog):
             video_path = Path(fe.video)
             video_stem = video_path.stem
             frame_type = self.frame_type_combo.currentText()
-            frame_dir = _resolve_frame_dir(Path(current_project.project_dir), video_stem, frame_type)
             label_dir = Path(current_project.project_dir) / "labels" / video_stem / "txt"
-            frame_cnt = sum(1 for _ in frame_dir.glob("*.jpg"))
+            frame_cnt = len(open_frame_source(Path(current_project.project_dir), video_stem, frame_type))
             label_cnt = sum(1 for _ in label_dir.glob("*.txt"))
 
             row_lay = QHBoxLayout()
@@ -351,6 +688,7 @@ class DataSplitDialog(QDialog):
             return
 
         dataset_dir = Path(self.current_project.project_dir) / "runs" / "dataset"
+        mode = "copy" if self.copy_check.isChecked() else "lists"
         try:
             split_counts = create_dataset_split(
                 self.current_project,
@@ -360,6 +698,10 @@ class DataSplitDialog(QDialog):
                 train_ratio=self.train_spin.value() / 100.0,
                 val_ratio=self.valid_spin.value() / 100.0,
                 clear_existing=True,
+                mode=mode,
+                imgsz=self.imgsz_spin.value() if self.cache_check.isChecked() else None,
+                dedup_threshold=self.dedup_spin.value() if self.dedup_check.isChecked() else None,
+                dedup_budget=self.budget_spin.value() if self.dedup_check.isChecked() else None,
             )
         except ValueError as e:
             QMessageBox.warning(self, "Error", str(e))
@@ -368,11 +710,19 @@ class DataSplitDialog(QDialog):
             QMessageBox.critical(self, "Error", f"Failed to create dataset split:\n{e}")
             return
 
-        QMessageBox.information(
-            self,
-            "Success",
-            (f"Data Split completed\n"
-             f"Train: {split_counts['train']}\n"
-             f"Val:   {split_counts['val']}\n"
-             f"Test:  {split_counts['test']}")
-        )
+        config_path = Path(self.current_project.project_dir) / "runs" / "training_config.yaml"
+        if config_path.exists():
+            try:
+                update_training_config(config_path, split_data_paths(dataset_dir, mode))
+            except Exception as e:
+                QMessageBox.warning(self, "Warning", f"Split created, but failed to update training config:\n{e}")
+
+        message = (f"Data Split completed\n"
+                   f"Train: {split_counts['train']}\n"
+                   f"Val:   {split_counts['val']}\n"
+                   f"Test:  {split_counts['test']}")
+        if split_counts["duplicates"]:
+            total = split_counts["frames"] + split_counts["duplicates"]
+            message += (f"\n\nPruned {split_counts['duplicates']} near-duplicate frames "
+                        f"({100 * split_counts['duplicates'] / total:.0f}% of {total})")
+        QMessageBox.information(self, "Success", message)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from typing import Optional
+
+# Parses the console output of `yolo pose train/predict` into small event dicts:
+#   {"type": "train", "epoch", "epochs", "batch", "batches", "percent", "it_s", "eta", "gpu_mem", "losses"}
+#   {"type": "val", "epoch", "metrics": {"box_mAP50": ..., "pose_mAP50-95": ...}}
+#   {"type": "predict", "frame", "frames", "ms"}
+#   {"type": "speed", "preprocess_ms", "inference_ms", "postprocess_ms"}
+
+_BAR_RES = (
+    # tqdm, older ultralytics: " 55%|#####5    | 11/20 [00:00<00:00, 19.83it/s]"
+    re.compile(
+        r"(?P<pct>\d+)%\|[^|]*\|\s*(?P<n>\d+)/(?P<total>\d+)\s*"
+        r"\[(?P<elapsed>[\d:]+)(?:<(?P<eta>[\d:?]+))?,?\s*(?:(?P<rate>[\d.]+)(?P<scale>[KMG])?)?\s*(?P<unit>it/s|s/it)?"
+    ),
+    # ultralytics' own bar: "50% ━━━━━━────── 10/20 19.3it/s 0.5s<0.5s" (no ETA once done)
+    re.compile(
+        r"(?P<pct>\d+)% [━─╸]+ (?P<n>\d+)/(?P<total>\d+)\s+"
+        r"(?:(?P<rate>[\d.]+)(?P<scale>[KMG])?(?P<unit>it/s|s/it)\s+)?(?P<elapsed>[\d:.]+s?)(?:<(?P<eta>[\d:.]+s?))?"
+    ),
+)
+_EPOCH_RE = re.compile(r"^\s*(?P<epoch>\d+)/(?P<epochs>\d+)\s+(?P<rest>.*?):?\s*\d+%[| ]")
+# Newer ultralytics prefixes every redraw with an erase-line code
+_ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+_RATE_SCALES = {"K": 1e3, "M": 1e6, "G": 1e9}
+_PREDICT_RES = (
+    re.compile(r"\(frame (?P<n>\d+)/(?P<total>\d+)\).*?(?P<ms>[\d.]+)ms\s*$"),  # video sources
+    re.compile(r"^image (?P<n>\d+)/(?P<total>\d+) .*?(?P<ms>[\d.]+)ms\s*$"),      # image folders
+)
+_SPEED_RE = re.compile(
+    r"Speed:\s*(?P<pre>[\d.]+)ms preprocess,\s*(?P<inf>[\d.]+)ms inference,\s*(?P<post>[\d.]+)ms postprocess"
+)
+_NUMBER_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+class UltralyticsProgressParser:
+    def __init__(self):
+        self.loss_names: list[str] = []
+        self.metric_names: list[str] = []
+        self.epoch: Optional[int] = None
+
+    def feed(self, line: str) -> Optional[dict]:
+        line = _ANSI_RE.sub("", line).rstrip()
+        if not line:
+            return None
+
+        if "Epoch" in line and "GPU_mem" in line:
+            # Header of the training table: Epoch GPU_mem box_loss pose_loss ... Instances Size
+            columns = line.split()
+            self.loss_names = [c for c in columns if c.endswith("_loss")]
+            return None
+
+        if line.lstrip().startswith("Class") and "mAP50" in line:
+            self.metric_names = self._metric_names(line)
+            return None
+
+        epoch_match = _EPOCH_RE.match(line)
+        bar_match = next((m for m in (r.search(line) for r in _BAR_RES) if m), None)
+        if epoch_match and bar_match:
+            return self._train_event(epoch_match, bar_match)
+
+        fields = line.split()
+        if fields and fields[0] == "all" and self.metric_names:
+            values = [float(v) for v in fields[3:] if _NUMBER_RE.match(v)]
+            return {
+                "type": "val",
+                "epoch": self.epoch,
+                "metrics": dict(zip(self.metric_names, values)),
+            }
+
+        predict_match = next((m for m in (r.search(line) for r in _PREDICT_RES) if m), None)
+        if predict_match:
+            return {
+                "type": "predict",
+                "frame": int(predict_match["n"]),
+                "frames": int(predict_match["total"]),
+                "ms": float(predict_match["ms"]),
+            }
+
+        speed_match = _SPEED_RE.search(line)
+        if speed_match:
+            return {
+                "type": "speed",
+                "preprocess_ms": float(speed_match["pre"]),
+                "inference_ms": float(speed_match["inf"]),
+                "postprocess_ms": float(speed_match["post"]),
+            }
+        return None
+
+    @staticmethod
+    def _metric_names(header: str) -> list[str]:
+        # "Class Images Instances Box(P R mAP50 mAP50-95) Pose(P R mAP50 mAP50-95)"
+        names = []
+        for group, body in re.findall(r"(\w+)\(([^)]*)\)?", header):
+            for metric in body.split():
+                names.append(f"{group.lower()}_{metric}")
+        return names
+
+    def _train_event(self, epoch_match, bar_match) -> dict:
+        self.epoch = int(epoch_match["epoch"])
+        rest = epoch_match["rest"].split()
+        gpu_mem = rest[0] if rest and not _NUMBER_RE.match(rest[0]) else None
+        numbers = [float(v) for v in rest if _NUMBER_RE.match(v)]
+        losses = dict(zip(self.loss_names, numbers))
+
+        rate = float(bar_match["rate"]) * _RATE_SCALES.get(bar_match["scale"], 1) if bar_match["rate"] else None
+        if rate is not None and bar_match["unit"] == "s/it" and rate > 0:
+            rate = 1.0 / rate
+        return {
+            "type": "train",
+            "epoch": self.epoch,
+            "epochs": int(epoch_match["epochs"]),
+            "batch": int(bar_match["n"]),
+            "batches": int(bar_match["total"]),
+            "percent": int(bar_match["pct"]),
+            "it_s": rate,
+            "eta": bar_match["eta"],
+            "gpu_mem": gpu_mem,
+            "losses": losses,
+        }
+
+
+def summarize_event(event: dict) -> str:
+    # One-line status for the Jobs panel
+    kind = event.get("type")
+    if kind == "train":
+        text = f"epoch {event['epoch']}/{event['epochs']} {event['percent']}%"
+        if event.get("it_s"):
+            text += f" · {event['it_s']:.2f} it/s"
+        if event.get("eta"):
+            text += f" · ETA {event['eta']}"
+        return text
+    if kind == "val":
+        metrics = event.get("metrics", {})
+        value = metrics.get("pose_mAP50-95", metrics.get("box_mAP50-95"))
+        return f"epoch {event.get('epoch')} val mAP50-95 {value:.3f}" if value is not None else "validation"
+    if kind == "predict":
+        return f"frame {event['frame']}/{event['frames']} · {event['ms']:.1f} ms"
+    if kind == "speed":
+        return f"{event['inference_ms']:.1f} ms/frame inference"
+    return ""
+
+
+class EventLog:
+    # Appends events as JSON lines; the file is reopened per write so it can be
+    # tailed or copied while a run is going.
+
+    def __init__(self, path, flush_interval: float = 1.0):
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self._pending: list[str] = []
+        self._last_flush = 0.0
+
+    def write(self, event: dict):
+        record = dict(event)
+        record["time"] = round(time.time(), 3)
+        self._pending.append(json.dumps(record))
+        # Progress bars update many times a second; batch the writes
+        if time.monotonic() - self._last_flush >= self.flush_interval or event.get("type") == "val":
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(self._pending) + "\n")
+        except OSError as e:
+            print(f"[Progress] Failed to write {self.path}: {e}")
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+
+class ProgressTracker:
+    # Per-run glue used by the job manager for YOLO runs: parse a line,
+    # log the event, and attach a short summary for display.
+
+    def __init__(self, events_log: Optional[str] = None):
+        self.parser = UltralyticsProgressParser()
+        self.log = EventLog(events_log) if events_log else None
+
+    @classmethod
+    def for_job(cls, job):
+        return cls(job.events_log)
+
+    def feed(self, line: str) -> Optional[dict]:
+        event = self.parser.feed(line)
+        if event is None:
+            return None
+        if self.log is not None:
+            self.log.write(event)
+        event["summary"] = summarize_event(event)
+        return event
+
+    def close(self):
+        if self.log is not None:
+            self.log.flush()
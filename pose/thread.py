@@ -1,101 +1,27 @@
-from PyQt6.QtCore import QThread, pyqtSignal
-import subprocess
-import sys
 import os
 import shlex
+from .progress import ProgressTracker
+from main.jobs import JobManager, register_progress_parser
 
 def _to_cmd_list(command):
     if isinstance(command, (list, tuple)):
         return list(command)
     return shlex.split(str(command), posix=False)
 
-def _make_env():
-    env = os.environ.copy()
-    env.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
-    env.setdefault("OMP_NUM_THREADS", "1")
-    env.setdefault("MKL_NUM_THREADS", "1")
-    return env
-
-class TrainThread(QThread):
-    finished_signal = pyqtSignal()
-
-    def __init__(self, command):
-        super().__init__()
-        self.command = command
-
-    def run(self):
-        cmd_list = _to_cmd_list(self.command)
-        env = _make_env()
-
-        process = subprocess.Popen(
-            cmd_list,
-            shell=False,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            encoding="utf-8",
-            errors="replace", 
-            env=env,
-        )
-
-        # stdout
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                sys.stdout.write(line)
-                sys.stdout.flush()
-
-        # stderr
-        for line in iter(process.stderr.readline, ''):
-            if line:
-                sys.stderr.write(line)
-                sys.stderr.flush()
-
-        process.stdout.close()
-        process.stderr.close()
-        rc = process.wait()
-
-        if rc != 0:
-            sys.stderr.write(f"\n[TrainThread] YOLO exited with code {rc}\n")
-            sys.stderr.flush()
-
-        self.finished_signal.emit()
-
-class InferenceThread(QThread):
-    def __init__(self, command):
-        super().__init__()
-        self.command = command
-
-    def run(self):
-        cmd_list = _to_cmd_list(self.command)
-        env = _make_env()
-
-        process = subprocess.Popen(
-            cmd_list,
-            shell=False,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            encoding="utf-8",
-            errors="replace",
-            env=env,
-        )
-
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                sys.stdout.write(line)
-                sys.stdout.flush()
-
-        for line in iter(process.stderr.readline, ''):
-            if line:
-                sys.stderr.write(line)
-                sys.stderr.flush()
-
-        process.stdout.close()
-        process.stderr.close()
-        rc = process.wait()
-
-        if rc != 0:
-            sys.stderr.write(f"\n[InferenceThread] YOLO exited with code {rc}\n")
-            sys.stderr.flush()
+YOLO_ENV_DEFAULTS = {
+    "KMP_DUPLICATE_LIB_OK": "TRUE",
+    "OMP_NUM_THREADS": "1",
+    "MKL_NUM_THREADS": "1",
+}
+
+register_progress_parser("ultralytics", ProgressTracker.for_job)
+
+def submit_yolo_job(title, command, on_finished=None, max_retries=0, events_log=None, resource="gpu"):
+    # YOLO runs share the GPU, so they go through the job queue one at a time.
+    # Their console output is parsed into progress events (optionally logged as JSONL).
+    env = {k: v for k, v in YOLO_ENV_DEFAULTS.items() if k not in os.environ}
+    return JobManager.instance().submit_command(
+        title, _to_cmd_list(command), resource=resource, env=env,
+        max_retries=max_retries, on_finished=on_finished,
+        progress_parser="ultralytics", events_log=events_log,
+    )
@@ -6,7 +6,9 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 import subprocess
 import os
-from .thread import TrainThread, InferenceThread
+from .thread import submit_yolo_job
+from .inference_engine import DEFAULT_BATCH_SIZE, InferenceEngineWorker, InferenceSource, PoseInferenceEngine
+from .export import MODEL_FILE_FILTER, ExportDialog, model_runtime, resolve_model_path
 import sys
 from datetime import datetime
 import yaml
@@ -231,17 +233,33 @@ class YOLODialog(QDialog):
 
         print("Execute Command:", command)
 
-        self.train_thread = TrainThread(command)
-        self.train_thread.finished_signal.connect(
-            lambda: QMessageBox.information(self, "Done", "Training Completed")
-        )
-        self.train_thread.start()
+        events_log = os.path.join(params["project"], f"{params['name']}_events.jsonl")
+        train_dir = Path(params["project"]) / params["name"]
+        submit_yolo_job(f"Train: {params['name']}", command,
+                        on_finished=lambda job: self._on_train_finished(job, train_dir),
+                        events_log=events_log)
+
+    def _on_train_finished(self, job, train_dir):
+        if job.state == "done":
+            best_model = train_dir / "weights" / "best.pt"
+            if not best_model.exists():
+                QMessageBox.information(self, "Done", "Training Completed")
+                return
+            answer = QMessageBox.question(
+                self, "Done",
+                f"Training Completed\n\n{best_model}\n\nExport it to ONNX/OpenVINO for CPU inference?"
+            )
+            if answer == QMessageBox.StandardButton.Yes:
+                ExportDialog(self.current_project, best_model, self).exec()
+        elif job.state == "failed":
+            QMessageBox.critical(self, "Training failed", f"{job.title}\n{job.error}")
 
 class YoloInferenceDialog(QDialog):
     def __init__(self, current_project, parent=None):
         super().__init__(parent)
         self.current_project = current_project
         self.animals_name = current_project.animals_name
+        self.inference_jobs = set()
         self.build_ui()
 
     def build_ui(self):
@@ -257,12 +275,12 @@ class YoloInferenceDialog(QDialog):
         self.target_group = self.build_target_group()
         self.inference_group = self.create_params_group(
             "Inference Config",
-            {"imgsz": 640, "conf": 0.5, "iou": 0.7,
+            {"imgsz": 640, "conf": 0.5, "iou": 0.7, "batch": DEFAULT_BATCH_SIZE,
              "augment": False, "half": False, "device": "None"}
         )
         self.visualization_group = self.create_params_group(
             "Visualization",
-            {"show": False, "save": False, "save_txt": True}
+            {"show": False, "save": False, "save_txt": True, "save_npz": False}
         )
 
         self.grid.addWidget(self.video_group, 0, 0)
@@ -407,7 +425,7 @@ class YoloInferenceDialog(QDialog):
                 self,
                 "Select pretrained model file",
                 str(Path(self.current_project.project_dir)/"runs"),
-                "PyTorch model (*.pt);;All Files (*)"
+                MODEL_FILE_FILTER
             )
         if not model_path:
             QMessageBox.warning(
@@ -506,6 +524,25 @@ class YoloInferenceDialog(QDialog):
             return sources
         raise
         
+    def _unpack_frame_stores(self, sources, image_mode):
+        # The yolo CLI reads folders, so packed frame stores are unpacked first
+        # and their sources pointed at the unpacked copy
+        from utils.frames import StoreFrameSource, open_frame_source
+
+        unpacked = []
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            for name, src in sources:
+                source = open_frame_source(self.current_project.project_dir, name, image_mode)
+                if isinstance(source, StoreFrameSource):
+                    print(f"Unpacking {name}/{image_mode} frame store for inference.")
+                    source.materialize(range(len(source)))
+                    src = source.materialized_dir
+                unpacked.append((name, src))
+        finally:
+            QApplication.restoreOverrideCursor()
+        return unpacked
+
     def get_inference_target(self):
         classes = [idx for idx, cb in enumerate(self.target_checks) if cb.isChecked()]
         max_det = len(classes)
@@ -513,6 +550,8 @@ class YoloInferenceDialog(QDialog):
 
     def run_inference(self):
         model_path = self.model_line_edit.text()
+        if model_path:
+            model_path = str(resolve_model_path(model_path))
         infer_params = self.get_params_from_group(self.inference_group)
         vis_params = self.get_params_from_group(self.visualization_group)
         sources = self.get_video_list()
@@ -526,10 +565,109 @@ class YoloInferenceDialog(QDialog):
         if not classes:
             QMessageBox.warning(self, "Warning", "Select target.")
             return
+        if not vis_params.get("show", False):
+            # The in-process engine covers everything except the live preview window
+            self._run_engine(model_path, infer_params, vis_params, sources, classes, max_det)
+            return
+
+        if vis_params.get("save_npz", False):
+            print("save_npz is not available together with 'show'; results are written as txt.")
         classes = ",".join(str(c) for c in classes)
         infer_params["classes"] = classes
         infer_params["max_det"] = max_det
 
+        image_mode = self.image_mode_combo.currentText() if self.image_radio.isChecked() else None
+        if image_mode in ("images", "davis"):
+            sources = self._unpack_frame_stores(sources, image_mode)
+        if image_mode == "contour":
+            # Contour frames are rendered on demand elsewhere; the yolo CLI needs
+            # them on disk, so bring the selected folders up to date first.
+            from video_preprocess.cutie_based_contour import BatchContourProcessor
+
+            from main.jobs import JobManager
+
+            def _start_contour(job, done):
+                processor = BatchContourProcessor(self, self.current_project, include_only=[name for name, _ in sources])
+                processor.any_error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
+                return processor.start_as_job(done)
+
+            def _contour_finished(job):
+                if job.state != "cancelled":
+                    self._queue_inference(model_path, infer_params, vis_params, sources)
+
+            JobManager.instance().submit_task("Contour for inference", _start_contour,
+                                              on_finished=_contour_finished)
+            return
+
+        self._queue_inference(model_path, infer_params, vis_params, sources)
+
+    def _run_engine(self, model_path, infer_params, vis_params, sources, classes, max_det):
+        from main.jobs import JobManager
+        from utils.frames import open_frame_source
+
+        ts = datetime.now()
+        ts_date = ts.strftime("%y%m%d")
+        ts_time = ts.strftime("%H%M%S")
+        base_out = Path(self.current_project.project_dir) / "predicts"
+
+        image_mode = self.image_mode_combo.currentText() if self.image_radio.isChecked() else None
+        engine_sources = []
+        output_dirs = {}
+        for name, src in sources:
+            # Frame folders are read through utils.frames, so packed stores and
+            # on-demand contour frames need no unpacking or pre-rendering
+            frame_source = open_frame_source(self.current_project.project_dir, name, image_mode) if image_mode else None
+            engine_sources.append(InferenceSource(name, src, frame_source))
+            output_dirs[name] = base_out / f"predict__{name}_{ts_date}_{ts_time}"
+
+        params = dict(infer_params)
+        batch_size = int(params.pop("batch", DEFAULT_BATCH_SIZE))
+        runtime = model_runtime(model_path)
+        if runtime != "pytorch":
+            # Exports are static-shape (batch 1) and run on the CPU
+            batch_size = 1
+            params["device"] = "cpu"
+        tracker = self.track_method_combo.currentText() + ".yaml" if self.tracking_radio.isChecked() else None
+        engine = PoseInferenceEngine(model_path, batch_size=batch_size, tracker=tracker,
+                                     classes=classes, max_det=max_det, **params)
+
+        def _start(job, done):
+            worker = InferenceEngineWorker(engine, engine_sources, output_dirs,
+                                           save_txt=vis_params.get("save_txt", True),
+                                           save_video=vis_params.get("save", False),
+                                           save_npz=vis_params.get("save_npz", False))
+            reported = {}
+
+            def _progress(name, n, total):
+                step = n * 10 // total if total else 0
+                if step > reported.get(name, -1):
+                    reported[name] = step
+                    print(f"[Inference] {name}: {n}/{total} frames")
+
+            def _finished(ok, error):
+                worker.wait()
+                worker.deleteLater()
+                done(ok, error)
+
+            worker.frame_progress.connect(_progress)
+            worker.video_done.connect(lambda name, n: print(f"[Inference] {name} done ({n} frames) -> {output_dirs[name]}"))
+            worker.video_error.connect(lambda name, msg: print(f"[Inference] {name} failed: {msg}"))
+            worker.finished.connect(_finished)
+            worker.start()
+            return worker
+
+        def _engine_finished(job):
+            if job.state == "done":
+                print("All inference tasks completed.")
+            elif job.state == "failed":
+                QMessageBox.critical(self, "Inference failed", job.error)
+
+        print(f"▶Queued inference for {len(engine_sources)} source(s) with batch size {batch_size} ({runtime}).")
+        JobManager.instance().submit_task(f"Inference: {len(engine_sources)} source(s)", _start,
+                                          resource="gpu" if runtime == "pytorch" else "cpu",
+                                          on_finished=_engine_finished)
+
+    def _queue_inference(self, model_path, infer_params, vis_params, sources):
         self.command_queue = [] 
 
         ts = datetime.now()
@@ -586,13 +724,15 @@ class YoloInferenceDialog(QDialog):
 
     
     def run_next_command(self):
-        if not self.command_queue:
+        # Every command becomes its own queued job; the gpu cap runs them in order
+        while self.command_queue:
+            command = self.command_queue.pop(0)
+            print("▶Queued:", command)
+            name = next((c.split("=", 1)[1] for c in command if c.startswith("name=")), "predict")
+            job_id = submit_yolo_job(f"Inference: {name}", command, on_finished=self._on_inference_finished)
+            self.inference_jobs.add(job_id)
+
+    def _on_inference_finished(self, job):
+        self.inference_jobs.discard(job.id)
+        if not self.inference_jobs:
             print("All inference tasks completed.")
-            return
-
-        command = self.command_queue.pop(0)
-        print("▶Executing:", command)
-
-        self.infer_thread = InferenceThread(command)
-        self.infer_thread.finished.connect(self.run_next_command) 
-        self.infer_thread.start()
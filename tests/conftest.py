@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the app packages the same way moval.py does, from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
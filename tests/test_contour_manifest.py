@@ -0,0 +1,71 @@
+import os
+
+from video_preprocess.contour_manifest import ContourManifest, render_params, stored_render_params
+
+
+def _pairs(tmp_path, n):
+    frames, masks = tmp_path / "davis", tmp_path / "masks"
+    frames.mkdir()
+    masks.mkdir()
+    pairs = []
+    for i in range(n):
+        frame, mask = frames / f"{i:05d}.jpg", masks / f"{i:05d}.png"
+        frame.write_bytes(b"frame")
+        mask.write_bytes(b"mask")
+        pairs.append((str(frame), str(mask)))
+    return pairs
+
+
+def _render(out_dir, manifest, pairs):
+    # Stand-in for the contour workers: write the outputs, then record them
+    out_dir.mkdir(exist_ok=True)
+    for frame, _ in pairs:
+        (out_dir / os.path.basename(frame)).write_bytes(b"contour")
+    manifest.mark_done(pairs)
+    manifest.save()
+
+
+def test_rerun_only_renders_changed_frames(tmp_path):
+    pairs = _pairs(tmp_path, 4)
+    out_dir = tmp_path / "contour"
+    params = render_params(1, 95)
+
+    manifest = ContourManifest(out_dir, params)
+    assert manifest.stale_pairs(pairs) == pairs
+    _render(out_dir, manifest, pairs)
+    assert ContourManifest(out_dir, params).stale_pairs(pairs) == []
+
+    # A touched mask and a deleted output are both re-rendered
+    st = os.stat(pairs[1][1])
+    os.utime(pairs[1][1], ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    os.remove(out_dir / "00003.jpg")
+    assert ContourManifest(out_dir, params).stale_pairs(pairs) == [pairs[1], pairs[3]]
+
+
+def test_param_change_invalidates_everything(tmp_path):
+    pairs = _pairs(tmp_path, 3)
+    out_dir = tmp_path / "contour"
+    manifest = ContourManifest(out_dir, render_params(1, 95))
+    manifest.stale_pairs(pairs)
+    _render(out_dir, manifest, pairs)
+
+    assert ContourManifest(out_dir, render_params(2, 95)).stale_pairs(pairs) == pairs
+    assert ContourManifest(out_dir, render_params(1, 95, "color")).stale_pairs(pairs) == pairs
+    assert stored_render_params(out_dir) == render_params(1, 95)
+
+
+def test_interrupted_batch_resumes(tmp_path):
+    pairs = _pairs(tmp_path, 4)
+    out_dir = tmp_path / "contour"
+    params = render_params(1, 95)
+    manifest = ContourManifest(out_dir, params)
+    manifest.stale_pairs(pairs)
+    _render(out_dir, manifest, pairs[:2])
+
+    assert ContourManifest(out_dir, params).stale_pairs(pairs) == pairs[2:]
+
+
+def test_stored_render_params_without_manifest(tmp_path):
+    assert stored_render_params(tmp_path) == {}
+    (tmp_path / ".manifest.json").write_text("{not json", encoding="utf-8")
+    assert stored_render_params(tmp_path) == {}
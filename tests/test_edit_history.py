@@ -0,0 +1,83 @@
+import numpy as np
+
+from labelary.IO.edit_history import EditHistory
+from labelary.IO.label_store import LabelStore
+
+KPS = ["nose", "tail"]
+
+
+def _instance(x):
+    return np.array([[x, x, 2], [x + 1, x + 1, 2]], dtype=np.float32)
+
+
+def _set(store, history, frame_idx, track, values, label="edit"):
+    before = store.get_instance(frame_idx, track)
+    store.set_instance(frame_idx, track, values)
+    history.record(label, [(frame_idx, track, before, store.get_instance(frame_idx, track))])
+
+
+def _delete(store, history, frame_idx, track, label="delete"):
+    before = store.get_instance(frame_idx, track)
+    store.delete_instance(frame_idx, track)
+    history.record(label, [(frame_idx, track, before, None)])
+
+
+def test_undo_redo_restores_instances():
+    store = LabelStore(KPS, ["a"], frame_capacity=4)
+    history = EditHistory()
+    _set(store, history, 1, "a", _instance(10), "add")
+    _set(store, history, 1, "a", _instance(20), "move")
+
+    assert history.undo(store) == ("move", 1)
+    np.testing.assert_array_equal(store.get_instance(1, "a"), _instance(10))
+    assert history.undo(store) == ("add", 1)
+    assert not store.has_instance(1, "a")
+    assert not history.can_undo()
+    assert history.undo(store) is None
+
+    assert history.redo(store) == ("add", 1)
+    assert history.redo(store) == ("move", 1)
+    np.testing.assert_array_equal(store.get_instance(1, "a"), _instance(20))
+    assert not history.can_redo()
+
+
+def test_new_edit_clears_redo_and_noops_are_skipped():
+    store = LabelStore(KPS, ["a"], frame_capacity=4)
+    history = EditHistory()
+    _set(store, history, 0, "a", _instance(1))
+    history.undo(store)
+    assert history.can_redo()
+
+    _set(store, history, 2, "a", _instance(2))
+    assert not history.can_redo()
+    # Writing the same values again records nothing
+    _set(store, history, 2, "a", _instance(2))
+    history.undo(store)
+    assert not history.can_undo()
+
+
+def test_group_is_one_step():
+    store = LabelStore(KPS, ["a"], frame_capacity=4)
+    history = EditHistory()
+    _set(store, history, 3, "a", _instance(5))
+    with history.group("replace"):
+        _delete(store, history, 3, "a")
+        _set(store, history, 3, "b", _instance(6))
+
+    assert history.undo(store) == ("replace", 3)
+    np.testing.assert_array_equal(store.get_instance(3, "a"), _instance(5))
+    assert not store.has_instance(3, "b")
+    history.redo(store)
+    assert not store.has_instance(3, "a")
+    np.testing.assert_array_equal(store.get_instance(3, "b"), _instance(6))
+
+
+def test_limit_drops_oldest_steps():
+    store = LabelStore(KPS, ["a"], frame_capacity=8)
+    history = EditHistory(limit=2)
+    for frame_idx in range(3):
+        _set(store, history, frame_idx, "a", _instance(frame_idx))
+    assert history.undo(store) == ("edit", 2)
+    assert history.undo(store) == ("edit", 1)
+    assert history.undo(store) is None
+    assert store.has_instance(0, "a")
@@ -0,0 +1,62 @@
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from utils.frames import (
+    DirectoryFrameSource,
+    StoreFrameSource,
+    convert_frame_dir,
+    frame_mode_dir,
+    open_frame_source,
+)
+from utils.frames.frame_store import SPARSE_MARKER, store_path_for_dir
+
+
+def _pack_video(project_dir, mode, frame_numbers, sparse=False, remove_loose=True):
+    frame_dir = frame_mode_dir(project_dir, "clip", mode)
+    frame_dir.mkdir(parents=True)
+    for n in frame_numbers:
+        img = np.full((8, 8, 3), n % 256, dtype=np.uint8)
+        cv2.imwrite(str(frame_dir / f"{n:06d}.png"), img)
+    if sparse:
+        marker = {"frames": frame_numbers, "total_frames": max(frame_numbers) + 1}
+        (frame_dir / SPARSE_MARKER).write_text(json.dumps(marker), encoding="utf-8")
+    convert_frame_dir(frame_dir, remove_loose=remove_loose)
+    return frame_dir
+
+
+@pytest.mark.parametrize("mode", ["images", "davis"])
+@pytest.mark.parametrize("frame_numbers, sparse", [
+    (list(range(10)), False),
+    ([3, 7, 20, 41, 42], True),
+])
+def test_materialize_keeps_store_on_reopen(tmp_path, mode, frame_numbers, sparse):
+    frame_dir = _pack_video(tmp_path, mode, frame_numbers, sparse)
+
+    source = open_frame_source(tmp_path, "clip", mode)
+    assert isinstance(source, StoreFrameSource)
+    paths = source.materialize([1, 3])
+    assert sorted(paths) == [1, 3]
+    for idx, path in paths.items():
+        assert cv2.imread(path)[0, 0, 0] == source.frame_numbers[idx] % 256
+        assert not path.startswith(str(frame_dir))
+
+    reopened = open_frame_source(tmp_path, "clip", mode)
+    assert isinstance(reopened, StoreFrameSource)
+    assert len(reopened) == len(frame_numbers)
+    assert list(reopened.frame_numbers) == frame_numbers
+    assert reopened.is_sparse == sparse
+
+
+def test_store_preferred_over_older_loose_frames(tmp_path):
+    frame_dir = _pack_video(tmp_path, "images", list(range(5)), remove_loose=False)
+    assert isinstance(open_frame_source(tmp_path, "clip", "images"), StoreFrameSource)
+
+    # A loose frame rewritten after packing means the store is out of date
+    store_mtime = store_path_for_dir(frame_dir).stat().st_mtime_ns
+    newer = (store_mtime + 2_000_000_000, store_mtime + 2_000_000_000)
+    os.utime(frame_dir / "000002.png", ns=newer)
+    assert isinstance(open_frame_source(tmp_path, "clip", "images"), DirectoryFrameSource)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from labelary.IO.label_store import LabelStore
+
+KPS = ["nose", "tail"]
+
+
+def _instance(x, v=2):
+    return np.array([[x, x + 1, v], [x + 2, x + 3, v]], dtype=np.float32)
+
+
+def test_delta_reads_and_compact():
+    store = LabelStore(KPS, ["a"], frame_capacity=4)
+    store.set_instance(1, "a", _instance(10))
+    # Past the capacity and on a new track: both wait in the delta
+    store.set_instance(9, "a", _instance(20))
+    store.set_instance(2, "b", _instance(30))
+    assert store.frame_capacity == 4
+    assert len(store) == 3
+    assert store.labeled_frames() == [1, 2, 9]
+    assert store.get_point(9, "a", "tail") == (22.0, 23.0, 2)
+    assert store.tracks_in_frame(2) == ["b"]
+
+    store.compact()
+    assert store.frame_capacity >= 10
+    assert store.track_names == ["a", "b"]
+    assert len(store) == 3
+    assert store.labeled_frames() == [1, 2, 9]
+    np.testing.assert_array_equal(store.get_instance(9, "a"), _instance(20))
+    np.testing.assert_array_equal(store.get_instance(2, "b"), _instance(30))
+
+
+def test_delete_and_swap_across_delta():
+    store = LabelStore(KPS, ["a"], frame_capacity=4)
+    store.set_instance(1, "a", _instance(10))
+    store.set_instance(1, "b", _instance(20))
+    assert store.swap_tracks(1, "a", "b")
+    np.testing.assert_array_equal(store.get_instance(1, "a"), _instance(20))
+    np.testing.assert_array_equal(store.get_instance(1, "b"), _instance(10))
+
+    assert store.delete_instance(1, "b")
+    assert store.delete_instance(1, "a")
+    assert not store.delete_instance(1, "a")
+    assert store.labeled_frames() == []
+    assert store.empty
+
+
+def test_dirty_frames_and_export_token():
+    store = LabelStore(KPS, ["a"], frame_capacity=8)
+    store.set_instance(2, "a", _instance(1))
+    store.set_instance(5, "a", _instance(1))
+    assert store.take_dirty_frames() == {2, 5}
+    assert store.take_dirty_frames() == set()
+
+    store.update_points(5, "a", {"nose": (7, 8)})
+    store.set_visibility(2, "a", "tail", 0)
+    assert store.take_dirty_frames() == {2, 5}
+
+    token = store.export_token
+    store.scale(2.0, 2.0)
+    assert store.export_token != token
+    assert store.get_point(5, "a", "nose") == (14.0, 16.0, 2)
+
+
+def test_dataframe_round_trip_keeps_instance_visibility():
+    df = pd.DataFrame({
+        "track": ["a", "b", "a"],
+        "frame_idx": [0, 0, 3],
+        "instance.visibility": [1, 2, 0],
+        "nose.x": [1.5, 2.5, 3.5], "nose.y": [1.0, 2.0, 3.0], "nose.visibility": [2, 1, 0],
+        "tail.x": [4.0, 5.0, 6.0], "tail.y": [7.0, 8.0, 9.0], "tail.visibility": [2, 2, 2],
+    })
+    store = LabelStore.from_dataframe(df, KPS, ["a"])
+    assert store.coords.dtype == np.float32
+    # A new instance gets the default instance visibility
+    store.set_instance(5, "b", _instance(0))
+
+    out = store.to_dataframe()
+    assert list(out["frame_idx"]) == [0, 0, 3, 5]
+    assert list(out["instance.visibility"]) == [1, 2, 0, 2]
+    assert list(out["nose.x"][:3]) == [1.5, 2.5, 3.5]
+    assert list(store.to_dataframe(frames=[3])["track"]) == ["a"]
+
+
+def test_set_instance_rejects_bad_input():
+    store = LabelStore(KPS, ["a"])
+    with pytest.raises(ValueError):
+        store.set_instance(0, "a", np.zeros((3, 3)))
+    with pytest.raises(ValueError):
+        store.set_instance(-1, "a", _instance(0))
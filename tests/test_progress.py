@@ -0,0 +1,70 @@
+import pytest
+
+from pose.progress import UltralyticsProgressParser
+
+HEADER = ("      Epoch    GPU_mem   box_loss  pose_loss  kobj_loss   cls_loss   dfl_loss"
+          "  Instances       Size")
+VAL_PREFIX = ("                 Class     Images  Instances      Box(P          R      mAP50  mAP50-95)"
+              "     Pose(P          R      mAP50  mAP50-95):")
+TRAIN_PREFIX = ("      3/100      2.41G      1.234      4.567      0.789      1.234      1.012"
+                "         12        640:")
+VAL_ALL = ("                   all         10         20      0.912      0.875      0.931      0.702"
+           "      0.881      0.853      0.904      0.655")
+
+# Redraws as written by tqdm (older ultralytics) and by ultralytics' own TQDM
+TRAIN_LINES = [
+    (TRAIN_PREFIX + "  55%|#####5    | 11/20 [00:00<00:00, 19.83it/s]",
+     dict(percent=55, batch=11, batches=20, it_s=19.83, eta="00:00")),
+    (TRAIN_PREFIX + " 100%|██████████| 20/20 [00:01<00:00, 19.83it/s]",
+     dict(percent=100, batch=20, batches=20, it_s=19.83, eta="00:00")),
+    (TRAIN_PREFIX + "  75%|#######5  | 3/4 [00:03<00:01,  1.30s/it]",
+     dict(percent=75, batch=3, batches=4, it_s=1 / 1.30, eta="00:01")),
+    ("\x1b[K" + TRAIN_PREFIX + " 50% ━━━━━━────── 10/20 19.3it/s 0.5s<0.5s",
+     dict(percent=50, batch=10, batches=20, it_s=19.3, eta="0.5s")),
+    ("\x1b[K" + TRAIN_PREFIX + " 100% ━━━━━━━━━━━━ 20/20 19.8it/s 1.0s",
+     dict(percent=100, batch=20, batches=20, it_s=19.8, eta=None)),
+    ("\x1b[K" + TRAIN_PREFIX + " 50% ━━━━━━────── 2/4 2.5s/it 2.6s<5.1s",
+     dict(percent=50, batch=2, batches=4, it_s=1 / 2.5, eta="5.1s")),
+    ("\x1b[K" + TRAIN_PREFIX + " 41% ━━━━╸─────── 41/100 1.2Kit/s 1:05<1:34",
+     dict(percent=41, batch=41, batches=100, it_s=1200.0, eta="1:34")),
+]
+
+
+@pytest.mark.parametrize("line, expected", TRAIN_LINES)
+def test_train_bar(line, expected):
+    parser = UltralyticsProgressParser()
+    assert parser.feed(HEADER) is None
+    event = parser.feed(line)
+    assert event["type"] == "train"
+    assert (event["epoch"], event["epochs"], event["gpu_mem"]) == (3, 100, "2.41G")
+    assert event["losses"] == {"box_loss": 1.234, "pose_loss": 4.567, "kobj_loss": 0.789,
+                               "cls_loss": 1.234, "dfl_loss": 1.012}
+    it_s = expected.pop("it_s")
+    assert event["it_s"] == pytest.approx(it_s)
+    for key, value in expected.items():
+        assert event[key] == value
+
+
+@pytest.mark.parametrize("val_bar", [
+    "  67%|######6   | 2/3 [00:00<00:00, 19.89it/s]",
+    " 66% ━━━━━━━━──── 2/3 10.2it/s 0.1s<0.1s",
+])
+def test_validation_metrics(val_bar):
+    parser = UltralyticsProgressParser()
+    parser.feed(HEADER)
+    parser.feed(TRAIN_PREFIX + " 100% ━━━━━━━━━━━━ 20/20 19.8it/s 1.0s")
+    assert parser.feed("\x1b[K" + VAL_PREFIX + val_bar) is None
+    event = parser.feed(VAL_ALL)
+    assert event["type"] == "val" and event["epoch"] == 3
+    assert event["metrics"]["box_mAP50"] == 0.931
+    assert event["metrics"]["pose_mAP50-95"] == 0.655
+
+
+def test_predict_and_speed():
+    parser = UltralyticsProgressParser()
+    event = parser.feed("video 1/1 (frame 12/300) /data/clip.mp4: 384x640 2 mouses, 8.4ms")
+    assert (event["type"], event["frame"], event["frames"], event["ms"]) == ("predict", 12, 300, 8.4)
+    event = parser.feed("image 3/50 /data/frames/000003.jpg: 640x640 1 mouse, 7.9ms")
+    assert (event["frame"], event["frames"]) == (3, 50)
+    event = parser.feed("Speed: 1.2ms preprocess, 8.1ms inference, 0.9ms postprocess per image at shape (1, 3, 384, 640)")
+    assert event["inference_ms"] == 8.1
@@ -1,5 +1,3 @@
-from .txt_to_csv import TxtToCsvDialog
-from .data_converter import DataConverterDialog
 from utils.version import __version__
 
 __all__ = [
@@ -7,3 +5,15 @@ __all__ = [
     "DataConverterDialog",
     "__version__",
 ]
+
+
+def __getattr__(name):
+    # The dialogs pull in PyQt; load them on first use so utils.frames and the
+    # other helpers stay importable in worker processes and tests
+    if name == "TxtToCsvDialog":
+        from .txt_to_csv import TxtToCsvDialog
+        return TxtToCsvDialog
+    if name == "DataConverterDialog":
+        from .data_converter import DataConverterDialog
+        return DataConverterDialog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,23 @@
+from .frame_source import (
+    FRAME_MODES,
+    ContourFrameSource,
+    DirectoryFrameSource,
+    FrameSource,
+    StoreFrameSource,
+    frame_mode_dir,
+    open_frame_source,
+)
+from .frame_store import FrameStore, StoreRef, convert_frame_dir
+
+__all__ = [
+    "FRAME_MODES",
+    "ContourFrameSource",
+    "DirectoryFrameSource",
+    "FrameSource",
+    "FrameStore",
+    "StoreFrameSource",
+    "StoreRef",
+    "convert_frame_dir",
+    "frame_mode_dir",
+    "open_frame_source",
+]
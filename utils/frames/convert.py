@@ -0,0 +1,40 @@
+import argparse
+from pathlib import Path
+
+from .frame_source import FRAME_MODES, frame_mode_dir
+from .frame_store import convert_frame_dir
+
+
+def convert_project(project_dir, modes=("images", "davis"), remove_loose: bool = False, videos=None) -> list[Path]:
+    frames_root = Path(project_dir) / "frames"
+    if not frames_root.is_dir():
+        raise FileNotFoundError(f"'frames' directory not found: {frames_root}")
+
+    written = []
+    for video_dir in sorted(p for p in frames_root.iterdir() if p.is_dir()):
+        if videos and video_dir.name not in videos:
+            continue
+        for mode in modes:
+            frame_dir = frame_mode_dir(project_dir, video_dir.name, mode)
+            store_path = convert_frame_dir(frame_dir, remove_loose=remove_loose)
+            if store_path is not None:
+                print(f"[FrameStore] {video_dir.name}/{mode} -> {store_path}")
+                written.append(store_path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack frames/<video>/<mode> folders into single-file frame stores.")
+    parser.add_argument("project_dir")
+    parser.add_argument("--mode", choices=list(FRAME_MODES), action="append",
+                        help="Display mode(s) to convert (default: images and davis)")
+    parser.add_argument("--video", action="append", help="Only convert these video names")
+    parser.add_argument("--remove-loose", action="store_true",
+                        help="Delete the loose frame files after packing; kept files are ignored "
+                             "while the store is newer than them")
+    args = parser.parse_args()
+    convert_project(args.project_dir, args.mode or ("images", "davis"), args.remove_loose, args.video)
+
+
+if __name__ == "__main__":
+    main()
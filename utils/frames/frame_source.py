@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+
+import cv2
+import numpy as np
+
+from .frame_store import SPARSE_MARKER, FrameStore, StoreRef, frame_ref_name, frame_ref_signature, store_path_for_dir
+
+FRAME_MODES = ("images", "davis", "contour")
+FRAME_EXTS = (".jpg", ".png")
+# Unpacked copies of stored frames; kept out of the mode folders so loose
+# files there still mean "this folder replaces the store"
+MATERIALIZED_DIR = ".materialized"
+
+
+def frame_mode_dir(project_dir, video_name: str, mode: str) -> Path:
+    base = Path(project_dir) / "frames" / video_name
+    if mode in ("davis", "contour"):
+        return base / "visualization" / mode
+    if mode == "images":
+        return base / "images"
+    raise ValueError(f"Unsupported frame type: {mode}")
+
+
+def materialized_dir_for(directory) -> Path:
+    # frames/<video>/images -> frames/<video>/.materialized/images
+    # frames/<video>/visualization/<mode> -> frames/<video>/.materialized/<mode>
+    directory = Path(directory)
+    video_dir = directory.parent.parent if directory.parent.name == "visualization" else directory.parent
+    return video_dir / MATERIALIZED_DIR / directory.name
+
+
+def _list_frames(directory: Path, ext=FRAME_EXTS) -> list[str]:
+    try:
+        return sorted(e.name for e in os.scandir(directory) if e.is_file() and e.name.lower().endswith(ext))
+    except FileNotFoundError:
+        return []
+
+
+def _has_frames(directory: Path, ext=FRAME_EXTS) -> bool:
+    # Stops at the first match instead of listing the whole folder
+    try:
+        with os.scandir(directory) as it:
+            return any(e.name.lower().endswith(ext) for e in it)
+    except FileNotFoundError:
+        return False
+
+
+def _has_frames_newer_than(directory: Path, mtime_ns: int, ext=FRAME_EXTS) -> bool:
+    try:
+        with os.scandir(directory) as it:
+            return any(e.name.lower().endswith(ext) and e.stat().st_mtime_ns > mtime_ns for e in it)
+    except FileNotFoundError:
+        return False
+
+
+def _frame_number(name: str, fallback: int) -> int:
+    stem = os.path.splitext(name)[0]
+    return int(stem) if stem.isdigit() else fallback
+
+
+class FrameSource:
+    # Common frame-number bookkeeping. Positions index `names`; frame numbers are
+    # the video frame numbers, which only differ from positions for sparse
+    # (labeling-only) extractions.
+
+    directory: Path
+
+    def _init_frames(self, names: list[str], frame_numbers: list[int], is_sparse: bool):
+        self.names = names
+        self.frame_numbers = frame_numbers
+        self.is_sparse = is_sparse
+        self._index = {os.path.splitext(name)[0]: i for i, name in enumerate(names)}
+        self._position = {n: i for i, n in enumerate(frame_numbers)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def exists(self) -> bool:
+        return self.directory.is_dir()
+
+    @property
+    def frame_span(self) -> int:
+        return self.frame_numbers[-1] + 1 if self.frame_numbers else 0
+
+    def position_of(self, frame_number: int) -> Optional[int]:
+        return self._position.get(frame_number)
+
+    def nearest_frame(self, frame_number: int, direction: int = 0) -> Optional[int]:
+        # direction > 0: first frame at or after; < 0: last at or before; 0: closest
+        numbers = self.frame_numbers
+        if not numbers:
+            return None
+        pos = bisect_left(numbers, frame_number)
+        if pos < len(numbers) and numbers[pos] == frame_number:
+            return frame_number
+        after = numbers[pos] if pos < len(numbers) else None
+        before = numbers[pos - 1] if pos > 0 else None
+        if direction > 0:
+            return after
+        if direction < 0:
+            return before
+        if after is None or (before is not None and frame_number - before <= after - frame_number):
+            return before
+        return after
+
+    def index_of(self, name: str) -> Optional[int]:
+        # Frames are matched by stem so jpg and png extractions look the same
+        return self._index.get(os.path.splitext(name)[0])
+
+    def frame_ref(self, idx: int):
+        raise NotImplementedError
+
+    def signature(self, idx: int) -> list:
+        # Changes when the frame may have been rewritten (re-extraction, repacking)
+        return frame_ref_signature(self.frame_ref(idx))
+
+    def read(self, idx: int):
+        raise NotImplementedError
+
+    def file_path(self, idx: int) -> Optional[str]:
+        return self.materialize([idx]).get(idx)
+
+    def materialize(self, indices: Iterable[int]) -> dict[int, str]:
+        raise NotImplementedError
+
+
+class DirectoryFrameSource(FrameSource):
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        names = _list_frames(self.directory)
+        is_sparse = (self.directory / SPARSE_MARKER).is_file()
+        if is_sparse:
+            frame_numbers = [_frame_number(name, i) for i, name in enumerate(names)]
+        else:
+            frame_numbers = list(range(len(names)))
+        self._init_frames(names, frame_numbers, is_sparse)
+
+    def frame_ref(self, idx: int) -> str:
+        return str(self.directory / self.names[idx])
+
+    def file_path(self, idx: int) -> Optional[str]:
+        if not (0 <= idx < len(self.names)):
+            return None
+        return self.frame_ref(idx)
+
+    def read(self, idx: int):
+        path = self.file_path(idx)
+        return cv2.imread(path) if path else None
+
+    def materialize(self, indices: Iterable[int]) -> dict[int, str]:
+        return {idx: self.file_path(idx) for idx in indices if 0 <= idx < len(self.names)}
+
+
+class StoreFrameSource(FrameSource):
+    # Frames packed into one memory-mapped .mfs file (see frame_store.py).
+    # materialize() unpacks the encoded bytes as-is into materialized_dir.
+
+    def __init__(self, store_path, directory):
+        self.store_path = Path(store_path)
+        self.directory = Path(directory)
+        self.materialized_dir = materialized_dir_for(directory)
+        self.store = FrameStore(self.store_path)
+        names = [self.store.frame_name(i) for i in range(len(self.store))]
+        self._init_frames(names, list(self.store.frame_numbers), self.store.is_sparse)
+
+    def exists(self) -> bool:
+        return True
+
+    def frame_ref(self, idx: int) -> StoreRef:
+        return StoreRef(str(self.store_path), self.frame_numbers[idx], self.names[idx])
+
+    def read(self, idx: int):
+        if not (0 <= idx < len(self.names)):
+            return None
+        return self.store.read(idx)
+
+    def materialize(self, indices: Iterable[int]) -> dict[int, str]:
+        paths = {}
+        store_mtime = self.store_path.stat().st_mtime
+        for idx in indices:
+            if not (0 <= idx < len(self.names)):
+                continue
+            path = self.materialized_dir / self.names[idx]
+            # Rewrite copies left over from an older store
+            if not path.exists() or path.stat().st_mtime < store_mtime:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(self.store.read_bytes(idx))
+            paths[idx] = str(path)
+        return paths
+
+
+class ContourFrameSource(FrameSource):
+    # Composites label contours over the davis (or raw) frames on demand.
+    # Rendered frames live in a small LRU cache; files under
+    # visualization/contour are only written through materialize().
+
+    def __init__(self, base: FrameSource, mask_dir, contour_dir, thickness: int = None,
+                 jpeg_quality: int = None, cache_size: int = 64, color_mode: str = None):
+        from video_preprocess.contour_manifest import stored_render_params
+        from video_preprocess.frame_pipeline import DEFAULT_JPEG_QUALITY
+
+        self.base = base
+        self.directory = base.directory
+        self._init_frames(base.names, base.frame_numbers, base.is_sparse)
+        self.mask_dir = Path(mask_dir)
+        self.contour_dir = Path(contour_dir)
+        # Unset options follow the last batch render, so frames drawn here match
+        # it and its outputs stay valid in the contour manifest
+        stored = stored_render_params(self.contour_dir) if None in (thickness, jpeg_quality, color_mode) else {}
+        self.thickness = stored.get("thickness", 1) if thickness is None else thickness
+        self.color_mode = stored.get("color_mode", "white") if color_mode is None else color_mode
+        self.jpeg_quality = stored.get("jpeg_quality", DEFAULT_JPEG_QUALITY) if jpeg_quality is None else jpeg_quality
+        self.cache_size = max(1, int(cache_size))
+        self._cache: OrderedDict[int, object] = OrderedDict()
+        self._boundary = None
+        self._owner = None
+
+    def exists(self) -> bool:
+        return self.base.exists()
+
+    def frame_ref(self, idx: int):
+        return self.base.frame_ref(idx)
+
+    def _mask_path(self, idx: int) -> str:
+        return str(self.mask_dir / (os.path.splitext(self.names[idx])[0] + ".png"))
+
+    def signature(self, idx: int) -> list:
+        mask_path = self._mask_path(idx)
+        mask_sig = frame_ref_signature(mask_path) if os.path.exists(mask_path) else []
+        return self.base.signature(idx) + mask_sig
+
+    def read(self, idx: int):
+        if not (0 <= idx < len(self.names)):
+            return None
+        frame = self._cache.get(idx)
+        if frame is not None:
+            self._cache.move_to_end(idx)
+            return frame.copy()
+
+        from video_preprocess.contour import draw_label_contour, load_label_mask
+
+        frame = self.base.read(idx)
+        if frame is None:
+            return None
+        mask_path = self._mask_path(idx)
+        mask = load_label_mask(mask_path) if os.path.exists(mask_path) else None
+        if mask is not None and mask.shape[:2] == frame.shape[:2]:
+            if self._boundary is None or self._boundary.shape != mask.shape:
+                self._boundary = np.zeros(mask.shape, dtype=bool)
+                self._owner = np.empty(mask.shape, dtype=mask.dtype)
+            draw_label_contour(frame, mask, self.thickness, boundary=self._boundary,
+                               color_mode=self.color_mode, owner=self._owner)
+
+        self._cache[idx] = frame
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return frame.copy()
+
+    def materialize(self, indices: Iterable[int]) -> dict[int, str]:
+        from video_preprocess.contour import render_contour_chunk
+        from video_preprocess.contour_manifest import ContourManifest, render_params
+
+        indices = [idx for idx in indices if 0 <= idx < len(self.names)]
+        with_mask = [idx for idx in indices if os.path.exists(self._mask_path(idx))]
+        pairs = [(self.base.frame_ref(idx), self._mask_path(idx)) for idx in with_mask]
+
+        manifest = ContourManifest(self.contour_dir, render_params(self.thickness, self.jpeg_quality, self.color_mode))
+        stale = manifest.stale_pairs(pairs, prune=False)
+        if stale:
+            render_contour_chunk(self.contour_dir.parent.parent.name, stale, str(self.contour_dir),
+                                 self.thickness, self.jpeg_quality, color_mode=self.color_mode)
+            manifest.mark_done(stale)
+        manifest.save()
+
+        # Frames without a mask have nothing to draw; hand out the base frame
+        masked = set(with_mask)
+        paths = self.base.materialize(idx for idx in indices if idx not in masked)
+        for idx, (ref, _) in zip(with_mask, pairs):
+            paths[idx] = str(self.contour_dir / (os.path.splitext(frame_ref_name(ref))[0] + ".jpg"))
+        return paths
+
+
+def open_frame_source(project_dir, video_name: str, mode: str, **kwargs) -> FrameSource:
+    if mode != "contour":
+        return _open_plain_source(frame_mode_dir(project_dir, video_name, mode))
+
+    mask_dir = Path(project_dir) / "frames" / video_name / "masks"
+    if not _has_frames(mask_dir, ".png"):
+        # No segmentation to draw from; fall back to whatever was exported before
+        return _open_plain_source(frame_mode_dir(project_dir, video_name, "contour"))
+    base = _open_plain_source(frame_mode_dir(project_dir, video_name, "davis"))
+    if not len(base):
+        base = _open_plain_source(frame_mode_dir(project_dir, video_name, "images"))
+    return ContourFrameSource(base, mask_dir, frame_mode_dir(project_dir, video_name, "contour"), **kwargs)
+
+
+def _open_plain_source(directory: Path) -> FrameSource:
+    # The packed store next to the folder wins unless loose frames were written
+    # after it (e.g. Cutie just rewrote the davis frames), so a conversion pays
+    # off whether or not the loose copies were kept.
+    store_path = store_path_for_dir(directory)
+    if store_path.is_file() and not _has_frames_newer_than(directory, store_path.stat().st_mtime_ns):
+        return StoreFrameSource(store_path, directory)
+    return DirectoryFrameSource(directory)
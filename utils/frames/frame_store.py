@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+# Layout: header | index (count x [frame_number, offset, length]) | encoded frames
+STORE_SUFFIX = ".mfs"
+STORE_MAGIC = b"MOVALFS1"
+STORE_VERSION = 1
+FLAG_SPARSE = 1
+# Written into loose frame folders that only hold some frames of their video
+SPARSE_MARKER = ".sparse.json"
+_HEADER = struct.Struct("<8sIIQ8s")  # magic, version, flags, count, image extension
+INDEX_DTYPE = np.dtype([("frame", "<u8"), ("offset", "<u8"), ("length", "<u8")])
+
+
+class StoreRef(NamedTuple):
+    # Points at one frame inside a store; used where loose file paths used to go
+    store_path: str
+    frame_number: int
+    name: str
+
+
+class FrameStore:
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise IOError(f"Empty frame store: {self.path}")
+
+        magic, version, flags, count, ext = _HEADER.unpack_from(self._mm, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            self.close()
+            raise IOError(f"Not a frame store: {self.path}")
+        self.is_sparse = bool(flags & FLAG_SPARSE)
+        self.ext = ext.rstrip(b"\0").decode("ascii") or ".jpg"
+        self.index = np.frombuffer(self._mm, dtype=INDEX_DTYPE, count=count, offset=_HEADER.size)
+        self.frame_numbers = [int(n) for n in self.index["frame"]]
+        self._position = {n: i for i, n in enumerate(self.frame_numbers)}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.index = None
+        if getattr(self, "_mm", None) is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                # Arrays decoded from the map may still reference it; leave it to GC
+                pass
+            self._mm = None
+        self._file.close()
+
+    def position_of(self, frame_number: int) -> Optional[int]:
+        return self._position.get(frame_number)
+
+    def frame_name(self, pos: int) -> str:
+        return f"{self.frame_numbers[pos]:07d}{self.ext}"
+
+    def read_bytes(self, pos: int) -> memoryview:
+        entry = self.index[pos]
+        offset, length = int(entry["offset"]), int(entry["length"])
+        return memoryview(self._mm)[offset:offset + length]
+
+    def read(self, pos: int, flags: int = cv2.IMREAD_COLOR):
+        return cv2.imdecode(np.frombuffer(self.read_bytes(pos), dtype=np.uint8), flags)
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[tuple[int, np.ndarray]]:
+        stop = len(self) if stop is None else min(stop, len(self))
+        for pos in range(max(0, start), stop):
+            yield self.frame_numbers[pos], self.read(pos)
+
+
+def write_frame_store(path, frames: Iterable[tuple[int, bytes]], count: int,
+                      ext: str = ".jpg", sparse: bool = False) -> int:
+    # frames yields (frame_number, encoded bytes); count must be known so the
+    # index can sit in front of the data.
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    index = np.zeros(count, dtype=INDEX_DTYPE)
+    data_start = _HEADER.size + index.nbytes
+
+    written = 0
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * data_start)
+        offset = data_start
+        for frame_number, data in frames:
+            if written >= count:
+                raise ValueError("More frames than announced")
+            f.write(data)
+            index[written] = (frame_number, offset, len(data))
+            offset += len(data)
+            written += 1
+
+        header = _HEADER.pack(STORE_MAGIC, STORE_VERSION, FLAG_SPARSE if sparse else 0,
+                              written, ext.encode("ascii")[:8])
+        f.seek(0)
+        f.write(header)
+        f.write(index[:written].tobytes())
+    os.replace(tmp_path, path)
+    return written
+
+
+def convert_frame_dir(frame_dir, store_path=None, remove_loose: bool = False, progress_callback=None) -> Optional[Path]:
+    # Packs an existing frames/<video>/<mode> folder into <mode>.mfs next to it
+    from .frame_source import DirectoryFrameSource
+
+    source = DirectoryFrameSource(frame_dir)
+    if not len(source):
+        return None
+    store_path = Path(store_path) if store_path else store_path_for_dir(frame_dir)
+    ext = os.path.splitext(source.names[0])[1].lower()
+
+    def _frames():
+        for pos, name in enumerate(source.names):
+            with open(source.directory / name, "rb") as f:
+                data = f.read()
+            if progress_callback:
+                progress_callback(pos + 1, len(source))
+            yield source.frame_numbers[pos], data
+
+    write_frame_store(store_path, _frames(), len(source), ext=ext, sparse=source.is_sparse)
+    if remove_loose:
+        for name in source.names:
+            os.remove(source.directory / name)
+    return store_path
+
+
+def store_path_for_dir(frame_dir) -> Path:
+    frame_dir = Path(frame_dir)
+    return frame_dir.with_name(frame_dir.name + STORE_SUFFIX)
+
+
+_open_stores: dict[str, FrameStore] = {}
+
+
+def open_cached_store(path) -> FrameStore:
+    # Worker processes read many frames from the same few stores; keep them mapped
+    key = os.path.abspath(str(path))
+    store = _open_stores.get(key)
+    if store is None:
+        store = _open_stores[key] = FrameStore(key)
+    return store
+
+
+def read_frame(ref, flags: int = cv2.IMREAD_COLOR):
+    # Accepts a loose file path or a StoreRef
+    if isinstance(ref, StoreRef):
+        store = open_cached_store(ref.store_path)
+        pos = store.position_of(ref.frame_number)
+        return store.read(pos, flags) if pos is not None else None
+    return cv2.imread(str(ref), flags)
+
+
+def frame_ref_name(ref) -> str:
+    return ref.name if isinstance(ref, StoreRef) else os.path.basename(str(ref))
+
+
+def frame_ref_signature(ref) -> list:
+    if isinstance(ref, StoreRef):
+        st = os.stat(ref.store_path)
+        return [st.st_size, st.st_mtime_ns, ref.frame_number]
+    st = os.stat(ref)
+    return [st.st_size, st.st_mtime_ns]
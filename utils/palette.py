@@ -0,0 +1,18 @@
+import numpy as np
+
+CUTIE_COLOR_BASE = ["#ab1f24", "#36ae37", "#b9b917", "#063391", "#983a91",
+                    "#20b6b5", "#c1c0bf", "#5c0d11", "#e71f19", "#60b630",
+                    "#f4ba19", "#503390", "#ca4392", "#5eb7b7", "#f6bcbc"]
+
+def hex_to_bgr(hex_color: str) -> tuple[int, int, int]:
+    hex_color = hex_color.lstrip("#")
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+    return b, g, r
+
+def cutie_bgr_lut(size: int = 256) -> np.ndarray:
+    # Object id k (k >= 1) is track k-1 in Labelary, so it gets the same colour
+    lut = np.zeros((size, 3), dtype=np.uint8)
+    base = [hex_to_bgr(c) for c in CUTIE_COLOR_BASE]
+    for obj_id in range(1, size):
+        lut[obj_id] = base[(obj_id - 1) % len(base)]
+    return lut
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# One structured file per inference run/video instead of one txt per frame.
+# Arrays (N = detections, K = keypoints):
+#   frame  (N,)      frame number, same value the per-frame txt name carries
+#   cls    (N,)      class id (the "track_<cls>" of txt results)
+#   track  (N,)      tracker id, -1 when tracking was off
+#   box    (N, 4)    normalized xywh
+#   kpts   (N, K, 3) normalized x, y and keypoint confidence
+PREDICTIONS_FILE = "predictions.npz"
+
+
+class PredictionWriter:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._chunks: list[tuple] = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, frame_number: int, cls_ids, boxes, kpts, track_ids=None):
+        n = len(cls_ids)
+        if n == 0:
+            return
+        track = np.full(n, -1, dtype=np.int32) if track_ids is None else np.asarray(track_ids, dtype=np.int32)
+        self._chunks.append((
+            np.full(n, frame_number, dtype=np.int64),
+            np.asarray(cls_ids, dtype=np.int32),
+            track,
+            np.asarray(boxes, dtype=np.float32).reshape(n, 4),
+            np.asarray(kpts, dtype=np.float32).reshape(n, -1, 3),
+        ))
+        self._count += n
+
+    def close(self) -> Optional[Path]:
+        if not self._chunks:
+            return None
+        frame, cls, track, box, kpts = (np.concatenate(parts) for parts in zip(*self._chunks))
+        self._chunks = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.stem + ".tmp.npz")
+        np.savez(tmp_path, frame=frame, cls=cls, track=track, box=box, kpts=kpts)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+
+def frame_number_from_key(key: str) -> int:
+    # "0000012" (frame folders) or "<video>_13" (video files): the txt stem / engine key
+    return int(key.rsplit("_", 1)[-1])
+
+
+def find_predictions(path) -> Optional[Path]:
+    # Accepts the npz itself, a predict__* run folder or its labels/ folder
+    path = Path(path)
+    if path.is_file():
+        return path if path.suffix == ".npz" else None
+    for candidate in (path / PREDICTIONS_FILE, path.parent / PREDICTIONS_FILE):
+        if candidate.is_file() and (candidate.parent == path or path.name.lower() == "labels"):
+            return candidate
+    return None
+
+
+def load_predictions(path) -> dict[str, np.ndarray]:
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in ("frame", "cls", "track", "box", "kpts")}
+
+
+def parse_txt_results(paths, expected_cols: int) -> tuple[dict[str, np.ndarray], list[str]]:
+    # Per-frame YOLO pose txt files ("cls cx cy w h x y v ...", frame number at
+    # the end of the file name) -> the same arrays load_predictions returns.
+    # Runs in worker processes, so it sticks to numpy.
+    frames, rows, skipped = [], [], []
+    for path in map(Path, paths):
+        try:
+            frame_number = frame_number_from_key(path.stem)
+            values = np.array(path.read_bytes().split(), dtype=np.float32)
+        except (OSError, ValueError) as e:
+            skipped.append(f"{path.name} → skip ({e})")
+            continue
+        if values.size % expected_cols:
+            skipped.append(f"{path.name} → skip (rows are not {expected_cols} values)")
+            continue
+        block = values.reshape(-1, expected_cols)
+        frames.append(np.full(len(block), frame_number, dtype=np.int64))
+        rows.append(block)
+
+    table = np.concatenate(rows) if rows else np.zeros((0, expected_cols), dtype=np.float32)
+    data = {
+        "frame": np.concatenate(frames) if frames else np.zeros(0, dtype=np.int64),
+        "cls": table[:, 0].astype(np.int32),
+        "track": np.full(len(table), -1, dtype=np.int32),
+        "box": table[:, 1:5],
+        "kpts": table[:, 5:].reshape(len(table), -1, 3),
+    }
+    return data, skipped
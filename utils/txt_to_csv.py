@@ -8,14 +8,14 @@ import os
 import pandas as pd
 import yaml
 import numpy as np
-import re
+from .predictions import PREDICTIONS_FILE, find_predictions, frame_number_from_key, load_predictions
 
 def extract_frame_number(filename):
-    match = re.search(r'_(\d+)\.txt$', filename)
-    if match:
-        return int(match.group(1))
-    match = re.search(r'(\d+)\.txt$', filename)
-    return int(match.group(1)) if match else -1
+    # Same numbering the engine stores in predictions.npz, so TXT and npz runs give the same CSV
+    try:
+        return frame_number_from_key(os.path.splitext(filename)[0])
+    except ValueError:
+        return -1
 
 class TxtToCsvDialog(QDialog):
     def __init__(self, parent=None):
@@ -93,7 +93,17 @@ class TxtToCsvDialog(QDialog):
             return
 
         self.video_to_txts = {}
+        self.video_to_npz = {}
         for folder in self.txt_folders:
+            # Columnar results (predictions.npz) replace the per-frame txt files of a run
+            npz_path = find_predictions(folder)
+            if npz_path is not None:
+                self.video_to_npz[npz_path.parent.name] = str(npz_path)
+                continue
+            for root, dirs, files in os.walk(folder):
+                if PREDICTIONS_FILE in files:
+                    self.video_to_npz[os.path.basename(root)] = os.path.join(root, PREDICTIONS_FILE)
+
             collected_any = False
             if os.path.basename(folder).lower() == 'labels':
                 video_name = os.path.basename(os.path.dirname(folder))
@@ -126,7 +136,7 @@ class TxtToCsvDialog(QDialog):
         for k, v in list(self.video_to_txts.items()):
             self.video_to_txts[k] = list(set(v))
 
-        video_names = set(self.video_to_txts.keys())
+        video_names = set(self.video_to_txts.keys()) | set(self.video_to_npz.keys())
 
         for i in reversed(range(self.inner_layout.count())):
             item = self.inner_layout.itemAt(i)
@@ -161,6 +171,62 @@ class TxtToCsvDialog(QDialog):
 
         print("Loaded Video Names:", video_names)
 
+    def _collect_detections(self, video_name):
+        # -> ([(frame_num, [(track_id, instance_id or "", kpt_data)])], has_instance_id)
+        npz_path = self.video_to_npz.get(video_name)
+        if npz_path is not None:
+            data = load_predictions(npz_path)
+            has_instance_id = bool((data["track"] >= 0).any())
+            kpt_rows = data["kpts"].reshape(len(data["kpts"]), -1).tolist()
+            frames = []
+            for i in np.argsort(data["frame"], kind="stable"):
+                frame_num = int(data["frame"][i])
+                if not frames or frames[-1][0] != frame_num:
+                    frames.append((frame_num, []))
+                track = int(data["track"][i])
+                instance_id = track if has_instance_id and track >= 0 else ""
+                frames[-1][1].append((int(data["cls"][i]), instance_id, kpt_rows[i]))
+            return frames, has_instance_id
+
+        all_txts = []
+        for txt_path in self.video_to_txts.get(video_name, []):
+            frame_num = extract_frame_number(os.path.basename(txt_path))
+            if frame_num < 0:
+                print(f"{os.path.basename(txt_path)} → skip (no frame number in name)")
+                continue
+            all_txts.append((frame_num, txt_path))
+        all_txts.sort(key=lambda item: item[0])
+        frames = []
+        has_instance_id = False
+        for frame_num, txt_path in all_txts:
+            with open(txt_path, "r") as f:
+                lines = f.readlines()
+
+            detections = []
+            for line in lines:
+                items = line.strip().split()
+                if len(items) < 6:
+                    continue
+                track_id = int(items[0])
+                raw = items[5:]
+
+                if len(raw) % 3 == 1:
+                    try:
+                        instance_id = int(raw[-1])
+                        kpt_data = list(map(float, raw[:-1]))
+                        has_instance_id = True
+                    except:
+                        continue
+                else:
+                    instance_id = None
+                    kpt_data = list(map(float, raw))
+
+                remapped_id = instance_id if instance_id is not None else ""
+                detections.append((track_id, remapped_id, kpt_data))
+
+            frames.append((frame_num, detections))
+        return frames, has_instance_id
+
     def convert_csv_normalized(self):
         if not hasattr(self, 'txt_folders') or not self.txt_folders:
             QMessageBox.warning(self, "Error", "Load TXT folders first.")
@@ -175,41 +241,10 @@ class TxtToCsvDialog(QDialog):
             return
 
         for video_name in self.video_widget_map:
-            all_txts = sorted(self.video_to_txts.get(video_name, []), key=lambda x: extract_frame_number(os.path.basename(x)))
+            frames, has_instance_id = self._collect_detections(video_name)
 
             rows = []
-            has_instance_id = False
-            for idx, txt_path in enumerate(all_txts):
-                with open(txt_path, "r") as f:
-                    lines = f.readlines()
-                    
-                detections = []
-                for line in lines:
-                    items = line.strip().split()
-                    if len(items) < 6:
-                        continue
-                    track_id = int(items[0])
-                    raw = items[5:]
-
-                    if len(raw) % 3 == 1:
-                        try:
-                            instance_id = int(raw[-1])
-                            kpt_data = list(map(float, raw[:-1]))
-                            has_instance_id = True
-                        except:
-                            continue
-                    else:
-                        instance_id = None
-                        kpt_data = list(map(float, raw))
-
-                    remapped_id = instance_id if instance_id is not None else ""
-                    detections.append((track_id, remapped_id, kpt_data))
-
-                # Use actual frame number from filename instead of sequential index
-                frame_num = extract_frame_number(os.path.basename(txt_path))
-                if frame_num < 0:
-                    frame_num = idx + 1
-
+            for frame_num, detections in frames:
                 # Merge duplicates by (track_id, instance_id) using per-kpt max confidence
                 track_data = {}
                 for track_id, remapped_id, kpt_data in detections:
@@ -267,41 +302,10 @@ class TxtToCsvDialog(QDialog):
                 return
             width, height = int(width), int(height)
 
-            all_txts = sorted(self.video_to_txts.get(video_name, []), key=lambda x: extract_frame_number(os.path.basename(x)))
+            frames, has_instance_id = self._collect_detections(video_name)
 
             rows = []
-            has_instance_id = False
-
-            for idx, txt_path in enumerate(all_txts):
-                with open(txt_path, "r") as f:
-                    lines = f.readlines()
-
-                detections = []  # list of tuples: (track_id, remapped_id, kpt_data)
-                for line in lines:
-                    items = line.strip().split()
-                    if len(items) < 6:
-                        continue
-                    track_id = int(items[0])
-                    raw = items[5:]
-
-                    if len(raw) % 3 == 1:
-                        try:
-                            instance_id = int(raw[-1])
-                            kpt_data = list(map(float, raw[:-1]))
-                            has_instance_id = True
-                        except:
-                            continue
-                    else:
-                        instance_id = None
-                        kpt_data = list(map(float, raw))
-
-                    remapped_id = instance_id if instance_id is not None else ""
-                    detections.append((track_id, remapped_id, kpt_data))
-                # Use actual frame number from filename instead of sequential index
-                frame_num = extract_frame_number(os.path.basename(txt_path))
-                if frame_num < 0:
-                    frame_num = idx + 1
-
+            for frame_num, detections in frames:
                 # Merge duplicates by (track_id, instance_id) using per-kpt max confidence
                 track_data = {}
                 for track_id, remapped_id, kpt_data in detections:
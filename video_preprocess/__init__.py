@@ -1,5 +1,12 @@
-from .gui import PreprocessDialog
-
 __all__ = [
     "PreprocessDialog",
 ]
+
+
+def __getattr__(name):
+    # The dialog pulls in PyQt; load it on first use so the contour/extract
+    # helpers stay importable in worker processes and tests
+    if name == "PreprocessDialog":
+        from .gui import PreprocessDialog
+        return PreprocessDialog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,42 +1,123 @@
 import os
 import cv2
 import numpy as np
+from .frame_pipeline import DEFAULT_JPEG_QUALITY, run_frame_pipeline, write_image
+from utils.palette import cutie_bgr_lut
+from utils.frames.frame_store import frame_ref_name, read_frame
 
-def ContouredVideoProduction(
-    output_video_name: str,
-    segmented_frames: list,
-    masks: list,
-    fps: int = 30,
-    output_dir: str = None,
-    progress_callback=None
-):
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
 
-    low_threshold = 1
-    high_threshold = 256
+CONTOUR_COLOR = (255, 255, 255)
+CONTOUR_COLOR_MODES = ("white", "identity")
+IDENTITY_LUT = cutie_bgr_lut()
 
+def load_label_mask(mask_path: str):
+    # Cutie writes palette PNGs whose indices are the object ids. OpenCV expands
+    # the palette, so read the raw indices through PIL when it is available.
+    if Image is not None:
+        with Image.open(mask_path) as img:
+            if img.mode in ("P", "L"):
+                return np.asarray(img, dtype=np.uint8)
+    return cv2.imread(mask_path, cv2.IMREAD_GRAYSCALE)
+
+def label_boundary(labels: np.ndarray, thickness: int = 1, out: np.ndarray = None,
+                   owner: np.ndarray = None) -> np.ndarray:
+    thickness = max(1, int(thickness))
+    before = thickness // 2
+    after = thickness - before
+
+    if out is None:
+        out = np.zeros(labels.shape, dtype=bool)
+    else:
+        out[...] = False
+    if owner is not None:
+        np.copyto(owner, labels)
+
+    # A pixel lies on a boundary when a neighbour within `thickness` along an axis
+    # carries a different label. Slices are views, so only the bool mask is allocated.
+    # When `owner` is given it also collects the largest neighbouring id in the same pass.
+    def _mark(dst, src):
+        np.logical_or(out[dst], labels[dst] != labels[src], out=out[dst])
+        if owner is not None:
+            np.maximum(owner[dst], labels[src], out=owner[dst])
+
+    for offset in range(1, after + 1):
+        _mark(np.s_[:, offset:], np.s_[:, :-offset])
+        _mark(np.s_[offset:, :], np.s_[:-offset, :])
+    for offset in range(1, before + 1):
+        _mark(np.s_[:, :-offset], np.s_[:, offset:])
+        _mark(np.s_[:-offset, :], np.s_[offset:, :])
+    return out
+
+def draw_label_contour(frame: np.ndarray, labels: np.ndarray, thickness: int = 1,
+                       color=CONTOUR_COLOR, boundary: np.ndarray = None,
+                       color_mode: str = "white", owner: np.ndarray = None) -> np.ndarray:
+    if frame.shape[:2] != labels.shape[:2]:
+        raise ValueError(f"frame {frame.shape[:2]} and mask {labels.shape[:2]} sizes differ")
+    if color_mode == "white":
+        boundary = label_boundary(labels, thickness, out=boundary)
+        frame[boundary] = color
+        return frame
+    if color_mode != "identity":
+        raise ValueError(f"Unsupported contour colour mode: {color_mode}")
+
+    if owner is None or owner.shape != labels.shape or owner.dtype != labels.dtype:
+        owner = np.empty_like(labels)
+    boundary = label_boundary(labels, thickness, out=boundary, owner=owner)
+    # Object pixels keep their own id; background pixels take the adjacent object's
+    ids = np.where(labels != 0, labels, owner)[boundary]
+    frame[boundary] = IDENTITY_LUT[ids % len(IDENTITY_LUT)]
+    return frame
+
+def init_contour_process():
+    # Each pool process runs single-threaded so N processes ≈ N cores total
+    for env_key in (
+        "OMP_NUM_THREADS",
+        "OPENBLAS_NUM_THREADS",
+        "MKL_NUM_THREADS",
+        "NUMEXPR_NUM_THREADS",
+        "VECLIB_MAXIMUM_THREADS",
+        "BLIS_NUM_THREADS",
+    ):
+        os.environ[env_key] = os.environ.get(env_key, "1") or "1"
+    try:
+        cv2.setNumThreads(1)
+        cv2.ocl.setUseOpenCL(False)
+    except Exception:
+        pass
+
+def render_contour_chunk(video_name: str, pairs: list, output_dir: str, thickness: int = 1,
+                         jpeg_quality: int = DEFAULT_JPEG_QUALITY, io_workers: int = 2, prefetch: int = 8,
+                         color_mode: str = "white"):
     os.makedirs(output_dir, exist_ok=True)
+    boundary = {}
+    owner = {}
+
+    def _read(pair):
+        # seg_ref is a loose file path or a StoreRef into a packed frame store
+        seg_ref, mask_path = pair
+        original_image = read_frame(seg_ref)
+        mask = load_label_mask(mask_path)
+        if original_image is None or mask is None:
+            raise FileNotFoundError(f"Unable to read {frame_ref_name(seg_ref) if original_image is None else mask_path}")
+        return original_image, mask
+
+    def _compute(pair, loaded):
+        original_image, mask = loaded
+        buf = boundary.get(mask.shape)
+        if buf is None:
+            buf = boundary[mask.shape] = np.zeros(mask.shape, dtype=bool)
+            owner[mask.shape] = np.empty(mask.shape, dtype=mask.dtype)
+        return draw_label_contour(original_image, mask, thickness, boundary=buf,
+                                  color_mode=color_mode, owner=owner[mask.shape])
+
+    def _write(pair, contoured_image):
+        base_name = os.path.splitext(frame_ref_name(pair[0]))[0]
+        return write_image(contoured_image, os.path.join(output_dir, f"{base_name}.jpg"), jpeg_quality)
 
-    for i in range(len(segmented_frames)):
-        try:
-            original_image = cv2.imread(segmented_frames[i])
-            mask = cv2.imread(masks[i])
-
-            edges = cv2.Canny(mask, low_threshold, high_threshold)
-            colored_edges = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
-            
-            contoured_image = np.where(colored_edges > 0, (255, 255, 255), original_image).astype(np.uint8)
-            base_name  = os.path.splitext(os.path.basename(segmented_frames[i]))[0]
-            """save_path  = os.path.join(output_dir,
-                                    f"{output_video_name}_{base_name[2:]}.jpg")"""
-            save_path = os.path.join(output_dir, f"{base_name}.jpg")
-
-            cv2.imwrite(save_path, contoured_image)
-            
-            if progress_callback:
-                progress_callback(i + 1)
-        except IndexError:
-            print(f"Unable to load appropriate frame information of {output_video_name}. Please check again whether the segmentation process has completed.")
-            return
-
-    print(f"{len(segmented_frames)} contour images are saved to "
-            f"'{output_dir}'")
\ No newline at end of file
+    count = run_frame_pipeline(pairs, _read, _compute, _write,
+                               read_workers=io_workers, write_workers=io_workers, prefetch=prefetch)
+    return video_name, count
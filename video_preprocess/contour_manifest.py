@@ -0,0 +1,110 @@
+import json
+import os
+import time
+
+from utils.frames.frame_store import frame_ref_name, frame_ref_signature
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+def _file_signature(path: str):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def render_params(thickness: int, jpeg_quality: int, color_mode: str = "white") -> dict:
+    return {"thickness": thickness, "jpeg_quality": jpeg_quality, "color_mode": color_mode}
+
+def stored_render_params(output_dir) -> dict:
+    # Settings the outputs in output_dir were last rendered with ({} if unknown)
+    try:
+        with open(os.path.join(str(output_dir), MANIFEST_NAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    params = data.get("params") if data.get("version") == MANIFEST_VERSION else None
+    return params if isinstance(params, dict) else {}
+
+def _output_name(pair) -> str:
+    return os.path.splitext(frame_ref_name(pair[0]))[0] + ".jpg"
+
+class ContourManifest:
+    # Records, per contour output, the size/mtime of the davis frame and mask it
+    # was rendered from, so reruns only touch frames whose inputs changed and an
+    # interrupted batch resumes from the last saved chunk.
+
+    def __init__(self, output_dir, params: dict = None, save_interval: float = 2.0):
+        self.output_dir = str(output_dir)
+        self.path = os.path.join(self.output_dir, MANIFEST_NAME)
+        self.params = dict(params or {})
+        self.save_interval = save_interval
+        self.frames: dict[str, list] = {}
+        self._pending: dict[str, list] = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != MANIFEST_VERSION or data.get("params") != self.params:
+            # Different render settings invalidate every previous output
+            return
+        frames = data.get("frames")
+        if isinstance(frames, dict):
+            self.frames = frames
+
+    def stale_pairs(self, pairs: list, prune: bool = True) -> list:
+        try:
+            existing = {entry.name for entry in os.scandir(self.output_dir) if entry.is_file()}
+        except FileNotFoundError:
+            existing = set()
+
+        stale = []
+        current = {} if prune else dict(self.frames)
+        self._pending = {}
+        for pair in pairs:
+            name = _output_name(pair)
+            try:
+                signature = frame_ref_signature(pair[0]) + _file_signature(pair[1])
+            except OSError:
+                stale.append(pair)
+                continue
+            if name in existing and self.frames.get(name) == signature:
+                current[name] = signature
+            else:
+                current.pop(name, None)
+                self._pending[name] = signature
+                stale.append(pair)
+
+        # Drop entries for frames that no longer exist or must be re-rendered
+        if current.keys() != self.frames.keys():
+            self._dirty = True
+        self.frames = current
+        return stale
+
+    def mark_done(self, pairs: list):
+        for pair in pairs:
+            name = _output_name(pair)
+            signature = self._pending.pop(name, None)
+            if signature is not None:
+                self.frames[name] = signature
+                self._dirty = True
+
+    def save_if_due(self):
+        if self._dirty and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        data = {"version": MANIFEST_VERSION, "params": self.params, "frames": self.frames}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        self._last_save = time.monotonic()
@@ -2,12 +2,14 @@ from PyQt6.QtWidgets import (
     QVBoxLayout, QPushButton,
     QTextEdit, QProgressBar, QLabel,
     QDialog, QLineEdit, QMessageBox, QSpinBox, QProgressBar,
-    QCheckBox, QDialogButtonBox, QHBoxLayout, QScrollArea, QWidget
+    QCheckBox, QDialogButtonBox, QHBoxLayout, QScrollArea, QWidget, QComboBox
 )
 from PyQt6.QtCore import Qt, QObject, pyqtSignal
 import os
 import glob
-from .thread import ContourWorker
+from .thread import ContourPoolWorker, default_pool_size
+from .frame_pipeline import DEFAULT_JPEG_QUALITY
+from .contour_manifest import ContourManifest, render_params
 from pathlib import Path
 from typing import Optional, List
 
@@ -41,6 +43,18 @@ class VideoMultiSelectDialog(QDialog):
         tools.addWidget(btn_all); tools.addWidget(btn_none); tools.addWidget(btn_inv)
         layout.addLayout(tools)
 
+        options = QHBoxLayout()
+        self.thickness_spin = QSpinBox(); self.thickness_spin.setRange(1, 15); self.thickness_spin.setValue(1)
+        self.quality_spin = QSpinBox(); self.quality_spin.setRange(10, 100); self.quality_spin.setValue(DEFAULT_JPEG_QUALITY)
+        options.addWidget(QLabel("Thickness")); options.addWidget(self.thickness_spin)
+        options.addWidget(QLabel("JPEG quality")); options.addWidget(self.quality_spin)
+        self.color_combo = QComboBox(); self.color_combo.addItems(["white", "identity"])
+        self.color_combo.setToolTip("identity: draw each object in its Labelary track colour")
+        options.addWidget(QLabel("Colour")); options.addWidget(self.color_combo)
+        self.force_check = QCheckBox("Rebuild all frames")
+        options.addWidget(self.force_check)
+        layout.addLayout(options)
+
         btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         layout.addWidget(btns)
 
@@ -53,23 +67,63 @@ class VideoMultiSelectDialog(QDialog):
     def selected_names(self) -> list[str]:
         return [cb.text() for cb in self._checks if cb.isChecked()]
 
+    def render_options(self) -> dict:
+        return {
+            "thickness": self.thickness_spin.value(),
+            "jpeg_quality": self.quality_spin.value(),
+            "force": self.force_check.isChecked(),
+            "color_mode": self.color_combo.currentText(),
+        }
+
 class BatchContourProcessor(QObject):
     all_done   = pyqtSignal()       
     any_error  = pyqtSignal(str) 
     progress   = pyqtSignal(int,int) 
+    frame_progress = pyqtSignal(str, int, int)
 
-    def __init__(self, parent, current_project, max_threads: int = 4, include_only: Optional[List[str]] = None):
+    def __init__(self, parent, current_project, max_workers: Optional[int] = None,
+                 include_only: Optional[List[str]] = None, chunk_size: int = 32, thickness: int = 1,
+                 jpeg_quality: int = DEFAULT_JPEG_QUALITY, io_workers: int = 2, force: bool = False,
+                 color_mode: str = "white"):
         super().__init__(parent)
         self.parent = parent
 
         self.current_project = current_project
-        self._max_parallel   = max_threads
+        self._max_workers    = max_workers or default_pool_size()
         self._include_only   = set(include_only) if include_only else None
+        self._chunk_size     = chunk_size
+        self._thickness      = thickness
+        self._jpeg_quality   = jpeg_quality
+        self._io_workers     = io_workers
+        self._force          = force
+        self._color_mode     = color_mode
 
         self._total  = 0
         self._done   = 0
-        self._active: list[ContourWorker] = []
-        self._pending: list[Path] = []
+        self._frames_total: dict[str, int] = {}
+        self._frames_done: dict[str, int] = {}
+        self._worker: Optional[ContourPoolWorker] = None
+        self._errors = 0
+        self.any_error.connect(self._count_error)
+
+    def _count_error(self, _msg: str):
+        self._errors += 1
+
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def start_as_job(self, done):
+        # Adapter for JobManager.submit_task: reports through done(ok, error)
+        self.all_done.connect(lambda: done(self._errors == 0, f"{self._errors} video(s) failed"))
+        self.start()
+        if not self.is_running():
+            # start() returned early; all_done may not have fired
+            done(self._errors == 0, f"{self._errors} video(s) failed")
+        return self
 
     def start(self):
         base = Path(self.current_project.project_dir) / "frames"
@@ -82,67 +136,103 @@ class BatchContourProcessor(QObject):
             name_set = self._include_only
             workspaces = [p for p in workspaces if p.name in name_set]
         if not workspaces:
-            self.any_error.emit(f"No workspace folders in:\n{base}")
             msg = f"No workspace folders in:\n{base}" if self._include_only is None \
                   else "No selected videos to process."
             self.any_error.emit(msg)
             return
 
-        print(f"[Batch] Starting contour for {len(workspaces)} videos with max {self._max_parallel} threads.")
-
         self._total = len(workspaces)
-        #self.progress.emit(0, self._total)
+        self._done = 0
+
+        jobs = {}
+        manifests = {}
+        for ws in workspaces:
+            try:
+                pairs, output_dir = self._collect_pairs(ws)
+                manifest = ContourManifest(output_dir, self._render_params())
+                if self._force:
+                    manifest.frames = {}
+                stale = manifest.stale_pairs(pairs)
+            except Exception as e:
+                self.any_error.emit(f"{ws.name}: {e}")
+                self._done += 1
+                self.progress.emit(self._done, self._total)
+                continue
+
+            if not stale:
+                print(f"[Contour] {ws.name} up to date ({len(pairs)} frames)")
+                manifest.save()
+                self._done += 1
+                self.progress.emit(self._done, self._total)
+                continue
+            if len(stale) < len(pairs):
+                print(f"[Contour] {ws.name}: {len(stale)}/{len(pairs)} frames changed")
+            jobs[ws.name] = (stale, output_dir)
+            manifests[ws.name] = manifest
+
+        if not jobs:
+            self.all_done.emit()
+            return
 
-        self._pending = workspaces.copy()
-        self._active = []
-        self._fill_slots()
+        print(f"[Batch] Starting contour for {len(jobs)} videos on {self._max_workers} processes.")
+
+        self._frames_total = {name: len(pairs) for name, (pairs, _) in jobs.items()}
+        self._frames_done = {name: 0 for name in jobs}
+
+        self._worker = ContourPoolWorker(jobs, max_workers=self._max_workers,
+                                         chunk_size=self._chunk_size, thickness=self._thickness,
+                                         jpeg_quality=self._jpeg_quality, io_workers=self._io_workers,
+                                         manifests=manifests, color_mode=self._color_mode)
+        self._worker.chunk_done.connect(self._on_chunk_done)
+        self._worker.video_done.connect(self._on_video_done)
+        self._worker.video_error.connect(self._on_video_error)
+        self._worker.finished.connect(self._on_worker_finished)
+        self._worker.start()
+
+    def _render_params(self) -> dict:
+        return render_params(self._thickness, self._jpeg_quality, self._color_mode)
+
+    def _collect_pairs(self, workspace_path: Path):
+        from utils.frames import open_frame_source
 
-    def _launch_worker(self, workspace_path: Path) -> ContourWorker:
         video_name  = workspace_path.name
         masks_path  = workspace_path / "masks"
-        seg_path    = workspace_path / "visualization" / "davis"
         output_dir  = workspace_path / "visualization" / "contour"
 
-        masks      = sorted(str(p) for p in masks_path.glob("*.png"))
-        seg_frames = sorted(str(p) for p in seg_path.glob("*.jpg"))
+        # davis frames may be loose files or a packed frame store
+        seg_source = open_frame_source(workspace_path.parent.parent, video_name, "davis")
+        masks      = {p.stem: str(p) for p in masks_path.glob("*.png")}
 
-        if not masks or not seg_frames:
+        if not masks or not len(seg_source):
             raise FileNotFoundError("No masks or segmented frames found.")
 
-        if len(masks) != len(seg_frames):
-            print(f"{video_name}: #masks ≠ #frames ({len(masks)} vs {len(seg_frames)})\nCheck files if necessary.")
-
-        worker = ContourWorker(video_name, seg_frames, masks, str(output_dir))
+        if len(masks) != len(seg_source):
+            print(f"{video_name}: #masks ≠ #frames ({len(masks)} vs {len(seg_source)})\nCheck files if necessary.")
 
-        def _done_callback(vn, w=worker):
-            if w in self._active:
-                self._active.remove(w)
-            self._on_worker_done(vn)
+        pairs = []
+        for idx, name in enumerate(seg_source.names):
+            mask = masks.get(os.path.splitext(name)[0])
+            if mask is not None:
+                pairs.append((seg_source.frame_ref(idx), mask))
+        return pairs, output_dir
 
-        worker.finished.connect(lambda vn=video_name: _done_callback(vn))
-        worker.finished.connect(worker.deleteLater)
-        return worker
+    def _on_chunk_done(self, video_name: str, n_frames: int):
+        self._frames_done[video_name] = self._frames_done.get(video_name, 0) + n_frames
+        self.frame_progress.emit(video_name, self._frames_done[video_name], self._frames_total.get(video_name, 0))
 
-    def _on_worker_done(self, video_name: str):
+    def _on_video_done(self, video_name: str):
+        print(f"[Contour] {video_name} done")
         self._done += 1
-        try:
-            print(f"[Contour] {video_name} done")
-        except Exception:
-            pass
+        self.progress.emit(self._done, self._total)
 
+    def _on_video_error(self, video_name: str, message: str):
+        self.any_error.emit(f"{video_name}: {message}")
+        self._done += 1
         self.progress.emit(self._done, self._total)
-        self._fill_slots()
-        if self._done == self._total and not self._pending and not self._active:
-            self.all_done.emit()
 
-    def _fill_slots(self):
-        while self._pending and len(self._active) < self._max_parallel:
-            ws = self._pending.pop(0)
-            try:
-                worker = self._launch_worker(ws)
-                self._active.append(worker)
-                worker.start()
-            except Exception as e:
-                self.any_error.emit(f"{ws.name}: {e}")
-                self._done += 1
-                self.progress.emit(self._done, self._total)
\ No newline at end of file
+    def _on_worker_finished(self):
+        if self._worker is not None:
+            self._worker.wait()
+            self._worker.deleteLater()
+            self._worker = None
+        self.all_done.emit()
@@ -0,0 +1,171 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from utils.frames.frame_store import SPARSE_MARKER
+from .frame_pipeline import DEFAULT_JPEG_QUALITY, write_image
+
+IMAGE_FORMATS = ("jpg", "png")
+PROGRESS_EVERY = 50
+# Gaps longer than this (in frames) are crossed with a seek instead of grab()
+SEEK_THRESHOLD = 250
+
+def init_extract_process():
+    # One decoder per process; let the pool provide the parallelism
+    try:
+        cv2.setNumThreads(1)
+    except Exception:
+        pass
+
+def frame_file_name(frame_idx: int, image_format: str = "jpg") -> str:
+    # Same layout Cutie writes with --workspace_init_only
+    return f"{frame_idx:07d}.{image_format}"
+
+def estimate_frame_count(video_path: str) -> int:
+    cap = cv2.VideoCapture(str(video_path))
+    try:
+        return max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    finally:
+        cap.release()
+
+def extract_video_frames(video_name: str, video_path: str, output_dir: str, image_format: str = "jpg",
+                         jpeg_quality: int = DEFAULT_JPEG_QUALITY, progress_queue=None,
+                         write_workers: int = 2, prefetch: int = 16):
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise IOError(f"Unable to open video: {video_path}")
+    total = max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+
+    count = 0
+    pending: deque = deque()
+    try:
+        # Decoding stays sequential; encoding and writing overlap on a small pool
+        with ThreadPoolExecutor(max_workers=max(1, write_workers)) as writers:
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                path = os.path.join(output_dir, frame_file_name(count, image_format))
+                pending.append(writers.submit(write_image, frame, path, jpeg_quality))
+                count += 1
+                while len(pending) >= prefetch:
+                    pending.popleft().result()
+                if progress_queue is not None and count % PROGRESS_EVERY == 0:
+                    progress_queue.put((video_name, count, max(total, count)))
+            while pending:
+                pending.popleft().result()
+    finally:
+        cap.release()
+
+    if count == 0:
+        raise IOError(f"No frames could be decoded from {video_path}")
+    if progress_queue is not None:
+        progress_queue.put((video_name, count, count))
+    return video_name, count
+
+def write_sparse_marker(output_dir: str, frame_indices, total_frames: int):
+    # Lets tools tell a labeling-only extraction apart from a full one
+    marker = {"frames": sorted(int(i) for i in frame_indices), "total_frames": int(total_frames)}
+    with open(os.path.join(output_dir, SPARSE_MARKER), "w", encoding="utf-8") as f:
+        json.dump(marker, f)
+
+def read_sparse_marker(frame_dir: str):
+    try:
+        with open(os.path.join(frame_dir, SPARSE_MARKER), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _seek_at_or_before(cap, target: int, seek_threshold: int) -> int:
+    # Seeks are only keyframe-accurate on many codecs, so the decoder is asked
+    # where it landed; anything past the target is retried further back, and
+    # as a last resort the video is rewound. Returns the next frame's index.
+    for dest in (target, max(0, target - seek_threshold)):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, dest)
+        landed = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if 0 <= landed <= target:
+            return landed
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    return 0
+
+def extract_sparse_frames(video_name: str, video_path: str, output_dir: str, frame_indices,
+                          image_format: str = "jpg", jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+                          progress_queue=None, seek_threshold: int = SEEK_THRESHOLD,
+                          write_workers: int = 2, prefetch: int = 16):
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise IOError(f"Unable to open video: {video_path}")
+    total_frames = max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    targets = sorted({int(i) for i in frame_indices if int(i) >= 0})
+    if total_frames:
+        targets = [i for i in targets if i < total_frames]
+
+    count = 0
+    position = 0  # index of the next frame cap.read() returns
+    pending: deque = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, write_workers)) as writers:
+            for target in targets:
+                # Within a GOP, walking forward with grab() is cheaper than a seek,
+                # which has to decode again from the previous keyframe.
+                if target - position > seek_threshold:
+                    position = _seek_at_or_before(cap, target, seek_threshold)
+                while position < target and cap.grab():
+                    position += 1
+                if position < target:
+                    break
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                position += 1
+
+                path = os.path.join(output_dir, frame_file_name(target, image_format))
+                pending.append(writers.submit(write_image, frame, path, jpeg_quality))
+                count += 1
+                while len(pending) >= prefetch:
+                    pending.popleft().result()
+                if progress_queue is not None and count % PROGRESS_EVERY == 0:
+                    progress_queue.put((video_name, count, len(targets)))
+            while pending:
+                pending.popleft().result()
+    finally:
+        cap.release()
+
+    if targets and count == 0:
+        raise IOError(f"No frames could be decoded from {video_path}")
+    write_sparse_marker(output_dir, targets[:count], total_frames)
+    if progress_queue is not None:
+        progress_queue.put((video_name, count, count))
+    return video_name, count
+
+def sample_frame_indices(video_path: str, sampling: dict) -> list[int]:
+    from .frame_sampling import diverse_indices, parse_index_list, uniform_indices
+
+    method = sampling.get("method", "uniform")
+    if method == "uniform":
+        return uniform_indices(estimate_frame_count(video_path), int(sampling.get("count", 0)))
+    if method == "list":
+        return parse_index_list(sampling.get("text", ""), estimate_frame_count(video_path))
+    if method == "diverse":
+        return diverse_indices(video_path, int(sampling.get("count", 0)))
+    raise ValueError(f"Unknown sampling method: {method}")
+
+def extract_sampled_frames(video_name: str, video_path: str, output_dir: str, sampling: dict,
+                           image_format: str = "jpg", jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+                           progress_queue=None):
+    frame_indices = sample_frame_indices(video_path, sampling)
+    if not frame_indices:
+        raise ValueError(f"No frames selected for {video_name}")
+    return extract_sparse_frames(video_name, video_path, output_dir, frame_indices,
+                                 image_format, jpeg_quality, progress_queue)
@@ -0,0 +1,74 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+import os
+
+import cv2
+
+DEFAULT_JPEG_QUALITY = 95
+
+def encode_image(image, path: str, jpeg_quality: int = DEFAULT_JPEG_QUALITY) -> bytes:
+    ext = os.path.splitext(path)[1].lower() or ".jpg"
+    params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)] if ext in (".jpg", ".jpeg") else []
+    ok, buf = cv2.imencode(ext, image, params)
+    if not ok:
+        raise IOError(f"Failed to encode {path}")
+    return buf.tobytes()
+
+def write_image(image, path: str, jpeg_quality: int = DEFAULT_JPEG_QUALITY) -> str:
+    data = encode_image(image, path, jpeg_quality)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+def run_frame_pipeline(
+    items: Iterable,
+    read_fn: Callable,
+    compute_fn: Callable,
+    write_fn: Callable,
+    read_workers: int = 2,
+    write_workers: int = 2,
+    prefetch: int = 8,
+    progress_callback=None,
+) -> int:
+    # Decoding and encoding/writing run on small thread pools (cv2 and file I/O
+    # release the GIL) while compute stays in order on the calling thread.
+    # Both queues are bounded so memory stays at ~2 * prefetch decoded frames.
+    prefetch = max(1, int(prefetch))
+    items = iter(items)
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, read_workers)) as readers, \
+         ThreadPoolExecutor(max_workers=max(1, write_workers)) as writers:
+        reads: deque = deque()
+        writes: deque = deque()
+
+        def _fill_reads():
+            while len(reads) < prefetch:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+                reads.append((item, readers.submit(read_fn, item)))
+
+        _fill_reads()
+        while reads:
+            item, fut = reads.popleft()
+            loaded = fut.result()
+            _fill_reads()
+
+            result = compute_fn(item, loaded)
+
+            while len(writes) >= prefetch:
+                writes.popleft().result()
+                done += 1
+                if progress_callback:
+                    progress_callback(done)
+            writes.append(writers.submit(write_fn, item, result))
+
+        while writes:
+            writes.popleft().result()
+            done += 1
+            if progress_callback:
+                progress_callback(done)
+    return done
@@ -0,0 +1,75 @@
+import re
+
+import cv2
+import numpy as np
+
+SAMPLING_METHODS = ("uniform", "list", "diverse")
+
+def uniform_indices(total_frames: int, count: int) -> list[int]:
+    if total_frames <= 0 or count <= 0:
+        return []
+    if count >= total_frames:
+        return list(range(total_frames))
+    return sorted({int(i) for i in np.linspace(0, total_frames - 1, count)})
+
+def parse_index_list(text: str, total_frames: int = None) -> list[int]:
+    # Accepts "12, 40, 100-200, 300-400:25" (ranges are inclusive, ":step" optional)
+    indices = set()
+    for token in re.split(r"[,\s]+", text.strip()):
+        if not token:
+            continue
+        match = re.fullmatch(r"(\d+)(?:-(\d+)(?::(\d+))?)?", token)
+        if match is None:
+            raise ValueError(f"Invalid frame index: {token}")
+        start = int(match.group(1))
+        stop = int(match.group(2)) if match.group(2) else start
+        step = max(1, int(match.group(3))) if match.group(3) else 1
+        indices.update(range(start, stop + 1, step))
+    if total_frames:
+        indices = {i for i in indices if i < total_frames}
+    return sorted(indices)
+
+def _frame_descriptor(frame: np.ndarray, size: int = 16) -> np.ndarray:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    small -= small.mean()
+    norm = np.linalg.norm(small)
+    return (small / norm).ravel() if norm > 0 else small.ravel()
+
+def diverse_indices(video_path: str, count: int, candidates: int = 2000) -> list[int]:
+    # Greedy farthest-point selection over thumbnails of evenly spaced candidates
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise IOError(f"Unable to open video: {video_path}")
+    try:
+        total_frames = max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        candidate_idx = uniform_indices(total_frames, max(count, candidates))
+        wanted = set(candidate_idx)
+
+        frame_ids, descriptors = [], []
+        position = 0
+        last = candidate_idx[-1] if candidate_idx else -1
+        while position <= last:
+            if position in wanted:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                frame_ids.append(position)
+                descriptors.append(_frame_descriptor(frame))
+            elif not cap.grab():
+                break
+            position += 1
+    finally:
+        cap.release()
+
+    if len(frame_ids) <= count:
+        return frame_ids
+
+    feats = np.stack(descriptors)
+    chosen = [0]
+    dist = np.linalg.norm(feats - feats[0], axis=1)
+    for _ in range(count - 1):
+        nxt = int(np.argmax(dist))
+        chosen.append(nxt)
+        np.minimum(dist, np.linalg.norm(feats - feats[nxt], axis=1), out=dist)
+    return sorted(frame_ids[i] for i in chosen)
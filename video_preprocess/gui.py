@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton, QLabel, QMessageB
 from pathlib import Path
 from .segment import CutieDialog
 from .cutie_based_contour import BatchContourProcessor, VideoMultiSelectDialog
+from main.jobs import JobManager
 
 class PreprocessDialog(QDialog):
     def __init__(self, parent=None, current_project = None):
@@ -54,8 +55,16 @@ class PreprocessDialog(QDialog):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        processor = BatchContourProcessor(self, self.current_project, max_threads=4, include_only=selected)
-        processor.any_error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
-        processor.progress.connect(lambda done, total: print(f"[Batch] {done}/{total} videos finished"))
-        processor.all_done.connect(lambda: QMessageBox.information(self, "Batch", "All contours finished."))
-        processor.start()
\ No newline at end of file
+        options = dlg.render_options()
+
+        def _start(job, done):
+            processor = BatchContourProcessor(self, self.current_project, include_only=selected, **options)
+            processor.any_error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
+            processor.progress.connect(lambda n, total: print(f"[Batch] {n}/{total} videos finished"))
+            return processor.start_as_job(done)
+
+        def _finished(job):
+            if job.state == "done":
+                QMessageBox.information(self, "Batch", "All contours finished.")
+
+        JobManager.instance().submit_task(f"Contour: {len(selected)} video(s)", _start, on_finished=_finished)
\ No newline at end of file
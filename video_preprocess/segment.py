@@ -1,17 +1,19 @@
 from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
     QDialog, QLineEdit, QApplication, QMessageBox, QSpinBox, 
-    QListWidget, QListWidgetItem, QTextEdit 
+    QListWidget, QListWidgetItem, QTextEdit, QComboBox
 )
 from PyQt6.QtGui import QTextCursor, QTextOption
 from PyQt6.QtCore import Qt
 from pathlib import Path
-import subprocess
 import time 
 import cv2
 import shutil
 import os
 import sys 
+from .thread import FrameExtractionWorker
+from .frame_pipeline import DEFAULT_JPEG_QUALITY
+from main.jobs import JobManager
         
 class CutieDialog(QDialog):
     def __init__(self, parent=None):
@@ -56,6 +58,40 @@ class CutieDialog(QDialog):
         self._progress_block = None
 
         layout.addStretch()
+        format_row = QHBoxLayout()
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(["jpg", "png"])
+        self.quality_spin = QSpinBox()
+        self.quality_spin.setRange(10, 100)
+        self.quality_spin.setValue(DEFAULT_JPEG_QUALITY)
+        self.format_combo.currentTextChanged.connect(lambda fmt: self.quality_spin.setEnabled(fmt == "jpg"))
+        format_row.addWidget(QLabel("Frame format"))
+        format_row.addWidget(self.format_combo)
+        format_row.addWidget(QLabel("JPEG quality"))
+        format_row.addWidget(self.quality_spin)
+        layout.addLayout(format_row)
+
+        # Labeling-only extraction: write just the sampled frames, named by frame number
+        sampling_row = QHBoxLayout()
+        self.sampling_combo = QComboBox()
+        self.sampling_combo.addItem("All frames", None)
+        self.sampling_combo.addItem("Uniform sample", "uniform")
+        self.sampling_combo.addItem("Diverse sample", "diverse")
+        self.sampling_combo.addItem("Frame list", "list")
+        self.sample_count_spin = QSpinBox()
+        self.sample_count_spin.setRange(1, 100000)
+        self.sample_count_spin.setValue(300)
+        self.frame_list_edit = QLineEdit()
+        self.frame_list_edit.setPlaceholderText("e.g. 0-1000:50, 1234")
+        self.sampling_combo.currentIndexChanged.connect(self._sampling_changed)
+        sampling_row.addWidget(self.sampling_combo)
+        sampling_row.addWidget(self.sample_count_spin)
+        sampling_row.addWidget(self.frame_list_edit)
+        layout.addLayout(sampling_row)
+        self._sampling_changed()
+
+        self._extract_worker = None
+        self._extract_reported = {}
         self.frame_button = QPushButton("Create image frames (Recommend)")
         self.frame_button.clicked.connect(self.run_create_images)
         layout.addWidget(self.frame_button)
@@ -65,15 +101,36 @@ class CutieDialog(QDialog):
 
         self.setLayout(layout)
 
+    def _sampling_changed(self):
+        method = self.sampling_combo.currentData()
+        self.sample_count_spin.setVisible(method in ("uniform", "diverse"))
+        self.frame_list_edit.setVisible(method == "list")
+
+    def _sampling_options(self):
+        method = self.sampling_combo.currentData()
+        if method is None:
+            return None
+        if method == "list":
+            return {"method": method, "text": self.frame_list_edit.text()}
+        return {"method": method, "count": self.sample_count_spin.value()}
+
     def run_create_images(self):
         if self.video_list.count() == 0:
             QMessageBox.warning(self, "No videos", "No videos in project.")
             return
 
-        self.log.append("Frame extraction started. This task may take some time. Check terminal for detailed information.")
+        sampling = self._sampling_options()
+        if sampling is not None and sampling["method"] == "list":
+            from .frame_sampling import parse_index_list
+            try:
+                if not parse_index_list(sampling["text"]):
+                    raise ValueError("No frame numbers given.")
+            except ValueError as e:
+                QMessageBox.warning(self, "Frame list", str(e))
+                return
 
         overwrite_policy = False
-        num_objects = self.current_project.num_animals
+        jobs = {}
         for idx_vid in range(self.video_list.count()):
             video_path    = self.video_list.item(idx_vid).data(Qt.ItemDataRole.UserRole)
             video_name    = Path(video_path).stem
@@ -96,19 +153,44 @@ class CutieDialog(QDialog):
                 else:
                     continue
 
-            cmd = [
-                "python", "interactive_demo.py",
-                "--video", video_path,
-                "--workspace", workspace_dir,
-                "--num_objects", str(num_objects),
-                "--workspace_init_only",
-            ]
-            try:
-                subprocess.run(cmd, cwd=self.cutie_dir, check=True)
-                self.log.append(f"[OK] {video_name} - frames created.")
-            except subprocess.CalledProcessError as e:
-                self.log.append(f"[FAIL] {video_name} - {e}")
+            jobs[video_name] = (video_path, os.path.join(workspace_dir, "images"))
 
+        if not jobs:
+            return
+
+        self.log.append(f"Frame extraction started for {len(jobs)} video(s).")
+        self.frame_button.setEnabled(False)
+        self.run_button.setEnabled(False)
+        self._extract_reported = {name: -1 for name in jobs}
+
+        self._extract_worker = FrameExtractionWorker(
+            jobs,
+            image_format=self.format_combo.currentText(),
+            jpeg_quality=self.quality_spin.value(),
+            sampling=sampling,
+        )
+        self._extract_worker.video_progress.connect(self._on_extract_progress)
+        self._extract_worker.video_done.connect(
+            lambda name, count: self.log.append(f"[OK] {name} - {count} frames created."))
+        self._extract_worker.video_error.connect(
+            lambda name, msg: self.log.append(f"[FAIL] {name} - {msg}"))
+        self._extract_worker.finished.connect(self._on_extract_finished)
+        self._extract_worker.start()
+
+    def _on_extract_progress(self, video_name: str, done: int, total: int):
+        percent = int(done * 100 / total) if total else 0
+        step = percent // 10 * 10
+        if step > self._extract_reported.get(video_name, -1) and percent < 100:
+            self._extract_reported[video_name] = step
+            self.log.append(f"{video_name}: {done}/{total} frames ({percent}%)")
+
+    def _on_extract_finished(self):
+        if self._extract_worker is not None:
+            self._extract_worker.wait()
+            self._extract_worker.deleteLater()
+            self._extract_worker = None
+        self.frame_button.setEnabled(True)
+        self.run_button.setEnabled(True)
         QMessageBox.information(self, "Done", "Frame extraction completed.")
 
     def run_cutie(self):
@@ -129,9 +211,19 @@ class CutieDialog(QDialog):
             "--num_objects", str(num_objects)
         ]
 
-        self.log.append("The cutie dialog will open shortly.")
-        try:
-            subprocess.run(cmd, cwd=self.cutie_dir, check=True)
+        # Queued on the job manager so the dialog stays responsive while Cutie runs
+        job_manager = JobManager.instance()
+        job_manager.submit_command(
+            f"Cutie: {video_name}", cmd, cwd=self.cutie_dir, resource="interactive",
+            on_finished=lambda job: self._on_cutie_finished(video_name, job),
+        )
+        if job_manager.running_count("interactive"):
+            self.log.append("The cutie dialog will open shortly.")
+        else:
+            self.log.append(f"Cutie for {video_name} is queued (see Jobs).")
+
+    def _on_cutie_finished(self, video_name, job):
+        if job.state == "done":
             self.log.append(f"[Done] Segmentation for {video_name} completed.")
-        except subprocess.CalledProcessError as e:
-            self.log.append(f"[FAIL] Cutie execution failed for {video_name} - {e}")
+        else:
+            self.log.append(f"[FAIL] Cutie execution failed for {video_name} - {job.error or job.state}")
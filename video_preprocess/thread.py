@@ -1,62 +1,177 @@
 from PyQt6.QtCore import QThread, pyqtSignal
-import subprocess
-import sys
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+import queue
 import os
-import cv2
+from .frame_pipeline import DEFAULT_JPEG_QUALITY
 
-class ContourWorker(QThread):
-    progress = pyqtSignal(int)
-    finished = pyqtSignal()
+def default_pool_size() -> int:
+    # ProcessPoolExecutor refuses more than 61 workers on Windows
+    return max(1, min(os.cpu_count() or 1, 61))
 
-    def __init__(self, video_name, seg_frames, masks, output_dir, throttle_ms: int = 0):
+class ContourPoolWorker(QThread):
+    chunk_done  = pyqtSignal(str, int)
+    video_done  = pyqtSignal(str)
+    video_error = pyqtSignal(str, str)
+    finished    = pyqtSignal()
+
+    def __init__(self, jobs: dict, max_workers: int = None, chunk_size: int = 32, thickness: int = 1,
+                 jpeg_quality: int = DEFAULT_JPEG_QUALITY, io_workers: int = 2, manifests: dict = None,
+                 color_mode: str = "white"):
         super().__init__()
-        self.video_name = video_name
-        self.seg_frames = seg_frames
-        self.masks = masks
-        self.output_dir = output_dir
-        self.throttle_ms = int(throttle_ms) if throttle_ms else 0
+        # jobs: video_name -> (pairs [(davis_path, mask_path)], output_dir)
+        self.jobs = jobs
+        self.manifests = manifests or {}
+        self.max_workers = max_workers or default_pool_size()
+        self.chunk_size = max(1, int(chunk_size))
+        self.thickness = thickness
+        self.jpeg_quality = jpeg_quality
+        self.io_workers = io_workers
+        self.color_mode = color_mode
+        self._cancelled = False
+
+    def cancel(self):
+        # Chunks already running finish (and land in the manifest); queued ones are dropped
+        # and their videos report video_error(name, "cancelled")
+        self._cancelled = True
+
+    def _interleaved_chunks(self):
+        # Round-robin over videos so every video starts early and idle
+        # processes keep pulling the next chunk regardless of its video.
+        per_video = {
+            name: [pairs[i:i + self.chunk_size] for i in range(0, len(pairs), self.chunk_size)]
+            for name, (pairs, _) in self.jobs.items()
+        }
+        depth = max((len(chunks) for chunks in per_video.values()), default=0)
+        for level in range(depth):
+            for name, chunks in per_video.items():
+                if level < len(chunks):
+                    yield name, chunks[level]
 
     def run(self):
-        # Limit library-internal threading so 4 workers ≈ 4 cores total
+        from .contour import init_contour_process, render_contour_chunk
+
+        remaining = {name: 0 for name in self.jobs}
+        failed = set()
         try:
-            cv2.setNumThreads(1)
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_contour_process) as pool:
+                futures = {}
+                for name, chunk in self._interleaved_chunks():
+                    output_dir = self.jobs[name][1]
+                    fut = pool.submit(render_contour_chunk, name, chunk, str(output_dir), self.thickness,
+                                      self.jpeg_quality, self.io_workers, color_mode=self.color_mode)
+                    futures[fut] = (name, chunk)
+                    remaining[name] += 1
+
+                for name, count in remaining.items():
+                    if count == 0:
+                        self.video_done.emit(name)
+
+                dropping = False
+                dropped = set()
+                pending = set(futures)
+                while pending:
+                    # Poll so a cancel drops the queued chunks without waiting for the next completion
+                    done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        name, chunk = futures[fut]
+                        remaining[name] -= 1
+                        if fut.cancelled():
+                            dropped.add(name)
+                            continue
+                        try:
+                            fut.result()
+                            manifest = self.manifests.get(name)
+                            if manifest is not None:
+                                manifest.mark_done(chunk)
+                                manifest.save_if_due()
+                            self.chunk_done.emit(name, len(chunk))
+                        except Exception as e:
+                            if name not in failed:
+                                failed.add(name)
+                                self.video_error.emit(name, str(e))
+                        if remaining[name] == 0 and name not in failed and name not in dropped:
+                            self.video_done.emit(name)
+                    if self._cancelled and not dropping:
+                        # Chunks that already started keep coming through this loop
+                        dropping = True
+                        for fut in pending:
+                            fut.cancel()
+
+                for name in self.jobs:
+                    if name in dropped and name not in failed:
+                        failed.add(name)
+                        self.video_error.emit(name, "cancelled")
+        except Exception as e:
+            for name in self.jobs:
+                if remaining.get(name, 0) > 0 and name not in failed:
+                    self.video_error.emit(name, str(e))
+        finally:
+            for name, manifest in self.manifests.items():
+                try:
+                    manifest.save()
+                except OSError as e:
+                    print(f"[Contour] Failed to save manifest for {name}: {e}")
+            self.finished.emit()
+
+class FrameExtractionWorker(QThread):
+    video_progress = pyqtSignal(str, int, int)
+    video_done     = pyqtSignal(str, int)
+    video_error    = pyqtSignal(str, str)
+    finished       = pyqtSignal()
+
+    def __init__(self, jobs: dict, max_workers: int = None, image_format: str = "jpg", jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+                 sampling: dict = None):
+        super().__init__()
+        # jobs: video_name -> (video_path, output_dir)
+        self.jobs = jobs
+        self.max_workers = max(1, min(max_workers or default_pool_size(), len(jobs) or 1))
+        self.image_format = image_format
+        self.jpeg_quality = jpeg_quality
+        # None extracts every frame; otherwise see extract.sample_frame_indices
+        self.sampling = sampling
+
+    def _drain(self, progress_queue):
+        while True:
             try:
-                cv2.ocl.setUseOpenCL(False)
-            except Exception:
-                pass
-        except Exception:
-            pass
-
-        # Also constrain common math backends in this process
-        for env_key in (
-            "OMP_NUM_THREADS",
-            "OPENBLAS_NUM_THREADS",
-            "MKL_NUM_THREADS",
-            "NUMEXPR_NUM_THREADS",
-            "VECLIB_MAXIMUM_THREADS",
-            "BLIS_NUM_THREADS",
-        ):
-            os.environ[env_key] = os.environ.get(env_key, "1") or "1"
-
-        # Import after env/thread limits so NumPy/OpenBLAS pick them up
-        from .contour import ContouredVideoProduction
+                name, done, total = progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.video_progress.emit(name, done, total)
 
+    def run(self):
+        from .extract import init_extract_process, extract_video_frames, extract_sampled_frames
+
+        reported = set()
         try:
-            ContouredVideoProduction(
-                output_video_name=self.video_name,
-                segmented_frames=self.seg_frames,
-                masks=self.masks,
-                output_dir=self.output_dir,
-                progress_callback=self.report_progress
-            )
+            with multiprocessing.Manager() as manager:
+                progress_queue = manager.Queue()
+                with ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_extract_process) as pool:
+                    futures = {}
+                    for name, (video_path, output_dir) in self.jobs.items():
+                        if self.sampling:
+                            fut = pool.submit(extract_sampled_frames, name, str(video_path), str(output_dir),
+                                              self.sampling, self.image_format, self.jpeg_quality, progress_queue)
+                        else:
+                            fut = pool.submit(extract_video_frames, name, str(video_path), str(output_dir),
+                                              self.image_format, self.jpeg_quality, progress_queue)
+                        futures[fut] = name
+                    pending = set(futures)
+                    while pending:
+                        done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                        self._drain(progress_queue)
+                        for fut in done:
+                            name = futures[fut]
+                            reported.add(name)
+                            try:
+                                _, count = fut.result()
+                                self.video_done.emit(name, count)
+                            except Exception as e:
+                                self.video_error.emit(name, str(e))
+                    self._drain(progress_queue)
         except Exception as e:
-            try:
-                print(f"[ContourWorker] {self.video_name} failed: {e}")
-            except Exception:
-                pass
+            for name in self.jobs:
+                if name not in reported:
+                    self.video_error.emit(name, str(e))
         finally:
             self.finished.emit()
-
-    def report_progress(self, value):
-        self.progress.emit(value)
-        
\ No newline at end of file